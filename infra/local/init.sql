@@ -3,15 +3,23 @@
 
 CREATE TABLE IF NOT EXISTS events (
     id               BIGSERIAL PRIMARY KEY,
-    event_id         UUID         NOT NULL UNIQUE,
+    event_id         UUID         NOT NULL UNIQUE DEFAULT gen_random_uuid(),
     aggregate_id     VARCHAR(128) NOT NULL DEFAULT '',
     event_type       VARCHAR(64)  NOT NULL,
     payload          JSONB        NOT NULL DEFAULT '{}',
     actor            VARCHAR(128) NOT NULL DEFAULT 'system',
-    created_at       TIMESTAMPTZ  NOT NULL DEFAULT NOW(),
+    created_at       TIMESTAMPTZ  NOT NULL DEFAULT clock_timestamp(),
     idempotency_key  VARCHAR(128) UNIQUE
 );
 
-CREATE INDEX IF NOT EXISTS idx_events_type ON events (event_type);
-CREATE INDEX IF NOT EXISTS idx_events_created ON events (created_at DESC);
-CREATE INDEX IF NOT EXISTS idx_events_aggregate ON events (aggregate_id);
+-- created_at is clock_timestamp(), not NOW(): events appended in one
+-- transaction still get distinct, ordered stamps. Reads order by
+-- (created_at, id), id breaking any tie.
+--
+-- list_events filters on event_type or aggregate_id and orders by
+-- created_at DESC, id DESC: composite indexes serve both without a sort.
+CREATE INDEX IF NOT EXISTS idx_events_type_created_id
+    ON events (event_type, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_events_created_id ON events (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_events_aggregate_created_id
+    ON events (aggregate_id, created_at DESC, id DESC);
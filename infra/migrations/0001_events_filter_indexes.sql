@@ -0,0 +1,19 @@
+-- 0001 — composite indexes for list_events filters
+--
+-- list_events runs WHERE event_type = %s (or aggregate_id = %s)
+-- ORDER BY created_at DESC LIMIT %s. With single-column indexes Postgres
+-- fetches every matching row and sorts; (col, created_at DESC) lets it walk
+-- the index in order and stop at LIMIT. The composites also cover plain
+-- equality lookups, so the single-column indexes are dropped.
+--
+-- CONCURRENTLY cannot run inside a transaction block: apply with
+--   psql "$CACP_PG_DSN" -f infra/migrations/0001_events_filter_indexes.sql
+-- Fresh databases get the same indexes from infra/local/init.sql.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_events_type_created
+    ON events (event_type, created_at DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_events_aggregate_created
+    ON events (aggregate_id, created_at DESC);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_events_type;
+DROP INDEX CONCURRENTLY IF EXISTS idx_events_aggregate;
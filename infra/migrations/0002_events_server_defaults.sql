@@ -0,0 +1,8 @@
+-- 0002 — let Postgres generate event ids
+--
+-- PostgresEventStore.append no longer sends event_id or created_at: both
+-- come from column defaults and the id is read back with RETURNING.
+-- created_at already defaults to NOW(); event_id needs gen_random_uuid()
+-- (built in from PostgreSQL 13).
+
+ALTER TABLE events ALTER COLUMN event_id SET DEFAULT gen_random_uuid();
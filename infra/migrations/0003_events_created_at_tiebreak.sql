@@ -0,0 +1,26 @@
+-- 0003 — strictly ordered created_at, id as tiebreaker
+--
+-- NOW() is the transaction start time, so every event appended in one
+-- unit_of_work / pipelined_append / append_many batch got the same
+-- created_at and list_events / iter_events returned them in arbitrary
+-- order. clock_timestamp() advances per row; the BIGSERIAL id breaks any
+-- remaining ties (and orders the rows already stored with equal stamps).
+-- The indexes gain id as a trailing key so ORDER BY created_at, id still
+-- walks the index without a sort.
+--
+-- CONCURRENTLY cannot run inside a transaction block: apply with
+--   psql "$CACP_PG_DSN" -f infra/migrations/0003_events_created_at_tiebreak.sql
+-- Fresh databases get the same schema from infra/local/init.sql.
+
+ALTER TABLE events ALTER COLUMN created_at SET DEFAULT clock_timestamp();
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_events_type_created_id
+    ON events (event_type, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_events_aggregate_created_id
+    ON events (aggregate_id, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_events_created_id
+    ON events (created_at DESC, id DESC);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_events_type_created;
+DROP INDEX CONCURRENTLY IF EXISTS idx_events_aggregate_created;
+DROP INDEX CONCURRENTLY IF EXISTS idx_events_created;
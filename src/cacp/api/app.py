@@ -3,30 +3,51 @@
 from __future__ import annotations
 
 import logging
+import os
 import time
 from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING, Any
 
+import httpx
+import structlog
 from fastapi import FastAPI, Request, Response
 from fastapi.exceptions import RequestValidationError
+from starlette.datastructures import MutableHeaders
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import JSONResponse
 
+from cacp.api.errors import (
+    CodedHTTPException,
+    PolicyViolation,
+    RateLimitExceeded,
+    SignatureInvalid,
+)
+from cacp.api.responses import ORJSONResponse
 from cacp.api.routes import demo, health, ingest, webhook_github, webhook_twilio
 from cacp.gitops.github_pr import GitHubPRCreator
-from cacp.logging import configure_logging, new_correlation_id
+from cacp.logging import configure_logging, correlation_id_var, new_correlation_id
 from cacp.orchestration.orchestrator import Orchestrator
-from cacp.settings import Settings
+from cacp.settings import get_settings
 from cacp.storage.event_store import InMemoryEventStore
 
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator
 
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
 __all__ = ["create_app"]
 
 logger = logging.getLogger(__name__)
 
+# Configured at import, before the server's event loop starts, rather than
+# in lifespan. Skipped if the host process (or a test) set structlog up.
+if not structlog.is_configured():
+    configure_logging(json_output=True, level="INFO")
+
+_HTTP_TIMEOUT = 5.0  # seconds — shared outbound client default
+
+# Liveness probes and Prometheus scrapes: high-frequency, not worth tracing.
+_UNINSTRUMENTED_PATHS = frozenset({"/health", "/metrics"})
+
 _ERROR_CODE_BY_STATUS: dict[int, str] = {
     401: "SIGNATURE_INVALID",
     403: "POLICY_VIOLATION",
@@ -34,27 +55,83 @@ _ERROR_CODE_BY_STATUS: dict[int, str] = {
 }
 
 
-class ObservabilityMiddleware(BaseHTTPMiddleware):
-    """Inject correlation_id and record request metrics."""
-
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        cid = request.headers.get("x-correlation-id") or new_correlation_id()
-        request.state.request_id = cid
-
+def _build_status_table() -> tuple[str, ...]:
+    table = ["INVALID_REQUEST" if 400 <= s < 500 else "INTERNAL_ERROR" for s in range(600)]
+    for status, code in _ERROR_CODE_BY_STATUS.items():
+        table[status] = code
+    return tuple(table)
+
+
+# Indexed by status code: one tuple load instead of dict + range checks.
+_STATUS_TO_CODE = _build_status_table()
+
+
+def _new_correlation_id_bytes() -> bytes:
+    """32 hex chars from the OS RNG, without building a ``uuid.UUID``."""
+    return os.urandom(16).hex().encode("ascii")
+
+
+class ObservabilityMiddleware:
+    """Inject correlation_id and record request metrics.
+
+    Pure ASGI middleware: headers are patched on ``http.response.start``
+    without the task group and Request/Response objects that
+    ``BaseHTTPMiddleware`` allocates per request.  Requests to
+    ``exclude_paths`` pass straight through and are not counted in
+    ``cacp_requests_total``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        exclude_paths: frozenset[str] = _UNINSTRUMENTED_PATHS,
+    ) -> None:
+        self.app = app
+        self._exclude_paths = exclude_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self._exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        # The id stays as raw header bytes for the response; the str form
+        # is decoded once for request.state and the logging context.
+        cid = b""
+        for name, value in scope["headers"]:
+            if name == b"x-correlation-id":
+                cid = value
+                break
+        if not cid:
+            cid = _new_correlation_id_bytes()
+        request_id = cid.decode("latin-1")
+        token = correlation_id_var.set(request_id)
+        scope.setdefault("state", {})["request_id"] = request_id
         start = time.perf_counter()
-        response = await call_next(request)
-        duration = time.perf_counter() - start
 
-        response.headers["x-correlation-id"] = cid
-        response.headers["x-request-duration-ms"] = f"{duration * 1000:.1f}"
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                duration = time.perf_counter() - start
+                headers = MutableHeaders(scope=message)
+                headers.raw.append((b"x-correlation-id", cid))
+                headers["x-request-duration-ms"] = f"{duration * 1000:.1f}"
 
-        # Record metrics
-        health.record_request(response.status_code)
+                # Record metrics
+                health.record_request(message["status"])
+            await send(message)
 
-        return response
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            correlation_id_var.reset(token)
 
 
 def _resolve_request_id(request: Request) -> str:
+    # Set by ObservabilityMiddleware for the lifetime of the request.
+    context_request_id = correlation_id_var.get()
+    if context_request_id:
+        return context_request_id
+    # Handlers running outside the middleware (ServerErrorMiddleware on an
+    # unhandled 500) still see the id it stored on the shared scope state.
     state_request_id = getattr(request.state, "request_id", "")
     if state_request_id:
         return state_request_id
@@ -84,42 +161,48 @@ def _error_payload(
     return payload
 
 
-async def _http_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def _http_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     request_id = _resolve_request_id(request)
     if not isinstance(exc, StarletteHTTPException):
         logger.exception("Unexpected exception type for HTTP handler", exc_info=exc)
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content=_error_payload("INTERNAL_ERROR", "Internal server error", request_id),
         )
 
     status_code = exc.status_code
 
-    if status_code in _ERROR_CODE_BY_STATUS:
-        error_code = _ERROR_CODE_BY_STATUS[status_code]
-    elif 400 <= status_code < 500:
-        error_code = "INVALID_REQUEST"
-    else:
-        error_code = "INTERNAL_ERROR"
+    error_code = _STATUS_TO_CODE[status_code] if status_code < 600 else "INTERNAL_ERROR"
 
     message = exc.detail if isinstance(exc.detail, str) else "Request failed"
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content=_error_payload(error_code, message, request_id),
     )
 
 
-async def _validation_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def _coded_exception_handler(request: Request, exc: Exception) -> Response:
+    if not isinstance(exc, CodedHTTPException):
+        return await _http_exception_handler(request, exc)
+    request_id = _resolve_request_id(request)
+    return Response(
+        content=exc.render(request_id),
+        status_code=exc.status_code,
+        media_type="application/json",
+    )
+
+
+async def _validation_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     request_id = _resolve_request_id(request)
     if not isinstance(exc, RequestValidationError):
         logger.exception("Unexpected exception type for validation handler", exc_info=exc)
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content=_error_payload("INTERNAL_ERROR", "Internal server error", request_id),
         )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content=_error_payload(
             "INVALID_REQUEST",
@@ -130,10 +213,10 @@ async def _validation_exception_handler(request: Request, exc: Exception) -> JSO
     )
 
 
-async def _unhandled_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def _unhandled_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     request_id = _resolve_request_id(request)
     logger.exception("Unhandled application exception", exc_info=exc)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content=_error_payload("INTERNAL_ERROR", "Internal server error", request_id),
     )
@@ -142,8 +225,7 @@ async def _unhandled_exception_handler(request: Request, exc: Exception) -> JSON
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Startup
-    configure_logging(json_output=True, level="INFO")
-    settings = Settings()
+    settings = get_settings()
 
     # Build GitHub PR creator (if token available)
     github_pr: GitHubPRCreator | None = None
@@ -164,6 +246,19 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
         redis_client = get_redis_client(settings.redis_url)
 
+    # Shared outbound HTTP client (keep-alive pool for OPA probes etc.)
+    http_client = httpx.AsyncClient(
+        timeout=_HTTP_TIMEOUT,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    )
+
+    # Shared PG pool (readiness + DB-bound requests reuse warm connections)
+    pg_pool = None
+    if settings.pg_dsn:
+        from cacp.storage.postgres import create_pool
+
+        pg_pool = await create_pool(settings.pg_dsn)
+
     # Build orchestrator with all dependencies
     app.state.orchestrator = Orchestrator(
         settings=settings,
@@ -173,12 +268,19 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     app.state.settings = settings
     app.state.event_store = event_store
     app.state.redis_client = redis_client
+    app.state.pg_pool = pg_pool
+    app.state.http_client = http_client
 
     yield
 
-    # Shutdown: close Redis
+    # Shutdown: flush pending events, then close Redis, the PG pool and
+    # the HTTP client
+    await app.state.orchestrator.aclose()
     if redis_client:
         redis_client.close()
+    if pg_pool:
+        await pg_pool.close()
+    await http_client.aclose()
 
     # Shutdown
     if github_pr:
@@ -193,6 +295,8 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
     app.add_exception_handler(StarletteHTTPException, _http_exception_handler)
+    for coded in (SignatureInvalid, PolicyViolation, RateLimitExceeded):
+        app.add_exception_handler(coded, _coded_exception_handler)
     app.add_exception_handler(RequestValidationError, _validation_exception_handler)
     app.add_exception_handler(Exception, _unhandled_exception_handler)
     app.add_middleware(ObservabilityMiddleware)
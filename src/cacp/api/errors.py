@@ -0,0 +1,62 @@
+"""Typed HTTP errors with pre-rendered JSON bodies.
+
+Each subclass has a fixed status, error code and message, so its error
+payload is encoded once at class creation; the handler only splices in
+the request id.
+"""
+
+from __future__ import annotations
+
+from typing import ClassVar
+
+import orjson
+from fastapi import HTTPException
+
+__all__ = [
+    "CodedHTTPException",
+    "PolicyViolation",
+    "RateLimitExceeded",
+    "SignatureInvalid",
+]
+
+
+class CodedHTTPException(HTTPException):
+    """Base for errors whose payload is known ahead of time."""
+
+    status: ClassVar[int] = 500
+    error_code: ClassVar[str] = "INTERNAL_ERROR"
+    message: ClassVar[str] = "Internal server error"
+    body_prefix: ClassVar[bytes] = b""
+
+    def __init_subclass__(cls) -> None:
+        super().__init_subclass__()
+        # '{"error_code":...,"message":...' + ',"request_id":' — the handler
+        # appends the JSON-encoded id and the closing brace.
+        cls.body_prefix = (
+            orjson.dumps({"error_code": cls.error_code, "message": cls.message})[:-1]
+            + b',"request_id":'
+        )
+
+    def __init__(self) -> None:
+        super().__init__(status_code=self.status, detail=self.message)
+
+    def render(self, request_id: str) -> bytes:
+        return self.body_prefix + orjson.dumps(request_id) + b"}"
+
+
+class SignatureInvalid(CodedHTTPException):
+    status = 401
+    error_code = "SIGNATURE_INVALID"
+    message = "Invalid signature"
+
+
+class PolicyViolation(CodedHTTPException):
+    status = 403
+    error_code = "POLICY_VIOLATION"
+    message = "Action blocked by policy"
+
+
+class RateLimitExceeded(CodedHTTPException):
+    status = 429
+    error_code = "RATE_LIMIT_EXCEEDED"
+    message = "Rate limit exceeded"
@@ -0,0 +1,36 @@
+"""Background-task event emit shared by the webhook routes."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from cacp.storage.event_store import EventStoreProtocol
+
+__all__ = ["emit_event"]
+
+logger = logging.getLogger(__name__)
+
+
+def emit_event(
+    event_store: EventStoreProtocol | None,
+    aggregate_id: str,
+    event_type: str,
+    payload: dict[str, Any],
+) -> None:
+    """Fire-and-forget event emit; runs as a background task after the response.
+
+    The response has already gone out, so append failures are logged here
+    instead of surfacing as an unhandled background-task error.
+    """
+    if event_store is None:
+        return
+    try:
+        event_store.append(
+            aggregate_id=aggregate_id,
+            event_type=event_type,
+            payload=payload,
+        )
+    except Exception:
+        logger.warning("Event store append failed for %s", event_type, exc_info=True)
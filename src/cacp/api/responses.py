@@ -0,0 +1,21 @@
+"""Response classes shared by the API."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from starlette.responses import JSONResponse
+
+__all__ = ["ORJSONResponse"]
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (C encoder, bytes out).
+
+    Use for hand-built ``dict`` responses; routes with a declared return
+    type keep FastAPI's own pydantic serialisation.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -3,11 +3,10 @@
 from __future__ import annotations
 
 import time
-from typing import Any
 
 from fastapi import APIRouter, Request, Response
-from starlette.responses import JSONResponse
 
+from cacp.api.responses import ORJSONResponse
 from cacp.healthchecks import check_opa, check_postgres, check_redis
 
 router = APIRouter()
@@ -16,99 +15,182 @@ __all__ = ["router"]
 
 # ──────────── In-process metrics counters ────────────
 # Replaced by prometheus_client in production; this is a zero-dep baseline.
-_metrics: dict[str, Any] = {
-    "requests_total": 0,
-    "requests_by_status": {},
-    "opa_decisions_allow": 0,
-    "opa_decisions_deny": 0,
-    "opa_errors": 0,
-    "queue_depth": 0,
-    "start_time": time.time(),
-    # Business metrics — Sprint 3
-    "actions_sent": {},  # channel → count
-    "actions_blocked": {},  # reason → count
-    "actions_failed": {},  # provider → count
-    # Delivery metrics — Sprint 4
-    "sms_delivery": {},  # status → count  (queued/sent/delivered/failed)
-    "dlq_depth": 0,
-    "retries_scheduled": 0,
-}
+# Plain module globals: record_request runs on every request, so the hot
+# path is an int increment plus one int-keyed dict update.
+_start_time = time.time()
+_requests_total = 0
+_requests_by_status: dict[int, int] = {}
+_opa_decisions_allow = 0
+_opa_decisions_deny = 0
+_opa_errors = 0
+_queue_depth = 0
+# Business metrics — Sprint 3
+_actions_sent: dict[str, int] = {}  # channel → count
+_actions_blocked: dict[str, int] = {}  # reason → count
+_actions_failed: dict[str, int] = {}  # provider → count
+# Delivery metrics — Sprint 4
+_sms_delivery: dict[str, int] = {}  # status → count  (queued/sent/delivered/failed)
+_dlq_depth = 0
+_retries_scheduled = 0
 
 
 def record_request(status: int) -> None:
     """Call from middleware to track request counts."""
-    _metrics["requests_total"] += 1
-    key = str(status)
-    _metrics["requests_by_status"][key] = _metrics["requests_by_status"].get(key, 0) + 1
+    global _requests_total
+    _requests_total += 1
+    try:
+        _requests_by_status[status] += 1
+    except KeyError:
+        _requests_by_status[status] = 1
 
 
 def record_opa_decision(allowed: bool) -> None:
+    global _opa_decisions_allow, _opa_decisions_deny
     if allowed:
-        _metrics["opa_decisions_allow"] += 1
+        _opa_decisions_allow += 1
     else:
-        _metrics["opa_decisions_deny"] += 1
+        _opa_decisions_deny += 1
 
 
 def record_opa_error() -> None:
-    _metrics["opa_errors"] += 1
+    global _opa_errors
+    _opa_errors += 1
 
 
 def set_queue_depth(depth: int) -> None:
-    _metrics["queue_depth"] = depth
+    global _queue_depth
+    _queue_depth = depth
 
 
 def record_action_sent(channel: str) -> None:
     """Increment counter for successfully sent actions."""
-    _metrics["actions_sent"][channel] = _metrics["actions_sent"].get(channel, 0) + 1
+    _actions_sent[channel] = _actions_sent.get(channel, 0) + 1
 
 
 def record_action_blocked(reason: str) -> None:
     """Increment counter for blocked actions."""
-    _metrics["actions_blocked"][reason] = _metrics["actions_blocked"].get(reason, 0) + 1
+    _actions_blocked[reason] = _actions_blocked.get(reason, 0) + 1
 
 
 def record_action_failed(provider: str) -> None:
     """Increment counter for failed actions."""
-    _metrics["actions_failed"][provider] = _metrics["actions_failed"].get(provider, 0) + 1
+    _actions_failed[provider] = _actions_failed.get(provider, 0) + 1
 
 
 def record_sms_delivery(status: str) -> None:
     """Increment delivery status counter (queued/sent/delivered/failed)."""
-    _metrics["sms_delivery"][status] = _metrics["sms_delivery"].get(status, 0) + 1
+    _sms_delivery[status] = _sms_delivery.get(status, 0) + 1
 
 
 def set_dlq_depth(depth: int) -> None:
-    _metrics["dlq_depth"] = depth
+    global _dlq_depth
+    _dlq_depth = depth
 
 
 def record_retry_scheduled() -> None:
-    _metrics["retries_scheduled"] += 1
+    global _retries_scheduled
+    _retries_scheduled += 1
+
+
+# ──────────── Exposition layout ────────────
+# HELP/TYPE lines never change, so the page is pre-encoded once and only
+# the counter values are formatted per scrape.
+
+_HEAD_TEMPLATE = (
+    b"# HELP cacp_up Control plane is up\n"
+    b"# TYPE cacp_up gauge\n"
+    b"cacp_up 1\n"
+    b"\n"
+    b"# HELP cacp_uptime_seconds Seconds since process start\n"
+    b"# TYPE cacp_uptime_seconds gauge\n"
+    b"cacp_uptime_seconds %.1f\n"
+    b"\n"
+    b"# HELP cacp_requests_total Total HTTP requests\n"
+    b"# TYPE cacp_requests_total counter\n"
+    b"cacp_requests_total %d\n"
+    b"\n"
+)
+
+_OPA_QUEUE_TEMPLATE = (
+    b"\n"
+    b"# HELP cacp_opa_decisions_total OPA decisions\n"
+    b"# TYPE cacp_opa_decisions_total counter\n"
+    b'cacp_opa_decisions_total{result="allow"} %d\n'
+    b'cacp_opa_decisions_total{result="deny"} %d\n'
+    b"\n"
+    b"# HELP cacp_opa_errors_total OPA unreachable / error count\n"
+    b"# TYPE cacp_opa_errors_total counter\n"
+    b"cacp_opa_errors_total %d\n"
+    b"\n"
+    b"# HELP cacp_queue_depth Current items in action queue\n"
+    b"# TYPE cacp_queue_depth gauge\n"
+    b"cacp_queue_depth %d\n"
+    b"\n"
+)
+
+_ACTIONS_SENT_HEADER = (
+    b"# HELP cacp_actions_sent_total Actions successfully sent\n"
+    b"# TYPE cacp_actions_sent_total counter\n"
+)
+_ACTIONS_BLOCKED_HEADER = (
+    b"# HELP cacp_actions_blocked_total Actions blocked by rails\n"
+    b"# TYPE cacp_actions_blocked_total counter\n"
+)
+_ACTIONS_FAILED_HEADER = (
+    b"# HELP cacp_actions_failed_total Actions failed at provider\n"
+    b"# TYPE cacp_actions_failed_total counter\n"
+)
+_SMS_DELIVERY_HEADER = (
+    b"# HELP cacp_sms_delivery_total SMS delivery status counts\n"
+    b"# TYPE cacp_sms_delivery_total counter\n"
+)
+
+_TAIL_TEMPLATE = (
+    b"# HELP cacp_dlq_depth Current dead-letter queue depth\n"
+    b"# TYPE cacp_dlq_depth gauge\n"
+    b"cacp_dlq_depth %d\n"
+    b"\n"
+    b"# HELP cacp_retries_scheduled_total Retries scheduled\n"
+    b"# TYPE cacp_retries_scheduled_total counter\n"
+    b"cacp_retries_scheduled_total %d\n"
+)
+
+
+def _labelled(metric: bytes, label: bytes, counts: dict[str, int]) -> bytes:
+    """One sample line per label value, sorted for stable output."""
+    return b"".join(
+        b'%s{%s="%s"} %d\n' % (metric, label, key.encode(), count)
+        for key, count in sorted(counts.items())
+    )
 
 
 # ──────────── Endpoints ────────────
 
 
+_HEALTH_BODY = b'{"status":"ok"}'
+
+
 @router.get("/health", summary="Liveness probe", operation_id="health")
-async def health() -> dict[str, str]:
+async def health() -> Response:
     """Liveness: app process is running."""
-    return {"status": "ok"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @router.get("/ready", summary="Readiness probe", operation_id="ready")
-async def ready(request: Request) -> JSONResponse:
+async def ready(request: Request) -> ORJSONResponse:
     """Readiness: downstream dependencies reachable.
 
     Returns 200 when all checks pass, 503 otherwise.
     """
     settings = request.app.state.settings
-    pg = await check_postgres(settings.pg_dsn)
+    pg = await check_postgres(settings.pg_dsn, getattr(request.app.state, "pg_pool", None))
     rd = await check_redis(settings.redis_url)
-    opa = await check_opa(settings.opa_url)
+    opa = await check_opa(settings.opa_url, getattr(request.app.state, "http_client", None))
 
     all_ok = pg and rd and opa
     checks = {"postgres": pg, "redis": rd, "opa": opa}
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200 if all_ok else 503,
         content={"ready": all_ok, "checks": checks},
     )
@@ -117,90 +199,40 @@ async def ready(request: Request) -> JSONResponse:
 @router.get("/metrics", summary="Prometheus metrics", operation_id="metrics")
 async def metrics() -> Response:
     """Prometheus text exposition format."""
-    uptime = time.time() - _metrics["start_time"]
-
-    lines = [
-        "# HELP cacp_up Control plane is up",
-        "# TYPE cacp_up gauge",
-        "cacp_up 1",
-        "",
-        "# HELP cacp_uptime_seconds Seconds since process start",
-        "# TYPE cacp_uptime_seconds gauge",
-        f"cacp_uptime_seconds {uptime:.1f}",
-        "",
-        "# HELP cacp_requests_total Total HTTP requests",
-        "# TYPE cacp_requests_total counter",
-        f"cacp_requests_total {_metrics['requests_total']}",
-        "",
-    ]
-
-    # Per-status breakdown
-    for status, count in sorted(_metrics["requests_by_status"].items()):
-        lines.append(f'cacp_requests_total{{status="{status}"}} {count}')
-
-    lines += [
-        "",
-        "# HELP cacp_opa_decisions_total OPA decisions",
-        "# TYPE cacp_opa_decisions_total counter",
-        f'cacp_opa_decisions_total{{result="allow"}} {_metrics["opa_decisions_allow"]}',
-        f'cacp_opa_decisions_total{{result="deny"}} {_metrics["opa_decisions_deny"]}',
-        "",
-        "# HELP cacp_opa_errors_total OPA unreachable / error count",
-        "# TYPE cacp_opa_errors_total counter",
-        f"cacp_opa_errors_total {_metrics['opa_errors']}",
-        "",
-        "# HELP cacp_queue_depth Current items in action queue",
-        "# TYPE cacp_queue_depth gauge",
-        f"cacp_queue_depth {_metrics['queue_depth']}",
-        "",
-    ]
-
-    # Business metrics — actions sent per channel
-    lines += [
-        "# HELP cacp_actions_sent_total Actions successfully sent",
-        "# TYPE cacp_actions_sent_total counter",
-    ]
-    for ch, cnt in sorted(_metrics["actions_sent"].items()):
-        lines.append(f'cacp_actions_sent_total{{channel="{ch}"}} {cnt}')
-    lines.append("")
-
-    # Actions blocked per reason
-    lines += [
-        "# HELP cacp_actions_blocked_total Actions blocked by rails",
-        "# TYPE cacp_actions_blocked_total counter",
-    ]
-    for reason, cnt in sorted(_metrics["actions_blocked"].items()):
-        lines.append(f'cacp_actions_blocked_total{{reason="{reason}"}} {cnt}')
-    lines.append("")
-
-    # Actions failed per provider
-    lines += [
-        "# HELP cacp_actions_failed_total Actions failed at provider",
-        "# TYPE cacp_actions_failed_total counter",
-    ]
-    for prov, cnt in sorted(_metrics["actions_failed"].items()):
-        lines.append(f'cacp_actions_failed_total{{provider="{prov}"}} {cnt}')
-    lines.append("")
-
-    # Delivery metrics — SMS status from Twilio callbacks
-    lines += [
-        "# HELP cacp_sms_delivery_total SMS delivery status counts",
-        "# TYPE cacp_sms_delivery_total counter",
-    ]
-    for st, cnt in sorted(_metrics["sms_delivery"].items()):
-        lines.append(f'cacp_sms_delivery_total{{status="{st}"}} {cnt}')
-    lines.append("")
-
-    # DLQ depth
-    lines += [
-        "# HELP cacp_dlq_depth Current dead-letter queue depth",
-        "# TYPE cacp_dlq_depth gauge",
-        f"cacp_dlq_depth {_metrics['dlq_depth']}",
-        "",
-        "# HELP cacp_retries_scheduled_total Retries scheduled",
-        "# TYPE cacp_retries_scheduled_total counter",
-        f"cacp_retries_scheduled_total {_metrics['retries_scheduled']}",
-        "",
-    ]
-
-    return Response(content="\n".join(lines), media_type="text/plain; charset=utf-8")
+    uptime = time.time() - _start_time
+
+    body = b"".join(
+        (
+            _HEAD_TEMPLATE % (uptime, _requests_total),
+            b"".join(
+                b'cacp_requests_total{status="%d"} %d\n' % item
+                for item in sorted(_requests_by_status.items())
+            ),
+            _OPA_QUEUE_TEMPLATE
+            % (
+                _opa_decisions_allow,
+                _opa_decisions_deny,
+                _opa_errors,
+                _queue_depth,
+            ),
+            # Business metrics — actions sent per channel
+            _ACTIONS_SENT_HEADER,
+            _labelled(b"cacp_actions_sent_total", b"channel", _actions_sent),
+            b"\n",
+            # Actions blocked per reason
+            _ACTIONS_BLOCKED_HEADER,
+            _labelled(b"cacp_actions_blocked_total", b"reason", _actions_blocked),
+            b"\n",
+            # Actions failed per provider
+            _ACTIONS_FAILED_HEADER,
+            _labelled(b"cacp_actions_failed_total", b"provider", _actions_failed),
+            b"\n",
+            # Delivery metrics — SMS status from Twilio callbacks
+            _SMS_DELIVERY_HEADER,
+            _labelled(b"cacp_sms_delivery_total", b"status", _sms_delivery),
+            b"\n",
+            _TAIL_TEMPLATE % (_dlq_depth, _retries_scheduled),
+        )
+    )
+
+    return Response(content=body, media_type="text/plain; charset=utf-8")
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 
-from fastapi import APIRouter, Request, status
+from fastapi import APIRouter, Request, Response, status
 from pydantic import BaseModel, Field
 
 router = APIRouter()
@@ -49,12 +49,18 @@ class IngestResponse(BaseModel):
     summary="Ingest an appointment for no-show risk assessment",
     operation_id="ingest_appointment",
 )
-async def ingest_appointment(appointment: AppointmentIn, request: Request) -> IngestResponse:
-    """Receive an appointment → score risk → generate proposal → open PR."""
+async def ingest_appointment(appointment: AppointmentIn, request: Request) -> Response:
+    """Receive an appointment → score risk → generate proposal → open PR.
+
+    ``response_model`` documents the body; returning a ready ``Response``
+    skips FastAPI's second validation pass.  The fields come straight from
+    the orchestrator's typed result, so the model is built with
+    ``model_construct`` (no validation) and serialised by pydantic-core.
+    """
     orchestrator = request.app.state.orchestrator
     result = await orchestrator.process_appointment(appointment.model_dump())
 
-    return IngestResponse(
+    response = IngestResponse.model_construct(
         proposal_id=result.proposal_id,
         risk_level=result.risk_level,
         risk_score=result.risk_score,
@@ -68,3 +74,8 @@ async def ingest_appointment(appointment: AppointmentIn, request: Request) -> In
             + (f" — PR: {result.pr_url}" if result.pr_url else "")
         ),
     )
+    return Response(
+        content=response.model_dump_json(),
+        status_code=status.HTTP_202_ACCEPTED,
+        media_type="application/json",
+    )
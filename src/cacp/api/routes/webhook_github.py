@@ -2,15 +2,18 @@
 
 from __future__ import annotations
 
-import hashlib
 import hmac
-import json
 import logging
+import re
 from typing import Any
 
-from fastapi import APIRouter, Header, HTTPException, Request, status
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Request, status
 from pydantic import BaseModel
-from starlette.responses import JSONResponse
+
+from cacp.api.errors import SignatureInvalid
+from cacp.api.events import emit_event
+from cacp.api.responses import ORJSONResponse
 
 router = APIRouter()
 
@@ -19,20 +22,58 @@ __all__ = ["router"]
 logger = logging.getLogger(__name__)
 
 EXPECTED_REPO = "clinic-gitops-config"
+_ACCEPTED_REPOS = frozenset({EXPECTED_REPO})
 IDEMPOTENCY_TTL = 86400  # 24 h
 
+# A body line starting (after blanks) with "appointment_id:", any case.
+# Matching on the original text keeps offsets exact: str.lower() can change
+# the length of non-ASCII text.
+_APPOINTMENT_LINE = re.compile(
+    r"^[^\S\r\n]*appointment_id:([^\r\n]*)", re.IGNORECASE | re.MULTILINE
+)
+
 
 class WebhookResponse(BaseModel):
     status: str
     message: str
 
 
-def _verify_signature(payload_body: bytes, secret: str, signature_header: str) -> bool:
-    """Verify GitHub HMAC-SHA256 webhook signature."""
+def _decode_signature_header(signature_header: str) -> bytes | None:
+    """Return the raw digest from a ``sha256=<hex>`` header, or None if malformed."""
     if not signature_header.startswith("sha256="):
+        return None
+    try:
+        return bytes.fromhex(signature_header[7:])
+    except ValueError:
+        return None
+
+
+def _verify_signature(payload_body: bytes, secret: str, signature_header: str) -> bool:
+    """Verify GitHub HMAC-SHA256 webhook signature.
+
+    Compares raw digests: the header's hex is decoded once instead of
+    hex-encoding our digest and building a prefixed string.
+    """
+    received = _decode_signature_header(signature_header)
+    if received is None:
         return False
-    expected = "sha256=" + hmac.new(secret.encode(), payload_body, hashlib.sha256).hexdigest()
-    return hmac.compare_digest(expected, signature_header)
+    expected = hmac.digest(secret.encode(), payload_body, "sha256")
+    return hmac.compare_digest(expected, received)
+
+
+async def _read_signed_body(request: Request, secret: str) -> tuple[bytearray, bytes]:
+    """Read the request body, feeding the HMAC as chunks arrive.
+
+    Returns the body and its HMAC-SHA256 digest.  The body is accumulated
+    in a single ``bytearray`` — no list of chunks joined into a second
+    full-size copy, and hashing overlaps with the network read.
+    """
+    mac = hmac.new(secret.encode(), digestmod="sha256")
+    body = bytearray()
+    async for chunk in request.stream():
+        mac.update(chunk)
+        body += chunk
+    return body, mac.digest()
 
 
 @router.post(
@@ -44,76 +85,72 @@ def _verify_signature(payload_body: bytes, secret: str, signature_header: str) -
 )
 async def github_webhook(
     request: Request,
+    background: BackgroundTasks,
     x_github_event: str = Header(default=""),
     x_hub_signature_256: str = Header(default=""),
     x_github_delivery: str = Header(default=""),
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Handle GitHub webhook for PR merged events.
 
     Flow:
     1. Verify X-Hub-Signature-256
-    2. Idempotency via X-GitHub-Delivery in Redis SETNX
-    3. Filter: only pull_request / closed / merged
-    4. Emit pr_merged event + enqueue actions
+    2. Filter: only pull_request (header, before parsing) / closed / merged
+       from the tracked repo
+    3. Idempotency via X-GitHub-Delivery (SET NX) + enqueue, in one
+       server-side script — a single Redis round-trip
+    4. Emit pr_merged event (background task, after the response is sent)
     """
     settings = request.app.state.settings
-    body = await request.body()
 
-    # 1) Signature verification (fail-closed)
+    # 1) Signature verification (fail-closed); a malformed header is
+    #    rejected before the body is read.
     if not settings.github_webhook_secret:
         logger.error("GITHUB_WEBHOOK_SECRET not set; rejecting webhook (fail-closed)")
         raise HTTPException(
             status_code=503,
             detail="Webhook signature verification not configured",
         )
-    if not _verify_signature(body, settings.github_webhook_secret, x_hub_signature_256):
-        raise HTTPException(status_code=401, detail="Invalid signature")
-
-    # 2) Parse payload
-    try:
-        payload: dict[str, Any] = json.loads(body)
-    except (json.JSONDecodeError, ValueError) as exc:
-        raise HTTPException(status_code=400, detail="Invalid JSON") from exc
-
-    # 3) Idempotency gate
-    redis_client = getattr(request.app.state, "redis_client", None)
-    if redis_client and x_github_delivery:
-        idem_key = f"cacp:webhook:delivery:{x_github_delivery}"
-        was_new = redis_client.set(idem_key, "1", nx=True, ex=IDEMPOTENCY_TTL)
-        if not was_new:
-            logger.info("Duplicate delivery %s, skipping", x_github_delivery)
-            return JSONResponse(
-                status_code=200,
-                content={"status": "duplicate", "message": "Already processed"},
-            )
-
-    # 4) Filter: only merged PRs
+    received = _decode_signature_header(x_hub_signature_256)
+    if received is None:
+        raise SignatureInvalid()
+    body, expected = await _read_signed_body(request, settings.github_webhook_secret)
+    if not hmac.compare_digest(expected, received):
+        raise SignatureInvalid()
+
+    # 2) Filter on the event header before parsing: pushes, issues and pings
+    #    never need their body decoded.
     if x_github_event != "pull_request":
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=202,
             content={"status": "ignored", "message": f"Event type '{x_github_event}' ignored"},
         )
 
+    # 3) Parse payload; only merged PRs go further
+    try:
+        payload: dict[str, Any] = orjson.loads(body)
+    except orjson.JSONDecodeError as exc:
+        raise HTTPException(status_code=400, detail="Invalid JSON") from exc
+
     action = payload.get("action", "")
     pr = payload.get("pull_request", {})
     merged = pr.get("merged", False)
 
     if action != "closed" or not merged:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=202,
             content={"status": "ignored", "message": "PR not merged"},
         )
 
-    # 5) Validate source repo
+    # 4) Validate source repo
     repo_name = payload.get("repository", {}).get("name", "")
-    if repo_name != EXPECTED_REPO:
+    if repo_name not in _ACCEPTED_REPOS:
         logger.warning("Webhook from unexpected repo: %s", repo_name)
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=202,
             content={"status": "ignored", "message": f"Repo '{repo_name}' not tracked"},
         )
 
-    # 6) Extract data and emit event
+    # 5) Extract data
     pr_number = pr.get("number", 0)
     merge_sha = pr.get("merge_commit_sha", "")
     pr_title = pr.get("title", "")
@@ -122,36 +159,47 @@ async def github_webhook(
     # Derive appointment_id from PR title or body (convention: "proposal/<id>")
     appointment_id = _extract_appointment_id(pr_title, pr_body)
 
-    event_store = getattr(request.app.state, "event_store", None)
-    if event_store:
-        event_store.append(
-            aggregate_id=appointment_id or f"pr-{pr_number}",
-            event_type="pr_merged",
-            payload={
-                "pr_number": pr_number,
-                "merge_commit_sha": merge_sha,
-                "appointment_id": appointment_id,
-                "repo": repo_name,
-            },
-        )
-
-    # 7) Enqueue job for worker
+    # 6) Idempotency gate + enqueue job for worker (one Redis round-trip)
+    redis_client = getattr(request.app.state, "redis_client", None)
     if redis_client:
-        from cacp.queue.enqueue import enqueue_action
-
-        enqueue_action(
-            redis_client,
-            {
-                "action_type": "execute_plan",
-                "pr_number": pr_number,
-                "merge_commit_sha": merge_sha,
-                "appointment_id": appointment_id,
-                "environment": settings.environment,
-            },
-        )
+        from cacp.queue.enqueue import enqueue_action, enqueue_action_once
+
+        job = {
+            "action_type": "execute_plan",
+            "pr_number": pr_number,
+            "merge_commit_sha": merge_sha,
+            "appointment_id": appointment_id,
+            "environment": settings.environment,
+        }
+        if x_github_delivery:
+            idem_key = f"cacp:webhook:delivery:{x_github_delivery}"
+            if not enqueue_action_once(redis_client, idem_key, IDEMPOTENCY_TTL, job):
+                logger.info("Duplicate delivery %s, skipping", x_github_delivery)
+                return ORJSONResponse(
+                    status_code=200,
+                    content={"status": "duplicate", "message": "Already processed"},
+                )
+        else:
+            enqueue_action(redis_client, job)
         logger.info("Enqueued execution for PR #%s (appointment %s)", pr_number, appointment_id)
 
-    return JSONResponse(
+    # 7) Emit event off the request path. It is written after the response,
+    # so the worker may already be running the job by then: pr_merged can
+    # land in the log after the job's first action_* event.
+    background.add_task(
+        emit_event,
+        getattr(request.app.state, "event_store", None),
+        appointment_id or f"pr-{pr_number}",
+        "pr_merged",
+        {
+            "pr_number": pr_number,
+            "merge_commit_sha": merge_sha,
+            "appointment_id": appointment_id,
+            "repo": repo_name,
+        },
+    )
+
+    return ORJSONResponse(
         status_code=202,
         content={"status": "accepted", "message": f"PR #{pr_number} merged; execution enqueued"},
     )
@@ -159,16 +207,14 @@ async def github_webhook(
 
 def _extract_appointment_id(title: str, body: str) -> str:
     """Best-effort extraction of appointment_id from PR title/body."""
-    # Try body first: "appointment_id: APT-123"
-    for line in body.splitlines():
-        stripped = line.strip()
-        if stripped.lower().startswith("appointment_id:"):
-            return stripped.split(":", 1)[1].strip()
+    # Try body first: a line starting with "appointment_id: APT-123".
+    # One regex scan instead of splitting the body into lines.
+    match = _APPOINTMENT_LINE.search(body)
+    if match:
+        return match.group(1).strip()
 
     # Fallback: extract from title like "proposal/abc123 -> APT-100"
     if "->" in title:
-        parts = title.split("->")
-        if len(parts) > 1:
-            return parts[-1].strip()
+        return title.rpartition("->")[2].strip()
 
     return ""
@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
-import hashlib
+import base64
+import binascii
 import hmac
 import logging
 from typing import TYPE_CHECKING, Any
 from urllib.parse import parse_qsl
 
-from fastapi import APIRouter, HTTPException, Request
-from starlette.responses import JSONResponse
+from fastapi import APIRouter, BackgroundTasks, Request
+
+from cacp.api.errors import SignatureInvalid
+from cacp.api.events import emit_event
+from cacp.api.responses import ORJSONResponse
+from cacp.consent import hash_pii
 
 if TYPE_CHECKING:
     from cacp.storage.event_store import EventStoreProtocol
@@ -36,35 +41,19 @@ def _verify_twilio_signature(
     """
     if not auth_token or not signature:
         return False
-    data = url
-    for key in sorted(params.keys()):
-        data += key + params[key]
-
-    expected = hmac.new(auth_token.encode("utf-8"), data.encode("utf-8"), hashlib.sha1).digest()
-
-    import base64
-
-    expected_b64 = base64.b64encode(expected).decode("utf-8")
-    return hmac.compare_digest(expected_b64, signature)
+    # Collect the pieces and join once — no quadratic ``+=`` rebuilds.
+    parts = [url]
+    for key in sorted(params):
+        parts.append(key)
+        parts.append(params[key])
+    data = "".join(parts).encode("utf-8")
 
-
-def _emit_event(
-    event_store: EventStoreProtocol | None,
-    aggregate_id: str,
-    event_type: str,
-    payload: dict[str, Any],
-) -> None:
-    """Fire-and-forget event emit."""
-    if event_store is None:
-        return
     try:
-        event_store.append(
-            aggregate_id=aggregate_id,
-            event_type=event_type,
-            payload=payload,
-        )
-    except Exception:
-        logger.warning("Event store append failed for %s", event_type, exc_info=True)
+        received = base64.b64decode(signature, validate=True)
+    except binascii.Error:
+        return False
+    expected = hmac.digest(auth_token.encode("utf-8"), data, "sha1")
+    return hmac.compare_digest(expected, received)
 
 
 @router.post(
@@ -72,7 +61,7 @@ def _emit_event(
     summary="Twilio delivery status callback",
     operation_id="twilio_status_callback",
 )
-async def twilio_status_callback(request: Request) -> JSONResponse:
+async def twilio_status_callback(request: Request, background: BackgroundTasks) -> ORJSONResponse:
     """Receive Twilio message status updates.
 
     Expected POST params: MessageSid, MessageStatus, To, ErrorCode (optional).
@@ -89,7 +78,7 @@ async def twilio_status_callback(request: Request) -> JSONResponse:
         url = str(request.url)
         if not _verify_twilio_signature(url, params, sig, settings.twilio_auth_token):
             logger.warning("Twilio signature verification failed")
-            raise HTTPException(status_code=401, detail="Invalid signature")
+            raise SignatureInvalid()
 
     message_sid = params.get("MessageSid", "")
     status = params.get("MessageStatus", "")
@@ -97,7 +86,7 @@ async def twilio_status_callback(request: Request) -> JSONResponse:
     error_code = params.get("ErrorCode")
 
     if not message_sid or status not in _TRACKABLE_STATUSES:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={"ignored": True, "reason": "untracked_status"},
         )
@@ -107,15 +96,15 @@ async def twilio_status_callback(request: Request) -> JSONResponse:
     payload: dict[str, Any] = {
         "message_sid": message_sid,
         "status": status,
-        "to_hash": hashlib.sha256(to_number.encode("utf-8")).hexdigest()[:16],
+        "to_hash": hash_pii(to_number),
     }
     if error_code:
         payload["error_code"] = error_code
 
     # Use message_sid as aggregate (we don't have appointment_id here)
     event_store: EventStoreProtocol | None = getattr(request.app.state, "event_store", None)
-    _emit_event(event_store, message_sid, event_type, payload)
+    background.add_task(emit_event, event_store, message_sid, event_type, payload)
 
     logger.info("Twilio status: sid=%s status=%s", message_sid[:10] + "...", status)
 
-    return JSONResponse(status_code=200, content={"accepted": True, "status": status})
+    return ORJSONResponse(status_code=200, content={"accepted": True, "status": status})
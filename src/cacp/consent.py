@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import hashlib
+import time
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any, Protocol
@@ -16,23 +17,40 @@ __all__ = [
 
 
 def hash_pii(value: str) -> str:
-    """One-way hash for PII (phone, email) — never store in clear."""
-    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+    """One-way hash for PII (phone, email) — never store in clear.
 
+    Same 16 hex chars as ``sha256(...).hexdigest()[:16]``, without
+    hex-encoding the 24 bytes that get thrown away.
+    """
+    return hashlib.sha256(value.encode("utf-8")).digest()[:8].hex()
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class ConsentRecord:
-    """Immutable consent snapshot."""
+    """Immutable consent snapshot.
+
+    Timestamps are epoch seconds; the ISO-8601 form is built on demand.
+    """
 
     patient_id: str
     channel: str  # "sms" | "whatsapp" | "email"
-    granted_at: str
-    revoked_at: str | None = None
+    granted_at: int
+    revoked_at: int | None = None
 
     @property
     def is_active(self) -> bool:
         return self.revoked_at is None
 
+    @property
+    def granted_at_iso(self) -> str:
+        return datetime.fromtimestamp(self.granted_at, UTC).isoformat()
+
+    @property
+    def revoked_at_iso(self) -> str | None:
+        if self.revoked_at is None:
+            return None
+        return datetime.fromtimestamp(self.revoked_at, UTC).isoformat()
+
 
 class ConsentStoreProtocol(Protocol):
     """Minimal contract for consent lookups."""
@@ -54,44 +72,50 @@ class InMemoryConsentStore:
     """In-memory consent store for dev/test."""
 
     def __init__(self) -> None:
-        self._records: dict[str, ConsentRecord] = {}
-
-    def _key(self, patient_id: str, channel: str) -> str:
-        return f"{patient_id}:{channel}"
+        # Keyed by (patient_id, channel): no string building per lookup, and
+        # no ambiguity when an id itself contains ':'.
+        self._records: dict[tuple[str, str], ConsentRecord] = {}
 
     def has_consent(self, patient_id: str, channel: str) -> bool:
-        record = self._records.get(self._key(patient_id, channel))
+        record = self._records.get((patient_id, channel))
         return record is not None and record.is_active
 
-    def grant(self, patient_id: str, channel: str) -> None:
-        self._records[self._key(patient_id, channel)] = ConsentRecord(
+    def grant(self, patient_id: str, channel: str, *, now: int | None = None) -> None:
+        self._records[patient_id, channel] = ConsentRecord(
             patient_id=patient_id,
             channel=channel,
-            granted_at=datetime.now(UTC).isoformat(),
+            granted_at=int(time.time()) if now is None else now,
         )
 
-    def revoke(self, patient_id: str, channel: str) -> None:
-        key = self._key(patient_id, channel)
+    def revoke(self, patient_id: str, channel: str, *, now: int | None = None) -> None:
+        key = (patient_id, channel)
         existing = self._records.get(key)
         if existing and existing.is_active:
             self._records[key] = ConsentRecord(
                 patient_id=existing.patient_id,
                 channel=existing.channel,
                 granted_at=existing.granted_at,
-                revoked_at=datetime.now(UTC).isoformat(),
+                revoked_at=int(time.time()) if now is None else now,
             )
 
-    def load_from_appointment(self, appointment: dict[str, Any]) -> None:
+    def load_from_appointment(
+        self, appointment: dict[str, Any], *, now: int | None = None
+    ) -> None:
         """Bootstrap consent from appointment payload (dev convenience).
 
         If appointment has consent_given=True and a phone, grant sms.
         Real system would have a dedicated consent service.
+
+        Batch importers should read the clock once and pass ``now`` (epoch
+        seconds) for every appointment.
         """
         patient_id = appointment.get("patient_id", "")
         if not patient_id:
             return
         if appointment.get("consent_given"):
+            if now is None:
+                now = int(time.time())
             if appointment.get("patient_phone"):
-                self.grant(patient_id, "sms")
+                self.grant(patient_id, "sms", now=now)
             if appointment.get("patient_whatsapp"):
-                self.grant(patient_id, "whatsapp")
+                self.grant(patient_id, "whatsapp", now=now)
@@ -15,7 +15,7 @@ if TYPE_CHECKING:
 __all__ = ["ROIProjection", "project_roi"]
 
 
-@dataclass
+@dataclass(slots=True)
 class ROIProjection:
     """Financial projection from a simulation cohort."""
 
@@ -100,9 +100,8 @@ def project_roi(
     sms_cost_per_message:
         Cost per SMS in EUR.  Twilio ES pricing ~0.07€ (2025).
     """
-    # Compute real avg ticket from simulation data
-    total_ticket = sum(a.ticket_value for a in sim.appointments)
-    avg_ticket = total_ticket / max(sim.total, 1)
+    # Real avg ticket from simulation data (summed during generation)
+    avg_ticket = sim.ticket_total / max(sim.total, 1)
 
     baseline_loss = sim.noshow_baseline * avg_ticket
     recovered = sim.noshows_prevented * avg_ticket
@@ -12,9 +12,14 @@ import random
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import StrEnum
-from typing import Any
+from functools import lru_cache
+from itertools import accumulate
+from typing import TYPE_CHECKING, Any
 from zoneinfo import ZoneInfo
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 __all__ = [
     "AppointmentType",
     "SimulatedAppointment",
@@ -60,8 +65,20 @@ _TYPE_NOSHOW_FACTOR: dict[AppointmentType, float] = {
     AppointmentType.EMERGENCY: 0.5,
 }
 
+_TYPES: tuple[AppointmentType, ...] = tuple(_TYPE_DISTRIBUTION)
+_TYPE_CUM_WEIGHTS: tuple[float, ...] = tuple(accumulate(_TYPE_DISTRIBUTION.values()))
+_HOUR_SLOTS: tuple[int, ...] = tuple(range(8, 19))  # 8:00-18:xx starts
+_MINUTE_SLOTS: tuple[int, ...] = (0, 15, 30, 45)
+_WORKING_DAYS = 22
+# Offset of every (hour, minute) slot from the 8:00 day start, built once.
+_SLOT_OFFSETS: dict[tuple[int, int], timedelta] = {
+    (hour, minute): timedelta(hours=hour - 8, minutes=minute)
+    for hour in _HOUR_SLOTS
+    for minute in _MINUTE_SLOTS
+}
+
 
-@dataclass
+@dataclass(slots=True)
 class SimulatedAppointment:
     """Single synthetic appointment with outcome."""
 
@@ -89,17 +106,105 @@ class SimulatedAppointment:
         }
 
 
-@dataclass
+@dataclass(slots=True)
+class _CohortColumns:
+    """Per-appointment data kept column-wise (one list per attribute)."""
+
+    month_start: datetime
+    types: list[AppointmentType]
+    patient_idx: list[int]
+    hours: list[int]
+    minutes: list[int]
+    tickets: list[float]
+    noshow_baseline: list[bool]
+    sms_confirmed: list[bool]
+    noshow_after_sms: list[bool]
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+
+@dataclass(slots=True)
 class SimulationResult:
-    """Aggregate result of a full cohort simulation."""
+    """Aggregate result of a full cohort simulation.
+
+    Outcomes are stored column-wise; ``appointments`` builds the
+    per-appointment objects on first access, so callers that only read
+    the aggregates (e.g. ``project_roi``) never allocate them.
+    """
 
-    appointments: list[SimulatedAppointment] = field(default_factory=list)
     total: int = 0
     noshow_baseline: int = 0
     sms_sent: int = 0
     sms_confirmed: int = 0
     noshow_after_sms: int = 0
     noshows_prevented: int = 0
+    ticket_total: float = 0.0
+    columns: _CohortColumns | None = field(default=None, repr=False)
+    _appointments: list[SimulatedAppointment] | None = field(default=None, init=False, repr=False)
+
+    @property
+    def appointments(self) -> list[SimulatedAppointment]:
+        if self._appointments is None:
+            cols = self.columns
+            if cols is None:
+                self._appointments = []
+            else:
+                patient_ids, scheduled = self._expand(cols)
+                self._appointments = [
+                    SimulatedAppointment(
+                        appointment_id=f"APT-SIM-{i + 1:04d}",
+                        patient_id=patient_ids[i],
+                        appointment_type=cols.types[i],
+                        scheduled_at=scheduled[i],
+                        ticket_value=cols.tickets[i],
+                        is_noshow_baseline=cols.noshow_baseline[i],
+                        sms_sent=True,
+                        sms_confirmed=cols.sms_confirmed[i],
+                        is_noshow_after_sms=cols.noshow_after_sms[i],
+                    )
+                    for i in range(len(cols))
+                ]
+        return self._appointments
+
+    def iter_rows(self) -> Iterator[tuple[Any, ...]]:
+        """Yield one flat tuple per appointment, in ``to_dict`` key order.
+
+        Reads the columns directly — no ``SimulatedAppointment`` objects.
+        """
+        cols = self.columns
+        if cols is None:
+            return
+        patient_ids, scheduled = self._expand(cols)
+        for i in range(len(cols)):
+            yield (
+                f"APT-SIM-{i + 1:04d}",
+                patient_ids[i],
+                cols.types[i].value,
+                scheduled[i].isoformat(),
+                cols.tickets[i],
+                cols.noshow_baseline[i],
+                True,
+                cols.sms_confirmed[i],
+                cols.noshow_after_sms[i],
+            )
+
+    @staticmethod
+    def _expand(cols: _CohortColumns) -> tuple[list[str], list[datetime]]:
+        """Derive patient ids and slot datetimes from the drawn columns."""
+        n = len(cols)
+        month_start = cols.month_start
+        patient_ids = [_deterministic_patient_id(pidx) for pidx in cols.patient_idx]
+        # Spread appointments across ~22 working days, 8:00-19:00.  Day
+        # starts and slot offsets are precomputed, so each row is one
+        # datetime + timedelta add with no timedelta construction.
+        day_starts = [month_start + timedelta(days=d) for d in range(_WORKING_DAYS)]
+        slot_offsets = _SLOT_OFFSETS
+        scheduled = [
+            day_starts[i * _WORKING_DAYS // n] + slot_offsets[hour, minute]
+            for i, (hour, minute) in enumerate(zip(cols.hours, cols.minutes, strict=True))
+        ]
+        return patient_ids, scheduled
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -122,17 +227,40 @@ class SimulationResult:
 # ---------------------------------------------------------------------------
 
 
+# Largest cohort (10 000 citas) has 2 500 patients; ids are reused
+# across requests with the same size, so the cache outlives one call.
+@lru_cache(maxsize=4096)
 def _deterministic_patient_id(index: int) -> str:
     """Generate stable pseudo-anonymous patient ID."""
     raw = f"patient-{index}".encode()
-    return f"PAT-{hashlib.sha256(raw).hexdigest()[:8].upper()}"
+    return f"PAT-{hashlib.sha256(raw).digest()[:4].hex().upper()}"
 
 
-def _pick_type(rng: random.Random) -> AppointmentType:
-    """Weighted random appointment type."""
-    types = list(_TYPE_DISTRIBUTION.keys())
-    weights = list(_TYPE_DISTRIBUTION.values())
-    return rng.choices(types, weights=weights, k=1)[0]
+def _simulate_outcomes(
+    types: list[AppointmentType],
+    noshow_draw: list[float],
+    confirm_draw: list[float],
+    reduction_draw: list[float],
+    *,
+    noshow_prob: dict[AppointmentType, float],
+    confirmation_rate: float,
+    reduction_rate: float,
+) -> tuple[list[bool], list[bool], list[bool]]:
+    """Turn pre-drawn uniforms into per-appointment outcome flags.
+
+    Pure numeric core: no RNG state, no object construction.  Each column
+    is one comprehension — measurably faster in CPython than a fused loop
+    that appends to three lists.
+    """
+    noshow_base = [d < noshow_prob[t] for t, d in zip(types, noshow_draw, strict=True)]
+    # SMS intervention — only for no-show candidates matters,
+    # but SMS is sent to everyone
+    confirmed = [d < confirmation_rate for d in confirm_draw]
+    # If was going to no-show AND SMS intervention works
+    noshow_after = [
+        b and d >= reduction_rate for b, d in zip(noshow_base, reduction_draw, strict=True)
+    ]
+    return noshow_base, confirmed, noshow_after
 
 
 def generate_cohort(
@@ -167,7 +295,8 @@ def generate_cohort(
 
     Returns
     -------
-    SimulationResult with per-appointment detail and aggregate totals.
+    SimulationResult with aggregate totals; per-appointment detail is
+    built on demand (``appointments`` / ``iter_rows()``).
     """
     rng = random.Random(seed)  # noqa: S311
     tz = ZoneInfo(timezone)
@@ -178,58 +307,56 @@ def generate_cohort(
 
     # ~200 unique patients for 800 appointments (repeat visitors)
     num_patients = max(num_appointments // 4, 50)
-
-    result = SimulationResult()
-    result.total = num_appointments
-
-    for i in range(num_appointments):
-        apt_type = _pick_type(rng)
-        patient_idx = rng.randint(0, num_patients - 1)
-
-        # Spread appointments across ~22 working days, 8:00-19:00
-        day_offset = i * 22 // num_appointments
-        hour = rng.randint(8, 18)
-        minute = rng.choice([0, 15, 30, 45])
-        scheduled = month_start + timedelta(days=day_offset, hours=hour - 8, minutes=minute)
-
-        ticket = _TYPE_TICKET[apt_type]
-        # Add ±15% variance to ticket
-        ticket = round(ticket * rng.uniform(0.85, 1.15), 2)
-
-        # Baseline no-show (type-weighted)
-        noshow_prob = baseline_noshow_rate * _TYPE_NOSHOW_FACTOR[apt_type]
-        is_noshow_base = rng.random() < noshow_prob
-
-        # SMS intervention — only for no-show candidates matters,
-        # but SMS is sent to everyone
-        sms_confirmed = rng.random() < sms_confirmation_rate
-
-        # If was going to no-show AND SMS intervention works
-        is_noshow_after = is_noshow_base
-        if is_noshow_base and rng.random() < sms_reduction_rate:
-            is_noshow_after = False
-
-        apt = SimulatedAppointment(
-            appointment_id=f"APT-SIM-{i + 1:04d}",
-            patient_id=_deterministic_patient_id(patient_idx),
-            appointment_type=apt_type,
-            scheduled_at=scheduled,
-            ticket_value=ticket,
-            is_noshow_baseline=is_noshow_base,
-            sms_sent=True,
-            sms_confirmed=sms_confirmed,
-            is_noshow_after_sms=is_noshow_after,
-        )
-        result.appointments.append(apt)
-
-        if is_noshow_base:
-            result.noshow_baseline += 1
-        if sms_confirmed:
-            result.sms_confirmed += 1
-        if is_noshow_after:
-            result.noshow_after_sms += 1
-
-    result.sms_sent = num_appointments
-    result.noshows_prevented = result.noshow_baseline - result.noshow_after_sms
-
-    return result
+    n = num_appointments
+
+    # Draw each random variable for the whole cohort in one pass
+    # (column-wise); appointments are assembled lazily from the columns.
+    types = rng.choices(_TYPES, cum_weights=_TYPE_CUM_WEIGHTS, k=n)
+    # Uniform integer columns go through choices() too: one call per
+    # column instead of a randrange() call per appointment.
+    patient_idx = rng.choices(range(num_patients), k=n)
+    hours = rng.choices(_HOUR_SLOTS, k=n)
+    minutes = rng.choices(_MINUTE_SLOTS, k=n)
+    # Bound once: the float columns call it n times each.
+    rand = rng.random
+    ticket_factor = [0.85 + 0.30 * rand() for _ in range(n)]
+    noshow_draw = [rand() for _ in range(n)]
+    confirm_draw = [rand() for _ in range(n)]
+    reduction_draw = [rand() for _ in range(n)]
+
+    # Outcomes, column by column
+    tickets = [round(_TYPE_TICKET[t] * f, 2) for t, f in zip(types, ticket_factor, strict=True)]
+    # Per-type no-show probability, hoisted out of the per-appointment pass
+    noshow_prob = {t: baseline_noshow_rate * f for t, f in _TYPE_NOSHOW_FACTOR.items()}
+    noshow_base, confirmed, noshow_after = _simulate_outcomes(
+        types,
+        noshow_draw,
+        confirm_draw,
+        reduction_draw,
+        noshow_prob=noshow_prob,
+        confirmation_rate=sms_confirmation_rate,
+        reduction_rate=sms_reduction_rate,
+    )
+
+    noshow_baseline = sum(noshow_base)
+    noshow_after_sms = sum(noshow_after)
+    return SimulationResult(
+        total=n,
+        noshow_baseline=noshow_baseline,
+        sms_sent=n,
+        sms_confirmed=sum(confirmed),
+        noshow_after_sms=noshow_after_sms,
+        noshows_prevented=noshow_baseline - noshow_after_sms,
+        ticket_total=sum(tickets),
+        columns=_CohortColumns(
+            month_start=month_start,
+            types=types,
+            patient_idx=patient_idx,
+            hours=hours,
+            minutes=minutes,
+            tickets=tickets,
+            noshow_baseline=noshow_base,
+            sms_confirmed=confirmed,
+            noshow_after_sms=noshow_after,
+        ),
+    )
@@ -16,11 +16,14 @@ def build_execution_plan(
     actions: list[dict[str, Any]],
     risk_level: str,
     environment: str = "dev",
+    *,
+    now_iso: str | None = None,
 ) -> dict[str, Any]:
     """Build an execution plan conforming to execution_plan.schema.json.
 
     The plan is the artefact committed to clinic-gitops-config.
     Each action embeds patient_id and appointment_id (schema requires them).
+    ``now_iso`` lets bulk callers stamp a batch of plans with one timestamp.
     """
     plan_actions: list[dict[str, Any]] = []
     for action in actions:
@@ -43,5 +46,5 @@ def build_execution_plan(
         "actions": plan_actions,
         "risk_level": risk_level,
         "hmac_signature": "",  # filled after signing
-        "created_at": datetime.now(UTC).isoformat(),
+        "created_at": now_iso or datetime.now(UTC).isoformat(),
     }
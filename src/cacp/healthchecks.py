@@ -3,61 +3,99 @@
 from __future__ import annotations
 
 import asyncio
-import logging
-from functools import partial
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING
 
 import httpx
+import redis.asyncio
+from psycopg_pool import AsyncConnectionPool
+
+from cacp.logging import get_logger
 
 if TYPE_CHECKING:
-    import psycopg
-    import redis
+    from collections.abc import Awaitable, Callable
 
 __all__ = ["check_postgres", "check_redis", "check_opa"]
 
-logger = logging.getLogger(__name__)
+logger = get_logger(module=__name__)
 
 _TIMEOUT = 2  # seconds — fast-fail for readiness
 
 
-def _sync_check_postgres(dsn: str) -> bool:
-    """Blocking SELECT 1 against PostgreSQL."""
-    import psycopg as _pg  # noqa: F811
+# Probe pools/clients are cached per DSN/URL.  Async connections belong to
+# the event loop that opened them, so an entry is rebuilt if the probe runs
+# on a different loop; the stale one is closed first so its sockets are not
+# leaked.
+_pg_pools: dict[str, tuple[asyncio.AbstractEventLoop, AsyncConnectionPool]] = {}
+_redis_clients: dict[str, tuple[asyncio.AbstractEventLoop, redis.asyncio.Redis]] = {}  # type: ignore[type-arg]
+
 
-    conn: psycopg.Connection[Any] = _pg.connect(dsn, connect_timeout=_TIMEOUT)
+async def _close_stale(dependency: str, aclose: Callable[[], Awaitable[object]]) -> None:
+    """Best-effort close of a probe pool/client opened on an earlier loop."""
     try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT 1")
-    finally:
-        conn.close()
+        await asyncio.wait_for(aclose(), _TIMEOUT)
+    except Exception:
+        logger.debug("stale_probe_close_failed", dependency=dependency, exc_info=True)
+
+
+async def _get_pg_pool(dsn: str) -> AsyncConnectionPool:
+    """Small per-DSN async pool: probes skip connect + auth."""
+    loop = asyncio.get_running_loop()
+    cached = _pg_pools.get(dsn)
+    if cached is not None:
+        if cached[0] is loop:
+            return cached[1]
+        await _close_stale("postgres", cached[1].close)
+    pool = AsyncConnectionPool(
+        dsn,
+        min_size=1,
+        max_size=2,
+        timeout=_TIMEOUT,
+        kwargs={"connect_timeout": _TIMEOUT},
+        open=False,
+    )
+    await pool.open(wait=False)
+    _pg_pools[dsn] = (loop, pool)
+    return pool
+
+
+async def _pool_check_postgres(pool: AsyncConnectionPool) -> bool:
+    """SELECT 1 on a pooled connection — no connect/auth round-trip."""
+    async with pool.connection(timeout=_TIMEOUT) as conn:
+        await conn.execute("SELECT 1")
     return True
 
 
-async def check_postgres(dsn: str) -> bool:
-    """SELECT 1 against PostgreSQL (non-blocking). Returns False on any failure."""
-    if not dsn:
+async def check_postgres(dsn: str, pool: AsyncConnectionPool | None = None) -> bool:
+    """SELECT 1 against PostgreSQL (non-blocking). Returns False on any failure.
+
+    Uses *pool* when the app has one; otherwise a cached per-DSN probe pool.
+    """
+    if pool is None and not dsn:
         return False
     try:
-        return await asyncio.to_thread(partial(_sync_check_postgres, dsn))
+        if pool is None:
+            pool = await _get_pg_pool(dsn)
+        return await _pool_check_postgres(pool)
     except Exception:
-        logger.warning("Postgres health-check failed", exc_info=True)
+        logger.warning("healthcheck_failed", dependency="postgres", exc_info=True)
         return False
 
 
-def _sync_check_redis(url: str) -> bool:
-    """Blocking PING against Redis."""
-    import redis as _redis  # noqa: F811
-
-    client: redis.Redis = _redis.Redis.from_url(  # type: ignore[type-arg]
+async def _get_redis_client(url: str) -> redis.asyncio.Redis:  # type: ignore[type-arg]
+    """Per-URL asyncio client; its pool keeps the socket open between probes."""
+    loop = asyncio.get_running_loop()
+    cached = _redis_clients.get(url)
+    if cached is not None:
+        if cached[0] is loop:
+            return cached[1]
+        await _close_stale("redis", cached[1].aclose)
+    client: redis.asyncio.Redis = redis.asyncio.Redis.from_url(  # type: ignore[type-arg]
         url,
         socket_timeout=_TIMEOUT,
         socket_connect_timeout=_TIMEOUT,
     )
-    try:
-        client.ping()
-    finally:
-        client.close()
-    return True
+    _redis_clients[url] = (loop, client)
+    return client
 
 
 async def check_redis(url: str) -> bool:
@@ -65,23 +103,53 @@ async def check_redis(url: str) -> bool:
     if not url:
         return False
     try:
-        return await asyncio.to_thread(partial(_sync_check_redis, url))
+        client = await _get_redis_client(url)
+        await client.ping()
+        return True  # noqa: TRY300
     except Exception:
-        logger.warning("Redis health-check failed", exc_info=True)
+        logger.warning("healthcheck_failed", dependency="redis", exc_info=True)
         return False
 
 
-async def check_opa(url: str) -> bool:
-    """POST a minimal query to OPA. Returns False on any failure."""
+_opa_probe_client: tuple[asyncio.AbstractEventLoop, httpx.AsyncClient] | None = None
+
+
+async def _get_opa_probe_client() -> httpx.AsyncClient:
+    """Module-level keep-alive client for OPA probes made outside the app.
+
+    httpx connections belong to the event loop that opened them, so the
+    client is closed and rebuilt if the probe runs on a different loop.
+    """
+    global _opa_probe_client
+    loop = asyncio.get_running_loop()
+    if _opa_probe_client is None or _opa_probe_client[0] is not loop:
+        if _opa_probe_client is not None:
+            await _close_stale("opa", _opa_probe_client[1].aclose)
+        client = httpx.AsyncClient(
+            timeout=_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+        _opa_probe_client = (loop, client)
+    return _opa_probe_client[1]
+
+
+async def check_opa(url: str, client: httpx.AsyncClient | None = None) -> bool:
+    """POST a minimal query to OPA. Returns False on any failure.
+
+    Pass the app's shared *client* to reuse its keep-alive connections;
+    without one a module-level probe client is used.
+    """
     if not url:
         return False
+    if client is None:
+        client = await _get_opa_probe_client()
     try:
-        async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-            resp = await client.post(
-                f"{url}/v1/data/health",
-                json={"input": {}},
-            )
-            return resp.status_code == 200  # noqa: TRY300
+        resp = await client.post(
+            f"{url}/v1/data/health",
+            json={"input": {}},
+            timeout=_TIMEOUT,
+        )
+        return resp.status_code == 200  # noqa: TRY300
     except Exception:
-        logger.warning("OPA health-check failed", exc_info=True)
+        logger.warning("healthcheck_failed", dependency="opa", exc_info=True)
         return False
@@ -0,0 +1,34 @@
+"""Fast UUID-shaped identifiers for the request and orchestration paths."""
+
+from __future__ import annotations
+
+import os
+import random
+
+__all__ = ["new_id"]
+
+# Version 4 / RFC 4122 variant bits, applied to a raw 128-bit draw.
+_CLEAR_BITS = ~((0xF000 << 64) | (0xC000 << 48))
+_SET_BITS = (0x4000 << 64) | (0x8000 << 48)
+
+_rng = random.Random(os.urandom(32))
+
+
+def _reseed() -> None:
+    # A forked worker would otherwise replay the parent's ID sequence.
+    _rng.seed(os.urandom(32))
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed)
+
+
+def new_id() -> str:
+    """Return a random UUIDv4-formatted string.
+
+    Drawn from a per-process PRNG seeded from the OS, so there is no
+    ``getrandom`` syscall or ``uuid.UUID`` object per call. Unique, but not
+    suitable as a secret — use :mod:`secrets` for tokens.
+    """
+    h = f"{_rng.getrandbits(128) & _CLEAR_BITS | _SET_BITS:032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
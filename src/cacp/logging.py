@@ -2,13 +2,24 @@
 
 from __future__ import annotations
 
+import atexit
+import contextlib
 import logging as stdlib_logging
-import uuid
+import os
+import queue
+import sys
+import threading
 from contextvars import ContextVar
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+import orjson
 import structlog
 
+from cacp.ids import new_id
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 __all__ = [
     "configure_logging",
     "get_logger",
@@ -22,7 +33,7 @@ correlation_id_var: ContextVar[str] = ContextVar("correlation_id", default="")
 
 def new_correlation_id() -> str:
     """Generate and set a new correlation ID for the current context."""
-    cid = str(uuid.uuid4())
+    cid = new_id()
     correlation_id_var.set(cid)
     return cid
 
@@ -37,9 +48,162 @@ def _add_correlation_id(
     return event_dict
 
 
+def _write_stdout(data: bytes) -> None:
+    """Write *data* to the current ``sys.stdout``, looked up per call.
+
+    Resolving it at write time keeps redirection working (pytest capture,
+    test harnesses, ``contextlib.redirect_stdout``).
+    """
+    out = sys.stdout
+    if out is None:
+        return
+    buffer = getattr(out, "buffer", None)
+    if buffer is not None:
+        buffer.write(data)
+        buffer.flush()
+    else:
+        out.write(data.decode("utf-8", "replace"))
+        out.flush()
+
+
+class _AsyncWriter:
+    """Write log lines to stdout from a background thread.
+
+    Callers only enqueue the rendered line; a daemon thread drains whatever
+    has accumulated and writes it with one call per batch, so no request
+    coroutine blocks on stdout. The queue is bounded: once *max_queued*
+    lines are waiting, callers write inline instead, so a slow stdout
+    applies back-pressure rather than growing memory.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[bytes], Any] = _write_stdout,
+        batch_size: int = 256,
+        max_queued: int = 10_000,
+    ) -> None:
+        self._sink = write
+        self._batch_size = batch_size
+        self._max_queued = max_queued
+        self._queue: queue.Queue[bytes | None] = queue.Queue(max_queued)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        # Lines still queued when close() gave up waiting on the thread.
+        self.dropped = 0
+
+    def write(self, line: bytes) -> None:
+        if self._closed:
+            # Interpreter shutdown: no new threads, write inline.
+            self._sink(line)
+            return
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self._sink(line)
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Flush queued lines and stop the writer thread.
+
+        Lines the thread could not write within *timeout* are counted in
+        :attr:`dropped` and reported on stderr.
+        """
+        with self._lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            with contextlib.suppress(queue.Full):
+                self._queue.put(None, timeout=timeout)
+            thread.join(timeout)
+            if thread.is_alive():
+                self._report_dropped()
+                return
+        # Lines enqueued while close() ran: the thread is gone, write them here.
+        leftover = self._take_queued()
+        if leftover:
+            self._sink(b"".join(leftover))
+
+    def _take_queued(self) -> list[bytes]:
+        lines: list[bytes] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return lines
+            if item is not None:
+                lines.append(item)
+
+    def _report_dropped(self) -> None:
+        self.dropped += len(self._take_queued())
+        if self.dropped and sys.stderr is not None:
+            sys.stderr.write(f"cacp.logging: dropped {self.dropped} log lines at shutdown\n")
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None and not self._closed:
+                thread = threading.Thread(target=self._run, name="cacp-log-writer", daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def _run(self) -> None:
+        get = self._queue.get
+        get_nowait = self._queue.get_nowait
+        while True:
+            item = get()
+            batch: list[bytes] = []
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= self._batch_size:
+                    break
+                try:
+                    item = get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._sink(b"".join(batch))
+            if item is None:
+                return
+
+    def _reset_after_fork(self) -> None:
+        # The parent's thread does not exist in a forked child.
+        self._queue = queue.Queue(self._max_queued)
+        self._lock = threading.Lock()
+        self._thread = None
+
+
+class _QueuedLogger:
+    """structlog logger that hands rendered lines to an ``_AsyncWriter``."""
+
+    def __init__(self, writer: _AsyncWriter) -> None:
+        self._write = writer.write
+
+    def msg(self, message: str | bytes) -> None:
+        if isinstance(message, str):
+            message = message.encode("utf-8")
+        self._write(message + b"\n")
+
+    log = debug = info = warn = warning = msg
+    error = critical = exception = fatal = failure = msg
+
+
+_writer = _AsyncWriter()
+atexit.register(_writer.close)
+if hasattr(os, "register_at_fork"):  # POSIX only
+    os.register_at_fork(after_in_child=_writer._reset_after_fork)
+
+
+def _queued_logger_factory(*args: Any) -> _QueuedLogger:
+    return _QueuedLogger(_writer)
+
+
 def configure_logging(*, json_output: bool = True, level: str = "INFO") -> None:
     """Configure structlog for the application.
 
+    Rendered lines go to stdout through a background writer thread
+    (flushed at interpreter exit).
+
     Args:
         json_output: True for JSON (production), False for console (dev).
         level: Log level string.
@@ -49,11 +213,16 @@ def configure_logging(*, json_output: bool = True, level: str = "INFO") -> None:
         _add_correlation_id,
         structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
     ]
+    if level.upper() == "DEBUG":
+        # Walks the stack on every event; only worth it when debugging.
+        processors.append(structlog.processors.StackInfoRenderer())
 
     if json_output:
-        processors.append(structlog.processors.JSONRenderer())
+        # exc_info=True → a "exception" string field instead of a bare flag.
+        processors.append(structlog.processors.format_exc_info)
+        # orjson renders straight to bytes, which the queued logger writes as is.
+        processors.append(structlog.processors.JSONRenderer(serializer=orjson.dumps))
     else:
         processors.append(structlog.dev.ConsoleRenderer())
 
@@ -63,7 +232,7 @@ def configure_logging(*, json_output: bool = True, level: str = "INFO") -> None:
             stdlib_logging.getLevelNamesMapping().get(level.upper(), stdlib_logging.INFO)
         ),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=_queued_logger_factory,
         cache_logger_on_first_use=True,
     )
 
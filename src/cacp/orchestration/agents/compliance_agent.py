@@ -2,19 +2,23 @@
 
 from __future__ import annotations
 
-import logging
+import asyncio
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from cacp.policy.input_builder import build_opa_input
-from cacp.policy.opa_client import OPAClient, OPAError
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+from cacp.logging import get_logger
+from cacp.policy.input_builder import build_opa_batch_input, build_opa_input
+from cacp.policy.opa_client import OPABatchUnsupportedError, OPAClient, OPAError, OPAResult
 
 __all__ = ["ComplianceAgent", "ComplianceResult"]
 
-logger = logging.getLogger(__name__)
+logger = get_logger(module=__name__)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ComplianceResult:
     compliant: bool
     violations: list[str]
@@ -25,6 +29,9 @@ class ComplianceAgent:
 
     def __init__(self, opa_client: OPAClient | None = None) -> None:
         self._opa = opa_client
+        # Cleared the first time the policy bundle turns out to lack the
+        # batch rule; per-action queries are used from then on.
+        self._opa_batch = True
 
     async def validate(
         self,
@@ -52,30 +59,74 @@ class ComplianceAgent:
                 f"Action count ({len(actions)}) exceeds daily limit ({max_messages})"
             )
 
-        # OPA policy evaluation per action
+        # OPA policy evaluation — one batch query for the whole proposal
         if self._opa:
-            clinic_id = clinic_profile.get("clinic_id", "")
-            for action in actions:
-                opa_input = build_opa_input(
-                    action=action.get("action_type", ""),
-                    role=role,
-                    mode=mode,
-                    patient_id=action.get("patient_id", ""),
-                    clinic_id=clinic_id,
-                    extra={"channel": action.get("channel", "")},
+            if actions:
+                clinic_id = clinic_profile.get("clinic_id", "")
+                violations.extend(
+                    await self._opa_violations(self._opa, actions, role, mode, clinic_id)
                 )
-                try:
-                    result = await self._opa.evaluate(opa_input)
-                    if result.decision != "ALLOW":
-                        violations.extend(result.violations or ["OPA_Deny"])
-                except OPAError as exc:
-                    # Fail-closed: if OPA unreachable, deny the proposal
-                    logger.error("OPA evaluation failed (fail-closed): %s", exc)
-                    violations.append("OPA_Unavailable")
         else:
-            logger.warning("OPA client not configured — skipping policy evaluation")
+            logger.warning("opa_not_configured", detail="skipping policy evaluation")
 
         return ComplianceResult(
             compliant=len(violations) == 0,
             violations=violations,
         )
+
+    async def _opa_violations(
+        self,
+        opa: OPAClient,
+        actions: list[dict[str, Any]],
+        role: str,
+        mode: str,
+        clinic_id: str,
+    ) -> list[str]:
+        """Evaluate *actions* against OPA; returns violations in action order."""
+        if self._opa_batch:
+            try:
+                results = await opa.evaluate_batch(
+                    build_opa_batch_input(actions, role=role, mode=mode, clinic_id=clinic_id)
+                )
+            except OPABatchUnsupportedError:
+                logger.info("opa_batch_unsupported", detail="evaluating actions one by one")
+                self._opa_batch = False
+            except OPAError as exc:
+                # Fail-closed: if OPA unreachable, deny the proposal
+                logger.error("opa_evaluation_failed", error=str(exc), fail_closed=True)
+                return ["OPA_Unavailable"] * len(actions)
+            else:
+                return _collect_violations(results)
+
+        # Fallback: one query per action, issued concurrently.
+        per_action = await asyncio.gather(
+            *(
+                opa.evaluate(
+                    build_opa_input(
+                        action=action.get("action_type", ""),
+                        role=role,
+                        mode=mode,
+                        patient_id=action.get("patient_id", ""),
+                        clinic_id=clinic_id,
+                        extra={"channel": action.get("channel", "")},
+                    )
+                )
+                for action in actions
+            ),
+            return_exceptions=True,
+        )
+        return _collect_violations(per_action)
+
+
+def _collect_violations(results: Sequence[OPAResult | BaseException]) -> list[str]:
+    violations: list[str] = []
+    for result in results:
+        if isinstance(result, OPAError):
+            # Fail-closed: if OPA unreachable, deny the proposal
+            logger.error("opa_evaluation_failed", error=str(result), fail_closed=True)
+            violations.append("OPA_Unavailable")
+        elif isinstance(result, BaseException):
+            raise result
+        elif result.decision != "ALLOW":
+            violations.extend(result.violations or ["OPA_Deny"])
+    return violations
@@ -7,12 +7,34 @@ based on the risk score and clinic profile configuration.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from datetime import datetime
 
 __all__ = ["RevenueAgent", "ActionSequence"]
 
+# (action_type, template, hours_before) per step, and the expected lift.
+_Steps = tuple[tuple[str, str, int], ...]
+
+_REMINDER_24H = ("send_reminder", "confirm_reminder_v2", 24)
+_REMINDER_48H = ("send_reminder", "confirm_reminder_v2", 48)
+_CONFIRMATION_24H = ("send_confirmation", "urgency_short", 24)
+_RESCHEDULE_2H = ("reschedule", "reschedule_offer", 2)
+
+_HIGH_SEQUENCE: tuple[_Steps, float] = (
+    (_REMINDER_48H, _CONFIRMATION_24H, _RESCHEDULE_2H),
+    0.25,
+)
+_SEQUENCES: dict[str, tuple[_Steps, float]] = {
+    "low": ((_REMINDER_24H,), 0.05),
+    "medium": ((_REMINDER_48H, _CONFIRMATION_24H), 0.15),
+    "high": _HIGH_SEQUENCE,
+}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class ActionSequence:
     actions: list[dict[str, Any]]
     expected_lift: float  # estimated probability improvement
@@ -27,66 +49,42 @@ class RevenueAgent:
         risk_score: float,
         appointment: dict[str, Any],
         clinic_profile: dict[str, Any],
+        appt_dt: datetime | None = None,
     ) -> ActionSequence:
         """Generate a sequence of messaging actions based on risk level.
 
         Low risk:    1 reminder (24h before)
         Medium risk: 2 reminders (48h + 24h) + confirmation request
         High risk:   2 reminders + confirmation + reschedule offer (if no reply)
+
+        With *appt_dt*, each action carries its absolute ``scheduled_at``;
+        without it, the relative ``hours_before``.
         """
         preferred_channel = clinic_profile.get("messaging", {}).get(
             "preferred_channel", "whatsapp"
         )
 
-        if risk_level == "low":
-            actions = [
+        steps, expected_lift = _SEQUENCES.get(risk_level, _HIGH_SEQUENCE)
+        # Fresh dicts per call: ActionSequence hands out mutable dicts.
+        if appt_dt is None:
+            actions: list[dict[str, Any]] = [
                 {
-                    "action_type": "send_reminder",
+                    "action_type": action_type,
                     "channel": preferred_channel,
-                    "template": "confirm_reminder_v2",
-                    "hours_before": 24,
+                    "template": template,
+                    "hours_before": hours_before,
                 }
+                for action_type, template, hours_before in steps
             ]
-            expected_lift = 0.05
-
-        elif risk_level == "medium":
+        else:
             actions = [
                 {
-                    "action_type": "send_reminder",
+                    "action_type": action_type,
                     "channel": preferred_channel,
-                    "template": "confirm_reminder_v2",
-                    "hours_before": 48,
-                },
-                {
-                    "action_type": "send_confirmation",
-                    "channel": preferred_channel,
-                    "template": "urgency_short",
-                    "hours_before": 24,
-                },
-            ]
-            expected_lift = 0.15
-
-        else:  # high
-            actions = [
-                {
-                    "action_type": "send_reminder",
-                    "channel": preferred_channel,
-                    "template": "confirm_reminder_v2",
-                    "hours_before": 48,
-                },
-                {
-                    "action_type": "send_confirmation",
-                    "channel": preferred_channel,
-                    "template": "urgency_short",
-                    "hours_before": 24,
-                },
-                {
-                    "action_type": "reschedule",
-                    "channel": preferred_channel,
-                    "template": "reschedule_offer",
-                    "hours_before": 2,
-                },
+                    "template": template,
+                    "scheduled_at": (appt_dt - timedelta(hours=hours_before)).isoformat(),
+                }
+                for action_type, template, hours_before in steps
             ]
-            expected_lift = 0.25
 
         return ActionSequence(actions=actions, expected_lift=expected_lift)
@@ -2,18 +2,21 @@
 
 from __future__ import annotations
 
-import logging
-import uuid
+import asyncio
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from cacp.gitops.github_pr import GitHubPRCreator
     from cacp.settings import Settings
-    from cacp.storage.event_store import EventStoreProtocol
+    from cacp.storage.event_store import EventRecord, EventStoreProtocol
 
 from cacp.gitops.manifest import build_execution_plan
+from cacp.ids import new_id
+from cacp.logging import get_logger
 from cacp.orchestration.agents.compliance_agent import ComplianceAgent
 from cacp.orchestration.agents.revenue_agent import RevenueAgent
 from cacp.scoring.risk_scorer import RiskScorer
@@ -21,10 +24,16 @@ from cacp.signing.hmac import sign_payload
 
 __all__ = ["Orchestrator", "OrchestratorResult"]
 
-logger = logging.getLogger(__name__)
+logger = get_logger(module=__name__)
+
+# Pending event appends before _emit starts waiting on the writer.
+_EVENT_QUEUE_SIZE = 1000
 
+# Max events the writer hands to the store per thread hop.
+_EVENT_BATCH = 100
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class OrchestratorResult:
     proposal_id: str
     risk_level: str
@@ -51,9 +60,50 @@ class Orchestrator:
         self._compliance = ComplianceAgent()
         self._github_pr = github_pr
         self._events = event_store
+        # Stores with a batch insert (append_many: the Postgres store) do
+        # real I/O, so a writer task drains their events off the request
+        # path in order, through a bounded queue for back-pressure. Stores
+        # without one are in-process and appended inline.
+        self._append_many: Callable[[list[EventRecord]], Any] | None = getattr(
+            event_store, "append_many", None
+        )
+        self._event_queue: asyncio.Queue[EventRecord] | None = None
+        self._event_loop: asyncio.AbstractEventLoop | None = None
+        self._event_writer: asyncio.Task[None] | None = None
 
-    def _emit(self, aggregate_id: str, event_type: str, payload: dict[str, Any]) -> None:
-        """Fire-and-forget event append (swallows errors in prod)."""
+    async def _emit(self, aggregate_id: str, event_type: str, payload: dict[str, Any]) -> None:
+        """Append an event, or queue it for the writer task.
+
+        Returns immediately unless the queue is full.  Append errors are
+        logged, never raised to the pipeline.
+        """
+        if self._events is None:
+            return
+        if self._append_many is None:
+            self._append(aggregate_id, event_type, payload)
+            return
+        loop = asyncio.get_running_loop()
+        if self._event_queue is None or self._event_loop is not loop:
+            self._event_queue = asyncio.Queue(maxsize=_EVENT_QUEUE_SIZE)
+            self._event_loop = loop
+            self._event_writer = None
+        await self._event_queue.put((aggregate_id, event_type, payload, "system", None))
+        # The writer exits once the queue is empty; restart it on demand.
+        if self._event_writer is None or self._event_writer.done():
+            self._event_writer = loop.create_task(self._write_events(self._event_queue))
+
+    async def _write_events(self, queue: asyncio.Queue[EventRecord]) -> None:
+        """Drain *queue* in batches, one thread hop per batch, then exit."""
+        while not queue.empty():
+            batch = [queue.get_nowait() for _ in range(min(queue.qsize(), _EVENT_BATCH))]
+            try:
+                await asyncio.to_thread(self._append_batch, batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _append(self, aggregate_id: str, event_type: str, payload: dict[str, Any]) -> None:
+        """Event append that swallows errors (logged)."""
         if self._events is None:
             return
         try:
@@ -63,7 +113,28 @@ class Orchestrator:
                 payload=payload,
             )
         except Exception:
-            logger.warning("Event store append failed for %s", event_type, exc_info=True)
+            logger.warning("event_append_failed", event_type=event_type, exc_info=True)
+
+    def _append_batch(self, records: list[EventRecord]) -> None:
+        """Batch append that swallows errors (logged)."""
+        if self._append_many is None:
+            return
+        try:
+            self._append_many(records)
+        except Exception:
+            logger.warning("event_append_failed", events=len(records), exc_info=True)
+
+    async def flush_events(self) -> None:
+        """Wait until every queued event has been appended."""
+        if self._event_queue is not None and self._event_loop is asyncio.get_running_loop():
+            await self._event_queue.join()
+
+    async def aclose(self) -> None:
+        """Flush queued events and let the writer task finish."""
+        await self.flush_events()
+        writer, self._event_writer = self._event_writer, None
+        if writer is not None and writer.get_loop() is asyncio.get_running_loop():
+            await writer
 
     async def process_appointment(
         self,
@@ -79,21 +150,20 @@ class Orchestrator:
         5. Sign with HMAC
         6. Open PR in clinic-gitops-config
         """
-        proposal_id = str(uuid.uuid4())
+        proposal_id = new_id()
         appt_id = appointment.get("appointment_id", proposal_id)
 
         # ── Event: appointment_received ────────────────────────────
-        self._emit(appt_id, "appointment_received", appointment)
+        await self._emit(appt_id, "appointment_received", appointment)
+
+        # scheduled_at is parsed once here and shared by scoring and
+        # action scheduling.
+        appt_dt = _parse_scheduled_at(appointment.get("scheduled_at", ""))
 
         # 1 ── Risk scoring ─────────────────────────────────────────
-        risk = self._scorer.score(appointment)
-        logger.info(
-            "Risk scored: %s (%.4f) for %s",
-            risk.level,
-            risk.score,
-            appt_id,
-        )
-        self._emit(appt_id, "risk_scored", {"score": risk.score, "level": risk.level})
+        risk = self._scorer.score(appointment, scheduled=appt_dt)
+        logger.info("risk_scored", level=risk.level, score=risk.score, appt_id=appt_id)
+        await self._emit(appt_id, "risk_scored", {"score": risk.score, "level": risk.level})
 
         # 2 ── Action sequence ──────────────────────────────────────
         clinic_profile = {
@@ -102,16 +172,16 @@ class Orchestrator:
                 "max_messages_per_patient_per_day": 3,
             },
         }
+        # Actions come back with absolute scheduled_at; without a parseable
+        # appointment time they are anchored to now + 1 day.
         sequence = self._revenue.generate_sequence(
             risk_level=risk.level,
             risk_score=risk.score,
             appointment=appointment,
             clinic_profile=clinic_profile,
+            appt_dt=appt_dt if appt_dt is not None else datetime.now(UTC) + timedelta(days=1),
         )
-
-        # Resolve hours_before → absolute scheduled_at
-        scheduled_at = appointment.get("scheduled_at", "")
-        resolved_actions = _resolve_scheduled_times(sequence.actions, scheduled_at)
+        resolved_actions = sequence.actions
 
         # 3 ── Compliance check ─────────────────────────────────────
         compliance = await self._compliance.validate(
@@ -122,9 +192,9 @@ class Orchestrator:
         )
         if not compliance.compliant:
             logger.warning(
-                "Compliance rejected proposal %s: %s",
-                proposal_id,
-                compliance.violations,
+                "compliance_rejected",
+                proposal_id=proposal_id,
+                violations=compliance.violations,
             )
             return OrchestratorResult(
                 proposal_id=proposal_id,
@@ -149,7 +219,7 @@ class Orchestrator:
         )
 
         # ── Event: proposal_created ─────────────────────────────
-        self._emit(
+        await self._emit(
             appt_id,
             "proposal_created",
             {"proposal_id": proposal_id, "actions": len(resolved_actions)},
@@ -157,12 +227,12 @@ class Orchestrator:
 
         # 5 ── HMAC sign ───────────────────────────────────────────
         if not self._settings.hmac_secret:
-            logger.warning("HMAC_SECRET not set — plan will be unsigned")
+            logger.warning("hmac_secret_missing", detail="plan will be unsigned")
             signature = ""
         else:
             signature = sign_payload(plan, self._settings.hmac_secret)
         plan["hmac_signature"] = signature
-        self._emit(
+        await self._emit(
             appt_id,
             "proposal_signed",
             {"proposal_id": proposal_id, "signed": bool(signature)},
@@ -178,12 +248,14 @@ class Orchestrator:
                     branch_name=f"proposal/{proposal_id[:8]}",
                 )
                 pr_url = pr_result.pr_url
-                logger.info("PR created: %s", pr_url)
-                self._emit(appt_id, "pr_opened", {"proposal_id": proposal_id, "pr_url": pr_url})
+                logger.info("pr_created", pr_url=pr_url, proposal_id=proposal_id)
+                await self._emit(
+                    appt_id, "pr_opened", {"proposal_id": proposal_id, "pr_url": pr_url}
+                )
             except Exception:
-                logger.exception("Failed to create PR for proposal %s", proposal_id)
+                logger.exception("pr_create_failed", proposal_id=proposal_id)
         else:
-            logger.info("GitHub PR creation skipped (no token configured)")
+            logger.info("pr_skipped", reason="no GitHub token configured")
 
         return OrchestratorResult(
             proposal_id=proposal_id,
@@ -197,22 +269,8 @@ class Orchestrator:
         )
 
 
-def _resolve_scheduled_times(
-    actions: list[dict[str, Any]],
-    appointment_iso: str,
-) -> list[dict[str, Any]]:
-    """Convert hours_before to absolute scheduled_at."""
+def _parse_scheduled_at(appointment_iso: Any) -> datetime | None:
     try:
-        appt_dt = datetime.fromisoformat(appointment_iso)
+        return datetime.fromisoformat(appointment_iso)
     except (ValueError, TypeError):
-        appt_dt = datetime.now(UTC) + timedelta(days=1)
-
-    resolved: list[dict[str, Any]] = []
-    for action in actions:
-        a = dict(action)  # shallow copy
-        hours = a.pop("hours_before", None)
-        if hours is not None and "scheduled_at" not in a:
-            scheduled = appt_dt - timedelta(hours=int(hours))
-            a["scheduled_at"] = scheduled.isoformat()
-        resolved.append(a)
-    return resolved
+        return None
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Any
 
-__all__ = ["build_opa_input"]
+__all__ = ["build_opa_batch_input", "build_opa_input"]
 
 
 def build_opa_input(
@@ -26,3 +26,29 @@ def build_opa_input(
     if extra:
         input_doc.update(extra)
     return input_doc
+
+
+def build_opa_batch_input(
+    actions: list[dict[str, Any]],
+    role: str,
+    mode: str,
+    clinic_id: str,
+) -> dict[str, Any]:
+    """Construct one OPA input document covering every action of a proposal.
+
+    Shared context sits at the top level; ``actions`` carries the per-action
+    fields of ``build_opa_input`` in proposal order.
+    """
+    return {
+        "role": role,
+        "mode": mode,
+        "clinic_id": clinic_id,
+        "actions": [
+            {
+                "action": action.get("action_type", ""),
+                "patient_id": action.get("patient_id", ""),
+                "channel": action.get("channel", ""),
+            }
+            for action in actions
+        ],
+    }
@@ -7,25 +7,40 @@ from typing import Any
 
 import httpx
 
-__all__ = ["OPAClient", "OPAResult", "OPAError"]
+__all__ = ["OPAClient", "OPAResult", "OPAError", "OPABatchUnsupportedError"]
 
 
 class OPAError(Exception):
     """Raised when OPA is unreachable or returns an unexpected response."""
 
 
-@dataclass(frozen=True)
+class OPABatchUnsupportedError(OPAError):
+    """The loaded policy bundle does not define the batch rule."""
+
+
+@dataclass(frozen=True, slots=True)
 class OPAResult:
     decision: str  # "ALLOW" | "DENY"
     violations: list[str]
 
 
 class OPAClient:
-    """HTTP client for Open Policy Agent evaluation."""
+    """HTTP client for Open Policy Agent evaluation.
 
-    def __init__(self, base_url: str = "http://localhost:8181") -> None:
+    Pass *client* to share an existing ``httpx.AsyncClient`` (e.g. the
+    app's keep-alive pool); it is then left open by ``close()``.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8181",
+        client: httpx.AsyncClient | None = None,
+    ) -> None:
         self._base_url = base_url
-        self._client = httpx.AsyncClient(base_url=base_url, timeout=5.0)
+        self._policy_url = f"{base_url}/v1/data/clinic/policy"
+        self._batch_url = f"{base_url}/v1/data/clinic/policy/batch"
+        self._owns_client = client is None
+        self._client = client if client is not None else httpx.AsyncClient(timeout=5.0)
 
     async def evaluate(self, input_data: dict[str, Any]) -> OPAResult:
         """Evaluate input against OPA policies.
@@ -34,7 +49,7 @@ class OPAClient:
         """
         try:
             resp = await self._client.post(
-                "/v1/data/clinic/policy",
+                self._policy_url,
                 json={"input": input_data},
             )
             resp.raise_for_status()
@@ -47,5 +62,36 @@ class OPAClient:
             violations=result.get("violations", []),
         )
 
+    async def evaluate_batch(self, batch_input: dict[str, Any]) -> list[OPAResult]:
+        """Evaluate every action of a batch input in one OPA query.
+
+        Expects ``clinic.policy.batch`` to return one decision object per
+        ``input.actions`` entry, in order.  Raises OPABatchUnsupportedError when
+        the rule is undefined and OPAError on any other failure.
+        """
+        try:
+            resp = await self._client.post(
+                self._batch_url,
+                json={"input": batch_input},
+            )
+            resp.raise_for_status()
+        except httpx.HTTPError as e:
+            raise OPAError(f"OPA unreachable: {e}") from e
+
+        body = resp.json()
+        if "result" not in body:
+            raise OPABatchUnsupportedError("clinic.policy.batch is undefined")
+        results = body["result"]
+        if not isinstance(results, list) or len(results) != len(batch_input["actions"]):
+            raise OPAError("OPA batch result does not match the input actions")
+        return [
+            OPAResult(
+                decision=result.get("decision", "DENY"),
+                violations=result.get("violations", []),
+            )
+            for result in results
+        ]
+
     async def close(self) -> None:
-        await self._client.aclose()
+        if self._owns_client:
+            await self._client.aclose()
@@ -8,5 +8,10 @@ __all__ = ["get_redis_client"]
 
 
 def get_redis_client(url: str = "redis://localhost:6379/0") -> redis.Redis:  # type: ignore[type-arg]
-    """Create a Redis client."""
+    """Create a Redis client.
+
+    *url* may be ``redis://``, ``rediss://`` or, for a Redis on the same
+    host, ``unix:///path/to/redis.sock?db=0``, which avoids the TCP
+    loopback path.
+    """
     return redis.Redis.from_url(url, decode_responses=True)
@@ -12,13 +12,16 @@ Thresholds:
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any
+from datetime import datetime, tzinfo
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
 __all__ = ["RiskScorer", "RiskResult"]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RiskResult:
     """Immutable result of a risk assessment."""
 
@@ -36,6 +39,26 @@ W_DAY_OF_WEEK = 0.10
 W_CONTACT = 0.10
 
 
+# ── Factor lookup tables ─────────────────────────────────────────────
+# No-show history by previous count; anything else (3+) → 1.0.
+_HISTORY: dict[int, float] = {0: 0.0, 1: 0.5, 2: 0.75}
+# By hour: early morning / late afternoon 0.6, 9-11 0.2, midday 0.1.
+_TIME_OF_DAY: tuple[float, ...] = tuple(
+    0.6 if h < 9 or h >= 17 else 0.2 if h < 11 else 0.1 for h in range(24)
+)
+# By weekday (Monday=0): Monday/Friday 0.6, weekend 0.4, midweek 0.1.
+_DAY_OF_WEEK: tuple[float, ...] = (0.6, 0.1, 0.1, 0.1, 0.6, 0.4, 0.4)
+# Indexed [has_phone][has_whatsapp].
+_CONTACT: tuple[tuple[float, float], tuple[float, float]] = ((0.8, 0.3), (0.3, 0.0))
+
+
+def _parse_iso(iso: Any) -> datetime | None:
+    try:
+        return datetime.fromisoformat(iso)
+    except (ValueError, TypeError):
+        return None
+
+
 def _clamp(value: float) -> float:
     return max(0.0, min(1.0, value))
 
@@ -60,109 +83,100 @@ class RiskScorer:
         6. Contact available  — unreachable patients are riskier (0.10)
     """
 
-    def score(self, appointment: dict[str, Any]) -> RiskResult:
+    def score(
+        self, appointment: dict[str, Any], *, scheduled: datetime | None = None
+    ) -> RiskResult:
         """Score an appointment for no-show risk.
 
         All input fields are optional; sensible fallbacks are used when absent.
+        Pass *scheduled* when the caller has already parsed ``scheduled_at``.
         """
-        factors: dict[str, float] = {}
+        return self._score(appointment, {}, scheduled)
+
+    def score_batch(self, appointments: Iterable[dict[str, Any]]) -> list[RiskResult]:
+        """Score many appointments (backfills, batch imports).
 
+        Same result as ``score`` per item, except the clock is read once per
+        timezone for the whole batch, so lead times share one "now".
+        """
+        nows: dict[tzinfo | None, datetime] = {}
+        return [self._score(appointment, nows) for appointment in appointments]
+
+    def _score(
+        self,
+        appointment: dict[str, Any],
+        nows: dict[tzinfo | None, datetime],
+        scheduled: datetime | None = None,
+    ) -> RiskResult:
         # 1 ── No-show history (0→0, 1→0.5, 2→0.75, 3+→1.0) ─────
-        prev = appointment.get("previous_no_shows", 0)
-        if prev == 0:
-            h = 0.0
-        elif prev == 1:
-            h = 0.5
-        elif prev == 2:
-            h = 0.75
-        else:
-            h = 1.0
-        factors["no_show_history"] = h
+        history = _HISTORY.get(appointment.get("previous_no_shows", 0), 1.0)
 
         # 2 ── First visit ────────────────────────────────────────
-        factors["first_visit"] = 0.6 if appointment.get("is_first_visit", False) else 0.0
+        first_visit = 0.6 if appointment.get("is_first_visit", False) else 0.0
+
+        # scheduled_at is parsed (at most) once and shared by factors 3-5.
+        if scheduled is None:
+            scheduled = _parse_iso(appointment.get("scheduled_at", ""))
 
         # 3 ── Lead time (days until appointment) ─────────────────
-        factors["lead_time"] = self._lead_time_signal(appointment.get("scheduled_at", ""))
-
-        # 4 ── Time of day ────────────────────────────────────────
-        hour = self._extract_hour(appointment.get("scheduled_at", ""))
-        if hour is not None:
-            if hour < 9 or hour >= 17:
-                tod = 0.6
-            elif hour < 11:
-                tod = 0.2
-            else:
-                tod = 0.1
-        else:
-            tod = 0.3
-        factors["time_of_day"] = tod
-
-        # 5 ── Day of week ────────────────────────────────────────
-        dow = self._extract_dow(appointment.get("scheduled_at", ""))
-        if dow is not None:
-            if dow in (0, 4):  # Monday, Friday
-                d = 0.6
-            elif dow in (5, 6):  # Weekend
-                d = 0.4
-            else:
-                d = 0.1
+        lead_time = self._lead_time_signal(scheduled, nows)
+
+        # 4 ── Time of day / 5 ── Day of week ─────────────────────
+        if scheduled is not None:
+            tod = _TIME_OF_DAY[scheduled.hour]
+            dow = _DAY_OF_WEEK[scheduled.weekday()]
         else:
-            d = 0.3
-        factors["day_of_week"] = d
+            tod = dow = 0.3
 
         # 6 ── Contact availability ───────────────────────────────
-        has_phone = bool(appointment.get("patient_phone", ""))
-        has_wa = bool(appointment.get("patient_whatsapp", False))
-        if has_phone and has_wa:
-            c = 0.0
-        elif has_phone or has_wa:
-            c = 0.3
-        else:
-            c = 0.8
-        factors["contact"] = c
+        contact = _CONTACT[bool(appointment.get("patient_phone", ""))][
+            bool(appointment.get("patient_whatsapp", False))
+        ]
 
         # ── Weighted sum ─────────────────────────────────────────
         raw = (
-            W_NO_SHOW_HISTORY * factors["no_show_history"]
-            + W_FIRST_VISIT * factors["first_visit"]
-            + W_LEAD_TIME * factors["lead_time"]
-            + W_TIME_OF_DAY * factors["time_of_day"]
-            + W_DAY_OF_WEEK * factors["day_of_week"]
-            + W_CONTACT * factors["contact"]
+            W_NO_SHOW_HISTORY * history
+            + W_FIRST_VISIT * first_visit
+            + W_LEAD_TIME * lead_time
+            + W_TIME_OF_DAY * tod
+            + W_DAY_OF_WEEK * dow
+            + W_CONTACT * contact
         )
         final = _clamp(round(raw, 4))
 
+        factors = {
+            "no_show_history": history,
+            "first_visit": first_visit,
+            "lead_time": lead_time,
+            "time_of_day": tod,
+            "day_of_week": dow,
+            "contact": contact,
+        }
         return RiskResult(score=final, level=_level(final), factors=factors)
 
     # ── helpers ──────────────────────────────────────────────────
     @staticmethod
-    def _lead_time_signal(iso: str) -> float:
-        """Same-day → 0.7, 1-3 days → 0.3, 3-14 → 0.1, >14 → 0.5."""
-        try:
-            scheduled = datetime.fromisoformat(iso)
-            now = datetime.now(scheduled.tzinfo)
-            days = (scheduled - now).total_seconds() / 86_400
-            if days < 1:
-                return 0.7
-            if days < 3:
-                return 0.3
-            if days > 14:
-                return 0.5
-            return 0.1
-        except (ValueError, TypeError):
-            return 0.3  # unknown → neutral
+    def _lead_time_signal(
+        scheduled: datetime | None, nows: dict[tzinfo | None, datetime]
+    ) -> float:
+        """Same-day → 0.7, 1-3 days → 0.3, 3-14 → 0.1, >14 → 0.5.
 
-    @staticmethod
-    def _extract_hour(iso: str) -> int | None:
-        try:
-            return datetime.fromisoformat(iso).hour
-        except (ValueError, TypeError):
-            return None
-
-    @staticmethod
-    def _extract_dow(iso: str) -> int | None:
+        *nows* caches the current time per tzinfo across a batch.
+        """
+        if scheduled is None:
+            return 0.3  # unknown → neutral
+        tz = scheduled.tzinfo
+        now = nows.get(tz)
+        if now is None:
+            now = nows[tz] = datetime.now(tz)
         try:
-            return datetime.fromisoformat(iso).weekday()
-        except (ValueError, TypeError):
-            return None
+            days = (scheduled - now).total_seconds() / 86_400
+        except TypeError:
+            return 0.3
+        if days < 1:
+            return 0.7
+        if days < 3:
+            return 0.3
+        if days > 14:
+            return 0.5
+        return 0.1
@@ -2,15 +2,18 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-__all__ = ["Settings"]
+__all__ = ["Settings", "get_settings"]
 
 
 class Settings(BaseSettings):
     """Central configuration — all values from environment."""
 
-    model_config = SettingsConfigDict(env_prefix="CACP_")
+    # Frozen: get_settings() hands one shared instance to every caller.
+    model_config = SettingsConfigDict(env_prefix="CACP_", frozen=True)
 
     # HMAC signing
     hmac_secret: str = ""
@@ -56,3 +59,13 @@ class Settings(BaseSettings):
     # Retry policy
     max_retries: int = 3
     retry_backoff_seconds: list[int] = [60, 300, 900]
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Process-wide ``Settings``, read from the environment once.
+
+    Later environment changes are not picked up; call
+    ``get_settings.cache_clear()`` to force a re-read (tests).
+    """
+    return Settings()
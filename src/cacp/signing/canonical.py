@@ -5,7 +5,56 @@ from __future__ import annotations
 import json
 from typing import Any
 
-__all__ = ["canonicalise"]
+import orjson
+
+__all__ = ["canonicalise", "canonicalise_bytes"]
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+)
+
+
+def _may_differ(out: bytes) -> bool:
+    """True if orjson's *out* might not match ``json.dumps`` byte for byte.
+
+    json escapes DEL; orjson writes NaN/Infinity as ``null``, and floats
+    below 1e-4 or from 1e16 up in a different notation than ``repr``.
+    Those floats always contain an ``e`` or ``0.0000`` outside string
+    literals, so only the text outside quotes is checked. An escaped quote
+    would throw off that split, so it also takes the slow path. A false
+    positive just costs a ``json.dumps``.
+    """
+    if b"\x7f" in out or b'\\"' in out:
+        return True
+    structure = b"".join(out.split(b'"')[::2])
+    if b"null" in structure or b"0.0000" in structure:
+        return True
+    return b"e" in structure.replace(b"true", b"").replace(b"false", b"")
+
+
+def _json_dumps(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def canonicalise_bytes(payload: dict[str, Any], exclude_keys: set[str] | None = None) -> bytes:
+    """Canonical JSON as UTF-8 bytes, for feeding straight into a MAC.
+
+    Byte-identical to ``json.dumps(sort_keys=True, separators=(",", ":"),
+    default=str)`` so existing signatures still verify. orjson does the
+    encoding; anything it would render differently (non-ASCII text, unusual
+    floats, non-string keys, oversized ints) is re-encoded with :mod:`json`.
+    One exception: plain ``Enum`` members are written as their value, not
+    ``str(member)``.
+    """
+    if exclude_keys:
+        payload = {k: v for k, v in payload.items() if k not in exclude_keys}
+    try:
+        out = orjson.dumps(payload, default=str, option=_ORJSON_OPTIONS)
+    except TypeError:
+        return _json_dumps(payload).encode()
+    if out.isascii() and not _may_differ(out):
+        return out
+    return _json_dumps(payload).encode()
 
 
 def canonicalise(payload: dict[str, Any], exclude_keys: set[str] | None = None) -> str:
@@ -18,6 +67,4 @@ def canonicalise(payload: dict[str, Any], exclude_keys: set[str] | None = None)
     Returns:
         Deterministic JSON string suitable for HMAC signing.
     """
-    if exclude_keys:
-        payload = {k: v for k, v in payload.items() if k not in exclude_keys}
-    return json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return canonicalise_bytes(payload, exclude_keys).decode()
@@ -2,27 +2,58 @@
 
 from __future__ import annotations
 
-import hashlib
+import functools
 import hmac as hmac_mod
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from cacp.signing.canonical import canonicalise
+from cacp.signing.canonical import canonicalise_bytes
 
-__all__ = ["sign_payload", "verify_signature"]
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+__all__ = ["sign_many", "sign_payload", "verify_signature"]
 
 _EXCLUDE = {"hmac_signature"}
+_HEX_DIGEST_LEN = 64  # SHA-256
+
+
+@functools.lru_cache(maxsize=8)
+def _key_bytes(secret: str) -> bytes:
+    return secret.encode()
+
+
+def _digest(payload: dict[str, Any], key: bytes) -> bytes:
+    # hmac.digest is the one-shot OpenSSL path — no HMAC object per call.
+    canonical = canonicalise_bytes(payload, exclude_keys=_EXCLUDE)
+    return hmac_mod.digest(key, canonical, "sha256")
+
+
+def _sign(payload: dict[str, Any], key: bytes) -> str:
+    return _digest(payload, key).hex()
 
 
 def sign_payload(payload: dict[str, Any], secret: str) -> str:
     """Sign a payload with HMAC-SHA256 and return the hex digest."""
-    canonical = canonicalise(payload, exclude_keys=_EXCLUDE)
-    return hmac_mod.new(secret.encode(), canonical.encode(), hashlib.sha256).hexdigest()
+    return _sign(payload, _key_bytes(secret))
+
+
+def sign_many(payloads: Iterable[dict[str, Any]], secret: str) -> list[str]:
+    """Sign each payload with the same secret; hex digests in input order."""
+    key = _key_bytes(secret)
+    return [_sign(payload, key) for payload in payloads]
 
 
 def verify_signature(payload: dict[str, Any], secret: str) -> bool:
-    """Verify that a payload's hmac_signature matches the expected value."""
+    """Verify that a payload's hmac_signature matches the expected value.
+
+    Signatures that are not 64 hex characters are rejected before the
+    payload is canonicalised, so malformed values cost no HMAC work.
+    """
     expected = payload.get("hmac_signature", "")
-    if not expected:
+    if not isinstance(expected, str) or len(expected) != _HEX_DIGEST_LEN:
+        return False
+    try:
+        received = bytes.fromhex(expected)
+    except ValueError:
         return False
-    computed = sign_payload(payload, secret)
-    return hmac_mod.compare_digest(computed, expected)
+    return hmac_mod.compare_digest(_digest(payload, _key_bytes(secret)), received)
@@ -2,15 +2,28 @@
 
 from __future__ import annotations
 
-import json
+import threading
 import uuid
+from collections import Counter
+from contextlib import contextmanager
 from datetime import UTC, datetime
+from itertools import islice
 from typing import TYPE_CHECKING, Any, Protocol
 
+from psycopg.types.json import Jsonb
+
+from cacp.ids import new_id
+
 if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
     import psycopg
+    from psycopg_pool import ConnectionPool
 
-__all__ = ["EventStoreProtocol", "InMemoryEventStore", "PostgresEventStore"]
+__all__ = ["EventRecord", "EventStoreProtocol", "InMemoryEventStore", "PostgresEventStore"]
+
+# (aggregate_id, event_type, payload, actor, idempotency_key)
+EventRecord = tuple[str, str, dict[str, Any], str, str | None]
 
 
 class EventStoreProtocol(Protocol):
@@ -45,7 +58,10 @@ class InMemoryEventStore:
 
     def __init__(self) -> None:
         self._events: list[dict[str, Any]] = []
-        self._seen_keys: set[str] = set()
+        self._key_to_event_id: dict[str, str] = {}
+        # Per-aggregate / per-type views, both in append order.
+        self._by_agg: dict[str, list[dict[str, Any]]] = {}
+        self._by_type: dict[str, list[dict[str, Any]]] = {}
 
     def append(
         self,
@@ -55,12 +71,11 @@ class InMemoryEventStore:
         actor: str = "system",
         idempotency_key: str | None = None,
     ) -> str:
-        if idempotency_key and idempotency_key in self._seen_keys:
-            # Idempotent — return existing event_id
-            for evt in self._events:
-                if evt.get("idempotency_key") == idempotency_key:
-                    return evt["event_id"]  # type: ignore[no-any-return]
-            return ""  # pragma: no cover
+        if idempotency_key:
+            existing = self._key_to_event_id.get(idempotency_key)
+            if existing is not None:
+                # Idempotent — return existing event_id
+                return existing
         event_id = str(uuid.uuid4())
         record: dict[str, Any] = {
             "event_id": event_id,
@@ -68,12 +83,15 @@ class InMemoryEventStore:
             "event_type": event_type,
             "payload": payload,
             "actor": actor,
-            "created_at": datetime.now(UTC).isoformat(),
+            # Fixed width (always microseconds), so stamps compare as strings.
+            "created_at": datetime.now(UTC).isoformat(timespec="microseconds"),
         }
         if idempotency_key:
             record["idempotency_key"] = idempotency_key
-            self._seen_keys.add(idempotency_key)
+            self._key_to_event_id[idempotency_key] = event_id
         self._events.append(record)
+        self._by_agg.setdefault(aggregate_id, []).append(record)
+        self._by_type.setdefault(event_type, []).append(record)
         return event_id
 
     def list_events(
@@ -82,22 +100,181 @@ class InMemoryEventStore:
         event_type: str | None = None,
         limit: int = 100,
     ) -> list[dict[str, Any]]:
-        out = self._events
+        if limit <= 0:
+            return []
+        events = self._candidates(aggregate_id, event_type)
+        if not aggregate_id or not event_type:
+            # Slice before reversing so only ``limit`` records are copied.
+            return events[-limit:][::-1]
+        newest_first = (
+            e
+            for e in reversed(events)
+            if e["aggregate_id"] == aggregate_id and e["event_type"] == event_type
+        )
+        return list(islice(newest_first, limit))
+
+    def iter_events(
+        self,
+        aggregate_id: str | None = None,
+        event_type: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        for evt in self._candidates(aggregate_id, event_type):
+            if aggregate_id and evt["aggregate_id"] != aggregate_id:
+                continue
+            if event_type and evt["event_type"] != event_type:
+                continue
+            yield evt
+
+    def count_by_type(
+        self,
+        aggregate_id: str | None = None,
+        since: datetime | None = None,
+    ) -> dict[str, int]:
+        """Event counts per event_type. A naive *since* is taken as UTC."""
+        out = self._candidates(aggregate_id, None)
+        if since is not None:
+            # Compare against the stored UTC stamps as strings: no per-event parse.
+            cutoff = _as_utc(since).isoformat(timespec="microseconds")
+            out = [e for e in out if e["created_at"] >= cutoff]
+        return dict(Counter(e["event_type"] for e in out))
+
+    def _candidates(
+        self,
+        aggregate_id: str | None,
+        event_type: str | None,
+    ) -> list[dict[str, Any]]:
+        """Smallest append-ordered list that contains every match."""
+        if aggregate_id and event_type:
+            by_agg = self._by_agg.get(aggregate_id, [])
+            by_type = self._by_type.get(event_type, [])
+            return by_agg if len(by_agg) <= len(by_type) else by_type
         if aggregate_id:
-            out = [e for e in out if e["aggregate_id"] == aggregate_id]
+            return self._by_agg.get(aggregate_id, [])
         if event_type:
-            out = [e for e in out if e["event_type"] == event_type]
-        return list(reversed(out))[:limit]
+            return self._by_type.get(event_type, [])
+        return self._events
 
 
 # ── PostgreSQL implementation ────────────────────────────
 
 
+# event_id and created_at come from column defaults.
+_INSERT_ONE_SQL = """
+    INSERT INTO events
+        (aggregate_id, event_type, payload, actor, idempotency_key)
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT (idempotency_key) DO NOTHING
+    RETURNING event_id
+"""
+
+_SELECT_BY_KEY_SQL = "SELECT event_id FROM events WHERE idempotency_key = %s"
+
+_SELECT_BY_KEYS_SQL = (
+    "SELECT idempotency_key, event_id FROM events WHERE idempotency_key = ANY(%s)"
+)
+
+# One statement per chunk; array parameters keep the bind count at six.
+# Batch ids are generated here so they can be returned in input order;
+# created_at still comes from the column default.
+_INSERT_MANY_SQL = """
+    INSERT INTO events
+        (event_id, aggregate_id, event_type,
+         payload, actor, idempotency_key)
+    SELECT * FROM UNNEST(
+        %s::uuid[], %s::text[], %s::text[],
+        %s::jsonb[], %s::text[], %s::text[]
+    )
+    ON CONFLICT (idempotency_key) DO NOTHING
+"""
+
+_INSERT_CHUNK = 5000
+
+_EVENT_COLUMNS = "event_id, aggregate_id, event_type, payload, actor, created_at"
+
+# One fixed statement per filter combination, keyed by
+# (aggregate_id given, event_type given), so each can be server-prepared.
+_LIST_EVENTS_SELECT = f"SELECT {_EVENT_COLUMNS} FROM events "  # noqa: S608
+_LIST_EVENTS_ORDER = "ORDER BY created_at DESC, id DESC LIMIT %s"
+_LIST_EVENTS_SQL = {
+    (False, False): _LIST_EVENTS_SELECT + _LIST_EVENTS_ORDER,
+    (True, False): _LIST_EVENTS_SELECT + "WHERE aggregate_id = %s " + _LIST_EVENTS_ORDER,
+    (False, True): _LIST_EVENTS_SELECT + "WHERE event_type = %s " + _LIST_EVENTS_ORDER,
+    (True, True): (
+        _LIST_EVENTS_SELECT + "WHERE aggregate_id = %s AND event_type = %s " + _LIST_EVENTS_ORDER
+    ),
+}
+
+# Rows per round-trip when streaming through a server-side cursor.
+_STREAM_ITERSIZE = 1000
+
+# Above this many records COPY beats the UNNEST insert; below it the temp
+# table setup costs more than it saves.
+_COPY_THRESHOLD = 100
+
+_COPY_COLUMNS = "event_id, aggregate_id, event_type, payload, actor, idempotency_key"
+# event_id is staged as text: batch ids come from new_id() as strings.
+_COPY_TYPES = ["text", "text", "text", "jsonb", "text", "text"]
+
+
 class PostgresEventStore:
     """Append-only event log in PostgreSQL."""
 
-    def __init__(self, conn: psycopg.Connection[Any]) -> None:
-        self._conn = conn
+    def __init__(self, pool: ConnectionPool) -> None:
+        self._pool = pool
+        # Connection held by an open unit_of_work() / pipelined_append()
+        # block, per thread, and whether that block is in pipeline mode.
+        self._local = threading.local()
+
+    @contextmanager
+    def _connection(self) -> Iterator[psycopg.Connection[Any]]:
+        """Pooled connection; commits on clean exit, rolls back on error."""
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            yield held
+            return
+        with self._pool.connection() as conn:
+            yield conn
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[PostgresEventStore]:
+        """Run every append in the block as one transaction.
+
+        The block holds one pooled connection. Appends inside it behave as
+        usual (ids come back straight away) but nothing is committed until
+        the block exits, so a burst of N events costs one commit instead of
+        N. The whole block rolls back if it raises. Nested blocks join the
+        outer transaction.
+        """
+        if getattr(self._local, "conn", None) is not None:
+            yield self
+            return
+        with self._pool.connection() as conn:
+            self._local.conn = conn
+            try:
+                yield self
+            finally:
+                self._local.conn = None
+
+    @contextmanager
+    def pipelined_append(self) -> Iterator[None]:
+        """Queue appends in psycopg pipeline mode and commit once at exit.
+
+        Like :meth:`unit_of_work`, but inside the block :meth:`append` and
+        friends send their statements without waiting for results. The
+        pipeline syncs on exit and the whole batch commits as one
+        transaction, or rolls back if the block raises.
+        """
+        if getattr(self._local, "pipelined", False):
+            yield
+            return
+        with self.unit_of_work():
+            conn = self._local.conn
+            self._local.pipelined = True
+            try:
+                with conn.pipeline():
+                    yield
+            finally:
+                self._local.pipelined = False
 
     def append(
         self,
@@ -107,66 +284,214 @@ class PostgresEventStore:
         actor: str = "system",
         idempotency_key: str | None = None,
     ) -> str:
-        event_id = str(uuid.uuid4())
-        now = datetime.now(UTC).isoformat()
+        """Insert one event. Returns its event_id.
+
+        The id and timestamp are column defaults. If *idempotency_key* was
+        already used, the existing event's id is returned. Inside
+        :meth:`pipelined_append` the row goes through :meth:`append_many`
+        instead, so an append without a key waits on nothing.
+        """
+        record = (aggregate_id, event_type, payload, actor, idempotency_key)
+        if getattr(self._local, "pipelined", False):
+            return self.append_many([record])[0]
 
-        with self._conn.cursor() as cur:
+        with self._connection() as conn, conn.cursor() as cur:
             cur.execute(
-                """
-                INSERT INTO events
-                    (event_id, aggregate_id, event_type,
-                     payload, actor, created_at, idempotency_key)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (idempotency_key) DO NOTHING
-                """,
-                (
-                    event_id,
-                    aggregate_id,
-                    event_type,
-                    json.dumps(payload),
-                    actor,
-                    now,
-                    idempotency_key,
-                ),
+                _INSERT_ONE_SQL,
+                (aggregate_id, event_type, Jsonb(payload), actor, idempotency_key),
             )
-        self._conn.commit()
-        return event_id
+            row = cur.fetchone()
+            if row is None:
+                # Conflict on idempotency_key: report the event already stored.
+                cur.execute(_SELECT_BY_KEY_SQL, (idempotency_key,))
+                row = cur.fetchone()
+        return str(row[0]) if row is not None else ""
 
-    def list_events(
+    def append_many(self, records: Sequence[EventRecord]) -> list[str]:
+        """Insert *records* in one transaction. Returns their event_ids.
+
+        Rows are bound as parallel arrays and expanded with ``UNNEST``, one
+        statement per 5000 records and a single commit. A record whose
+        idempotency key already exists is skipped and reported with the id
+        of the stored event.
+        """
+        event_ids = [new_id() for _ in records]
+        if not records:
+            return event_ids
+
+        with self._connection() as conn, conn.cursor() as cur:
+            for start in range(0, len(records), _INSERT_CHUNK):
+                chunk = records[start : start + _INSERT_CHUNK]
+                cur.execute(
+                    _INSERT_MANY_SQL,
+                    (
+                        event_ids[start : start + _INSERT_CHUNK],
+                        [r[0] for r in chunk],
+                        [r[1] for r in chunk],
+                        [Jsonb(r[2]) for r in chunk],
+                        [r[3] for r in chunk],
+                        [r[4] for r in chunk],
+                    ),
+                )
+            return _stored_ids(cur, records, event_ids)
+
+    def copy_events(self, records: Sequence[EventRecord]) -> list[str]:
+        """Bulk-load *records* with binary ``COPY``. Returns their event_ids.
+
+        For backfill and replay bursts. Batches of up to 100 records go
+        through :meth:`append_many`. Larger ones are copied into a
+        transaction-scoped staging table and moved into ``events`` with
+        ``ON CONFLICT DO NOTHING``, so idempotency keys are still honoured.
+        """
+        if len(records) <= _COPY_THRESHOLD:
+            return self.append_many(records)
+
+        event_ids = [new_id() for _ in records]
+
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                "CREATE TEMP TABLE _events_copy ("
+                "event_id text, aggregate_id text, event_type text, payload jsonb, "
+                "actor text, idempotency_key text"
+                ") ON COMMIT DROP"
+            )
+            with cur.copy(
+                f"COPY _events_copy ({_COPY_COLUMNS}) FROM STDIN WITH (FORMAT BINARY)"
+            ) as cp:
+                cp.set_types(_COPY_TYPES)
+                for event_id, (aggregate_id, event_type, payload, actor, key) in zip(
+                    event_ids, records, strict=True
+                ):
+                    cp.write_row((event_id, aggregate_id, event_type, Jsonb(payload), actor, key))
+            cur.execute(
+                f"INSERT INTO events ({_COPY_COLUMNS}) "  # noqa: S608
+                "SELECT event_id::uuid, aggregate_id, event_type, payload, actor, "
+                "idempotency_key FROM _events_copy "
+                "ON CONFLICT (idempotency_key) DO NOTHING"
+            )
+            return _stored_ids(cur, records, event_ids)
+
+    def count_by_type(
         self,
         aggregate_id: str | None = None,
-        event_type: str | None = None,
-        limit: int = 100,
-    ) -> list[dict[str, Any]]:
+        since: datetime | None = None,
+    ) -> dict[str, int]:
+        """Event counts per event_type, aggregated in the database.
+
+        A naive *since* is taken as UTC, as in the in-memory store, rather
+        than in the session time zone.
+        """
         clauses: list[str] = []
         params: list[Any] = []
 
         if aggregate_id:
             clauses.append("aggregate_id = %s")
             params.append(aggregate_id)
-        if event_type:
-            clauses.append("event_type = %s")
-            params.append(event_type)
+        if since is not None:
+            clauses.append("created_at >= %s")
+            params.append(_as_utc(since))
 
         where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
-        params.append(limit)
 
-        with self._conn.cursor() as cur:
+        with self._connection() as conn, conn.cursor() as cur:
             cur.execute(
-                f"SELECT event_id, aggregate_id, event_type, payload, actor, created_at "  # noqa: S608
-                f"FROM events {where} ORDER BY created_at DESC LIMIT %s",
+                f"SELECT event_type, count(*) FROM events {where} GROUP BY event_type",  # noqa: S608
                 params,
             )
+            return {event_type: count for event_type, count in cur.fetchall()}
+
+    def list_events(
+        self,
+        aggregate_id: str | None = None,
+        event_type: str | None = None,
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        sql = _LIST_EVENTS_SQL[bool(aggregate_id), bool(event_type)]
+        params: list[Any] = [p for p in (aggregate_id, event_type) if p]
+        params.append(limit)
+
+        with self._connection() as conn, conn.cursor() as cur:
+            # prepare=True skips psycopg's default five-run warm-up, so the
+            # plan is reused from the second call on this connection.
+            cur.execute(sql, params, prepare=True)
             rows = cur.fetchall()
 
-        return [
-            {
-                "event_id": r[0],
-                "aggregate_id": r[1],
-                "event_type": r[2],
-                "payload": json.loads(r[3]) if isinstance(r[3], str) else r[3],
-                "actor": r[4],
-                "created_at": r[5],
-            }
-            for r in rows
-        ]
+        return [_row_to_event(r) for r in rows]
+
+    def iter_events(
+        self,
+        aggregate_id: str | None = None,
+        event_type: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream matching events oldest-first through a server-side cursor.
+
+        For projection replays: rows arrive 1000 at a time, so memory stays
+        bounded however long the history is. The pooled connection is held
+        until the iterator is exhausted or closed.
+        """
+        where, params = _event_filters(aggregate_id, event_type)
+
+        # Unique per stream: inside unit_of_work() several streams can be
+        # open on the same held connection at once.
+        name = f"cacp_events_{new_id()}"
+        with self._connection() as conn, conn.cursor(name=name) as cur:
+            cur.itersize = _STREAM_ITERSIZE
+            cur.execute(
+                f"SELECT {_EVENT_COLUMNS} FROM events {where} ORDER BY created_at, id",  # noqa: S608
+                params,
+            )
+            for r in cur:
+                yield _row_to_event(r)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """*value* in UTC; naive datetimes are assumed to be UTC already."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def _event_filters(aggregate_id: str | None, event_type: str | None) -> tuple[str, list[Any]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+
+    if aggregate_id:
+        clauses.append("aggregate_id = %s")
+        params.append(aggregate_id)
+    if event_type:
+        clauses.append("event_type = %s")
+        params.append(event_type)
+
+    where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+    return where, params
+
+
+def _stored_ids(
+    cur: psycopg.Cursor[Any], records: Sequence[EventRecord], event_ids: list[str]
+) -> list[str]:
+    """*event_ids* with each keyed record mapped to the id actually stored.
+
+    A record skipped by ``ON CONFLICT`` would otherwise report an id that
+    was never written. Records without a key cannot conflict, so a batch
+    with no keys costs no extra query.
+    """
+    keys = list({r[4] for r in records if r[4] is not None})
+    if not keys:
+        return event_ids
+    cur.execute(_SELECT_BY_KEYS_SQL, (keys,))
+    stored = {key: str(event_id) for key, event_id in cur.fetchall()}
+    return [
+        stored.get(r[4], event_id) if r[4] is not None else event_id
+        for r, event_id in zip(records, event_ids, strict=True)
+    ]
+
+
+def _row_to_event(r: Sequence[Any]) -> dict[str, Any]:
+    return {
+        "event_id": r[0],
+        "aggregate_id": r[1],
+        "event_type": r[2],
+        "payload": r[3],
+        "actor": r[4],
+        "created_at": r[5],
+    }
@@ -2,11 +2,78 @@
 
 from __future__ import annotations
 
-import psycopg
+import functools
+import os
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["get_connection"]
+import orjson
+from psycopg.types.json import set_json_dumps, set_json_loads
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
 
+if TYPE_CHECKING:
+    import psycopg
 
-def get_connection(dsn: str) -> psycopg.Connection[tuple[object, ...]]:
-    """Create a new PostgreSQL connection."""
-    return psycopg.connect(dsn, autocommit=False)
+__all__ = ["create_pool", "get_pool"]
+
+_POOL_MIN_SIZE = 2
+# Both pools share this ceiling. Blocking callers (asyncio.to_thread, the
+# worker's thread pool) hold one connection per thread, and their thread
+# counts grow with the CPU count, so the ceiling does too, never below 10.
+_POOL_MAX_SIZE = max(10, (os.cpu_count() or 1) * 2)
+_POOL_TIMEOUT = 5  # seconds to wait for a free connection
+
+
+def _use_orjson(conn: psycopg.Connection[Any] | psycopg.AsyncConnection[Any]) -> None:
+    """json/jsonb go through orjson in both directions on this connection."""
+    set_json_dumps(orjson.dumps, conn)
+    set_json_loads(orjson.loads, conn)
+
+
+def _configure_json(conn: psycopg.Connection[Any]) -> None:
+    """``configure=`` hook for the sync pool."""
+    _use_orjson(conn)
+
+
+async def _configure_json_async(conn: psycopg.AsyncConnection[Any]) -> None:
+    """``configure=`` hook for the async pool."""
+    _use_orjson(conn)
+
+
+@functools.cache
+def get_pool(dsn: str) -> ConnectionPool:
+    """Shared per-DSN sync pool for blocking callers (event store, workers).
+
+    Hand out connections with ``with pool.connection() as conn:`` — it
+    commits on a clean exit and rolls back on error. Sized, configured and
+    opened like :func:`create_pool`: connections are established in the
+    background, so creating the pool never blocks on the database.
+    """
+    pool = ConnectionPool(
+        dsn,
+        min_size=_POOL_MIN_SIZE,
+        max_size=_POOL_MAX_SIZE,
+        timeout=_POOL_TIMEOUT,
+        kwargs={"autocommit": False},
+        configure=_configure_json,
+        open=False,
+    )
+    pool.open(wait=False)
+    return pool
+
+
+async def create_pool(dsn: str) -> AsyncConnectionPool:
+    """Open a shared async connection pool.
+
+    Connections are established in the background, so startup does not
+    block (or fail) on an unreachable database; readiness reports it.
+    """
+    pool = AsyncConnectionPool(
+        dsn,
+        min_size=_POOL_MIN_SIZE,
+        max_size=_POOL_MAX_SIZE,
+        timeout=_POOL_TIMEOUT,
+        configure=_configure_json_async,
+        open=False,
+    )
+    await pool.open(wait=False)
+    return pool
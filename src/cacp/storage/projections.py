@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
-from typing import Any
+from collections import Counter
+from itertools import repeat
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
 
 __all__ = ["NoShowProjection"]
 
@@ -13,34 +18,43 @@ class NoShowProjection:
     def __init__(self) -> None:
         self._stats: dict[str, Any] = {}
 
-    def project(self, events: list[dict[str, Any]]) -> dict[str, Any]:
+    def project(self, events: Iterable[dict[str, Any]]) -> dict[str, Any]:
         """Build a summary from events.
 
         Returns:
             Dict with total_appointments, no_shows, no_show_rate, etc.
         """
-        total = 0
-        no_shows = 0
-        confirmed = 0
-        rescheduled = 0
-
-        for event in events:
-            etype = event.get("event_type", "")
-            if etype == "appointment_ingested":
-                total += 1
-            elif etype == "no_show_recorded":
-                no_shows += 1
-            elif etype == "appointment_confirmed":
-                confirmed += 1
-            elif etype == "appointment_rescheduled":
-                rescheduled += 1
+        # map(dict.get, ...) keeps the per-event lookup in C as well; a
+        # generator expression here is slower than the old elif loop.
+        return self.project_from_counts(
+            Counter(map(dict.get, events, repeat("event_type"), repeat("")))
+        )
+
+    def project_types(self, event_types: Iterable[str]) -> dict[str, Any]:
+        """Build the same summary from a stream of bare event types.
+
+        For replays over large histories: feed it a server-side cursor over
+        ``SELECT event_type FROM events`` instead of materialising full
+        event dicts. Counting plain strings is roughly twice as fast as
+        :meth:`project`, and nothing is held in memory.
+        """
+        return self.project_from_counts(Counter(event_types))
 
+    @staticmethod
+    def project_from_counts(counts: Mapping[str, int]) -> dict[str, Any]:
+        """Build the summary from per-type event counts.
+
+        Pairs with ``PostgresEventStore.count_by_type``, which does the
+        counting in the database so no event rows are fetched.
+        """
+        total = counts.get("appointment_ingested", 0)
+        no_shows = counts.get("no_show_recorded", 0)
         rate = no_shows / total if total > 0 else 0.0
 
         return {
             "total_appointments": total,
             "no_shows": no_shows,
-            "confirmed": confirmed,
-            "rescheduled": rescheduled,
+            "confirmed": counts.get("appointment_confirmed", 0),
+            "rescheduled": counts.get("appointment_rescheduled", 0),
             "no_show_rate": round(rate, 4),
         }
@@ -2,18 +2,25 @@
 
 from __future__ import annotations
 
-import json
 import logging
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, Protocol
 from zoneinfo import ZoneInfo
 
+import orjson
+
 if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
     import redis
+    from redis.commands.core import Script
 
     from cacp.consent import ConsentStoreProtocol
-    from cacp.storage.event_store import EventStoreProtocol
+    from cacp.storage.event_store import EventRecord, EventStoreProtocol
 
 from cacp.queue.enqueue import QUEUE_NAME
 
@@ -25,6 +32,57 @@ logger = logging.getLogger(__name__)
 RETRY_ZSET = "cacp:retry"
 DLQ_KEY = "cacp:dlq"
 
+# Max actions taken from the queue per round-trip in run_loop
+_POP_BATCH = 64
+
+# Buffered audit events written per flush
+_EVENT_BATCH = 32
+
+# Max due retries promoted per process_retries call
+_PROMOTE_BATCH = 500
+
+# Move due retries (score <= ARGV[1]) from KEYS[1] to the tail of KEYS[2],
+# oldest first, atomically — two workers cannot promote the same item.
+_PROMOTE_RETRIES_LUA = """
+local items = redis.call('ZRANGEBYSCORE', KEYS[1], 0, ARGV[1], 'LIMIT', 0, ARGV[2])
+if #items == 0 then
+  return 0
+end
+redis.call('ZREM', KEYS[1], unpack(items))
+redis.call('RPUSH', KEYS[2], unpack(items))
+return #items
+"""
+
+# Atomically replace the first ARGV[1] items of the DLQ (KEYS[1]), provided
+# they are still the ones the caller peeked (ARGV[3] onwards): the next
+# ARGV[2] args go to the tail of the queue (KEYS[2]) and any remaining args
+# back to the tail of the DLQ. Returns 0, changing nothing, if another
+# replay took the head first.
+_REPLAY_DLQ_LUA = """
+local n = tonumber(ARGV[1])
+local n_replay = tonumber(ARGV[2])
+local head = redis.call('LRANGE', KEYS[1], 0, n - 1)
+if #head ~= n then
+  return 0
+end
+for i = 1, n do
+  if head[i] ~= ARGV[2 + i] then
+    return 0
+  end
+end
+redis.call('LTRIM', KEYS[1], n, -1)
+if n_replay > 0 then
+  redis.call('RPUSH', KEYS[2], unpack(ARGV, 3 + n, 2 + n + n_replay))
+end
+if #ARGV > 2 + n + n_replay then
+  redis.call('RPUSH', KEYS[1], unpack(ARGV, 3 + n + n_replay, #ARGV))
+end
+return 1
+"""
+
+# replay_dlq attempts before giving up on a DLQ head that keeps changing
+_REPLAY_ATTEMPTS = 3
+
 
 # ---------------------------------------------------------------------------
 # Adapter protocol
@@ -77,72 +135,93 @@ def _check_consent(
     return None
 
 
+def _quiet_hours_mask(quiet_start: int, quiet_end: int) -> int:
+    """Bit *h* is set when hour *h* (clinic local time) is a quiet hour."""
+    mask = 0
+    for hour in range(24):
+        if quiet_start <= quiet_end:
+            # e.g. 02:00-06:00
+            quiet = quiet_start <= hour < quiet_end
+        else:
+            # e.g. 22:00-08:00 (wraps midnight)
+            quiet = hour >= quiet_start or hour < quiet_end
+        mask |= quiet << hour
+    return mask
+
+
 def _check_quiet_hours(
-    quiet_start: int,
-    quiet_end: int,
-    tz_name: str,
+    quiet_mask: int,
+    tz: ZoneInfo,
 ) -> str | None:
     """Return blocking reason if current hour is inside quiet window.
 
-    Evaluates in clinic local time via *tz_name* (e.g. Europe/Madrid).
+    Evaluates in clinic local time via *tz* (e.g. Europe/Madrid) against a
+    mask from :func:`_quiet_hours_mask`.
     """
-    hour = datetime.now(ZoneInfo(tz_name)).hour
-    if quiet_start <= quiet_end:
-        # e.g. 02:00-06:00
-        if quiet_start <= hour < quiet_end:
-            return "quiet_hours"
-    else:
-        # e.g. 22:00-08:00 (wraps midnight)
-        if hour >= quiet_start or hour < quiet_end:
-            return "quiet_hours"
+    hour = datetime.now(tz).hour
+    if quiet_mask >> hour & 1:
+        return "quiet_hours"
     return None
 
 
-def _check_rate_limit(
+# Dedup + rate limit as one atomic server-side step.
+# KEYS: rate window (ZSET), dedup key.
+# ARGV: now, window, limit (0 = skip), member, dedup ttl (0 = skip).
+# Returns 0 (allowed), 1 (rate limited) or 2 (duplicate). Dedup is checked
+# first, so a duplicate never touches the rate window; nothing is written
+# for a blocked action.
+_RAILS_LUA = """
+local ttl = tonumber(ARGV[5])
+if ttl > 0 and redis.call('EXISTS', KEYS[2]) == 1 then
+  return 2
+end
+local limit = tonumber(ARGV[3])
+if limit > 0 then
+  redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, tonumber(ARGV[1]) - tonumber(ARGV[2]))
+  if redis.call('ZCARD', KEYS[1]) >= limit then
+    return 1
+  end
+  redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+  redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+if ttl > 0 then
+  redis.call('SET', KEYS[2], '1', 'EX', ttl)
+end
+return 0
+"""
+
+_RAILS_REASONS = (None, "rate_limited", "duplicate_action")
+
+
+def _check_rate_and_dedup(
     action: dict[str, Any],
-    redis_client: redis.Redis,  # type: ignore[type-arg]
+    rails_script: Script,
     limit: int,
     window: int,
+    dedup_ttl: int,
 ) -> str | None:
-    """Sliding-window rate limit per patient+channel."""
-    patient_id = action.get("patient_id", "")
-    channel = action.get("channel", "sms")
-    if not patient_id or limit <= 0:
-        return None
-    key = f"cacp:rate:{patient_id}:{channel}"
-    now = time.time()
-    pipe = redis_client.pipeline()
-    pipe.zremrangebyscore(key, 0, now - window)
-    pipe.zcard(key)
-    pipe.zadd(key, {str(now): now})
-    pipe.expire(key, window)
-    results = pipe.execute()  # type: ignore[union-attr]
-    current_count: int = results[1]  # type: ignore[assignment]
-    if current_count >= limit:
-        return "rate_limited"
-    return None
-
+    """Dedup + sliding-window rate limit in one EVALSHA round trip.
 
-def _check_dedup(
-    action: dict[str, Any],
-    redis_client: redis.Redis,  # type: ignore[type-arg]
-    ttl: int,
-) -> str | None:
-    """Atomic dedup per appointment_id + channel. Returns reason or None."""
+    The dedup key is per appointment_id+channel; the rate window is per
+    patient+channel. A duplicate is reported as such even when the window
+    is also full, and neither blocked case writes to Redis.
+    """
+    patient_id = action.get("patient_id", "")
     appointment_id = action.get("appointment_id", "")
     channel = action.get("channel", "sms")
+    if not patient_id:
+        limit = 0
     if not appointment_id:
+        dedup_ttl = 0
+    if limit <= 0 and dedup_ttl <= 0:
         return None
-    dedup_key = f"cacp:sent:{appointment_id}:{channel}"
-    acquired = redis_client.set(
-        dedup_key,
-        "1",
-        nx=True,
-        ex=ttl,
-    )  # type: ignore[union-attr]
-    if not acquired:
-        return "duplicate_action"
-    return None
+
+    now = time.time()
+    code = rails_script(
+        keys=[f"cacp:rate:{patient_id}:{channel}", f"cacp:sent:{appointment_id}:{channel}"],
+        args=[now, window, max(limit, 0), str(now), max(dedup_ttl, 0)],
+    )
+    return _RAILS_REASONS[int(code)]
 
 
 # ---------------------------------------------------------------------------
@@ -167,21 +246,33 @@ class Worker:
         dedup_ttl: int = 86400,
         max_retries: int = 3,
         retry_backoff: list[int] | None = None,
+        concurrency: int = 1,
     ) -> None:
         self._redis = redis_client
-        self._adapters: dict[str, ActionAdapter] = adapters or {
-            "execute_plan": NoopAdapter(),
+        # Runs via EVALSHA; redis-py reloads the script on NOSCRIPT.
+        self._rails_script = redis_client.register_script(_RAILS_LUA)
+        self._promote_script = redis_client.register_script(_PROMOTE_RETRIES_LUA)
+        self._replay_script = redis_client.register_script(_REPLAY_DLQ_LUA)
+        adapters = adapters or {"execute_plan": NoopAdapter()}
+        # action_type -> bound execute, resolved once
+        self._dispatch: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+            action_type: adapter.execute for action_type, adapter in adapters.items()
         }
         self._events = event_store
+        # Audit events wait here until _flush_events (end of each batch).
+        # run_loop threads share it, so every access holds the lock.
+        self._event_buf: deque[EventRecord] = deque()
+        self._event_lock = threading.Lock()
         self._consent = consent_store
-        self._quiet_start = quiet_hours_start
-        self._quiet_end = quiet_hours_end
-        self._tz = timezone
+        self._quiet_mask = _quiet_hours_mask(quiet_hours_start, quiet_hours_end)
+        self._tz = ZoneInfo(timezone)
         self._rate_limit = sms_rate_limit
         self._rate_window = sms_rate_window
         self._dedup_ttl = dedup_ttl
         self._max_retries = max_retries
         self._backoff = retry_backoff or [60, 300, 900]
+        # Actions from one dequeued batch run on this many threads in run_loop
+        self._concurrency = max(1, concurrency)
 
     # -- event helper -------------------------------------------------------
 
@@ -189,22 +280,58 @@ class Worker:
         self,
         aggregate_id: str,
         event_type: str,
-        payload: dict[str, Any],
+        base: dict[str, Any],
+        /,
+        **extra: Any,
     ) -> None:
+        """Buffer an audit event whose payload is *base* updated with *extra*.
+
+        The merged copy is only built when an event store is configured.
+        """
         if self._events is None:
             return
-        try:
-            self._events.append(
-                aggregate_id=aggregate_id,
-                event_type=event_type,
-                payload=payload,
-            )
-        except Exception:
-            logger.warning(
-                "Event store append failed for %s",
-                event_type,
-                exc_info=True,
-            )
+        payload = {**base, **extra} if extra else base
+        with self._event_lock:
+            self._event_buf.append((aggregate_id, event_type, payload, "system", None))
+            full = len(self._event_buf) >= _EVENT_BATCH
+        if full:
+            self._flush_events()
+
+    def _flush_events(self) -> None:
+        """Write buffered events, in one ``append_many`` if the store has it."""
+        if self._events is None:
+            return
+        # Take the whole buffer under the lock; the write itself runs
+        # outside it, so other threads keep buffering meanwhile.
+        with self._event_lock:
+            records = list(self._event_buf)
+            self._event_buf.clear()
+        if not records:
+            return
+        append_many = getattr(self._events, "append_many", None)
+        if append_many is not None:
+            try:
+                append_many(records)
+            except Exception:
+                logger.warning(
+                    "Event store append failed for %d events",
+                    len(records),
+                    exc_info=True,
+                )
+            return
+        for aggregate_id, event_type, payload, _, _ in records:
+            try:
+                self._events.append(
+                    aggregate_id=aggregate_id,
+                    event_type=event_type,
+                    payload=payload,
+                )
+            except Exception:
+                logger.warning(
+                    "Event store append failed for %s",
+                    event_type,
+                    exc_info=True,
+                )
 
     # -- rail pipeline ------------------------------------------------------
 
@@ -219,25 +346,18 @@ class Worker:
             return reason
 
         # 2. Quiet hours (clinic local time)
-        reason = _check_quiet_hours(
-            self._quiet_start,
-            self._quiet_end,
-            self._tz,
-        )
+        reason = _check_quiet_hours(self._quiet_mask, self._tz)
         if reason:
             return reason
 
-        # 3. Rate limit (needs Redis)
-        reason = _check_rate_limit(
+        # 3. Dedup per appointment+channel, then rate limit (one Redis round trip)
+        return _check_rate_and_dedup(
             action,
-            self._redis,
+            self._rails_script,
             self._rate_limit,
             self._rate_window,
+            self._dedup_ttl,
         )
-        if reason:
-            return reason
-
-        return None
 
     # -- retry / DLQ --------------------------------------------------------
 
@@ -254,13 +374,9 @@ class Worker:
             action["_retry_count"] = attempt
             self._redis.rpush(
                 DLQ_KEY,
-                json.dumps(action),
+                orjson.dumps(action),
             )  # type: ignore[union-attr]
-            self._emit(
-                aggregate_id,
-                "action_dead_lettered",
-                {**action, "reason": "max_retries_exceeded"},
-            )
+            self._emit(aggregate_id, "action_dead_lettered", action, reason="max_retries_exceeded")
             logger.warning(
                 "Action dead-lettered after %d attempts: %s",
                 attempt,
@@ -276,7 +392,7 @@ class Worker:
         action["_retry_count"] = attempt
         self._redis.zadd(
             RETRY_ZSET,
-            {json.dumps(action): fire_at},
+            {orjson.dumps(action): fire_at},
         )  # type: ignore[union-attr]
         self._emit(
             aggregate_id,
@@ -297,23 +413,18 @@ class Worker:
     def process_retries(self) -> int:
         """Re-enqueue actions whose retry time has arrived.
 
-        Returns the number of actions moved back to the main queue.
+        Returns the number of actions moved back to the main queue. One
+        script call moves up to ``_PROMOTE_BATCH`` items; any remainder is
+        picked up on the next call.
         """
-        now = time.time()
-        # Grab items with score <= now
-        items: list[Any] = self._redis.zrangebyscore(
-            RETRY_ZSET,
-            0,
-            now,
-        )  # type: ignore[union-attr,assignment]
-        if not items:
-            return 0
-        moved = 0
-        for raw in items:
-            self._redis.zrem(RETRY_ZSET, raw)  # type: ignore[union-attr]
-            self._redis.rpush(QUEUE_NAME, raw)  # type: ignore[union-attr]
-            moved += 1
-        logger.info("Re-enqueued %d retries", moved)
+        moved = int(
+            self._promote_script(
+                keys=[RETRY_ZSET, QUEUE_NAME],
+                args=[time.time(), _PROMOTE_BATCH],
+            )
+        )
+        if moved:
+            logger.info("Re-enqueued %d retries", moved)
         return moved
 
     def dlq_size(self) -> int:
@@ -326,24 +437,46 @@ class Worker:
     ) -> int:
         """Move items from DLQ back to main queue.
 
-        Resets retry count. Returns number of items replayed.
+        Resets retry count. Returns number of items replayed. Up to
+        *max_items* are read from the head of the DLQ with one ``LRANGE``
+        and moved by one script call, so a crash mid-replay loses nothing:
+        either the whole move happened or the DLQ is untouched. Items whose
+        retry count is already zero are pushed back as-is, without a
+        re-encode; undecodable items stay in the DLQ, moved to its tail.
         """
-        replayed = 0
-        for _ in range(max_items):
-            raw = self._redis.lpop(DLQ_KEY)  # type: ignore[union-attr]
-            if raw is None:
-                break
-            action: dict[str, Any] = json.loads(
-                raw,  # type: ignore[arg-type]
+        for _ in range(_REPLAY_ATTEMPTS):
+            raws: list[Any] = []
+            if max_items > 0:
+                raws = self._redis.lrange(DLQ_KEY, 0, max_items - 1)  # type: ignore[assignment]
+            if not raws:
+                logger.info("Replayed %d items from DLQ", 0)
+                return 0
+            replay: list[Any] = []
+            kept: list[Any] = []
+            for raw in raws:
+                try:
+                    action = orjson.loads(raw)
+                except orjson.JSONDecodeError:
+                    kept.append(raw)
+                    continue
+                if not isinstance(action, dict):
+                    kept.append(raw)
+                    continue
+                if action.get("_retry_count"):
+                    action["_retry_count"] = 0
+                    raw = orjson.dumps(action)
+                replay.append(raw)
+            moved = self._replay_script(
+                keys=[DLQ_KEY, QUEUE_NAME],
+                args=[len(raws), len(replay), *raws, *replay, *kept],
             )
-            action["_retry_count"] = 0
-            self._redis.rpush(
-                QUEUE_NAME,
-                json.dumps(action),
-            )  # type: ignore[union-attr]
-            replayed += 1
-        logger.info("Replayed %d items from DLQ", replayed)
-        return replayed
+            if int(moved):
+                if kept:
+                    logger.warning("Kept %d undecodable items in DLQ", len(kept))
+                logger.info("Replayed %d items from DLQ", len(replay))
+                return len(replay)
+        logger.warning("DLQ head kept changing; replayed nothing")
+        return 0
 
     # -- execute ------------------------------------------------------------
 
@@ -356,72 +489,99 @@ class Worker:
         )
         aggregate_id = str(aggregate_id)
 
-        adapter = self._adapters.get(action_type)
-        if not adapter:
+        execute = self._dispatch.get(action_type)
+        if execute is None:
             logger.warning("No adapter for action type: %s", action_type)
-            self._emit(
-                aggregate_id,
-                "action_failed",
-                {**action, "reason": "no_adapter"},
-            )
+            self._emit(aggregate_id, "action_failed", action, reason="no_adapter")
             return None
 
         # -- Compliance rails --
         block_reason = self._apply_rails(action)
         if block_reason:
-            logger.info(
-                "Action blocked (%s): %s patient=%s",
-                block_reason,
-                action_type,
-                action.get("patient_id", "?"),
-            )
-            self._emit(
-                aggregate_id,
-                "action_blocked",
-                {**action, "reason": block_reason},
-            )
+            if block_reason == "duplicate_action":
+                logger.info(
+                    "Action deduplicated: %s channel=%s",
+                    aggregate_id,
+                    action.get("channel", "sms"),
+                )
+            else:
+                logger.info(
+                    "Action blocked (%s): %s patient=%s",
+                    block_reason,
+                    action_type,
+                    action.get("patient_id", "?"),
+                )
+            self._emit(aggregate_id, "action_blocked", action, reason=block_reason)
             return {"blocked": True, "reason": block_reason}
 
-        # -- Dedup per appointment+channel (after rails, before adapter) --
-        dedup_reason = _check_dedup(
-            action,
-            self._redis,
-            self._dedup_ttl,
-        )
-        if dedup_reason:
-            logger.info(
-                "Action deduplicated: %s channel=%s",
-                aggregate_id,
-                action.get("channel", "sms"),
-            )
-            self._emit(
-                aggregate_id,
-                "action_blocked",
-                {**action, "reason": dedup_reason},
-            )
-            return {"blocked": True, "reason": dedup_reason}
-
         # -- Execute adapter --
         try:
-            result = adapter.execute(action)
-            self._emit(
-                aggregate_id,
-                "action_executed",
-                {**action, **result},
-            )
+            result = execute(action)
+            self._emit(aggregate_id, "action_executed", action, **result)
             logger.info("Executed action: %s", action_type)
             return result
         except Exception:
             logger.exception("Adapter failed for %s", action_type)
-            self._emit(
-                aggregate_id,
-                "action_failed",
-                {**action, "reason": "adapter_error"},
-            )
+            self._emit(aggregate_id, "action_failed", action, reason="adapter_error")
             # Schedule retry instead of silently dropping
             self._schedule_retry(action, aggregate_id)
             return None
 
+    def _process_raw(self, raw: Any) -> None:
+        """Decode and execute one dequeued item; failures never escape.
+
+        An undecodable item is dead-lettered unchanged. An action that
+        raises outside its adapter (a rail lookup, a consent store) goes
+        through the usual retry/DLQ path.
+        """
+        try:
+            action = orjson.loads(raw)
+            if not isinstance(action, dict):
+                raise TypeError(f"expected an object, got {type(action).__name__}")
+        except (orjson.JSONDecodeError, TypeError):
+            logger.exception("Malformed action, dead-lettering it as-is")
+            self._redis.rpush(DLQ_KEY, raw)  # type: ignore[union-attr]
+            return
+        try:
+            self._execute(action)
+        except Exception:
+            aggregate_id = str(action.get("appointment_id") or action.get("pr_number", "unknown"))
+            logger.exception("Worker failed on action for %s", aggregate_id)
+            self._emit(aggregate_id, "action_failed", action, reason="worker_error")
+            self._schedule_retry(action, aggregate_id)
+
+    def _requeue(self, raws: Sequence[Any]) -> None:
+        """Put unprocessed *raws* back at the head of the queue, in order."""
+        try:
+            self._redis.lpush(QUEUE_NAME, *reversed(raws))  # type: ignore[union-attr]
+        except Exception:
+            logger.exception("Could not requeue %d unprocessed actions", len(raws))
+        else:
+            logger.warning("Requeued %d unprocessed actions", len(raws))
+
+    def _process_concurrently(self, pool: ThreadPoolExecutor, batch: list[Any]) -> None:
+        """Run *batch* on *pool*, handling each action as it completes.
+
+        A failure that escapes :meth:`_process_raw` (Redis gone, loop
+        interrupted) is re-raised once every started action has finished;
+        the items that failed or never started are requeued first.
+        """
+        futures = [pool.submit(self._process_raw, raw) for raw in batch]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            unfinished = [
+                raw
+                for raw, future in zip(batch, futures, strict=True)
+                if future.cancelled() or future.exception() is not None
+            ]
+            if unfinished:
+                self._requeue(unfinished)
+
     # -- public loop --------------------------------------------------------
 
     def run_once(self) -> dict[str, Any] | None:
@@ -430,31 +590,70 @@ class Worker:
         if raw is None:
             return None
 
-        action: dict[str, Any] = json.loads(raw)  # type: ignore[arg-type]
+        action: dict[str, Any] = orjson.loads(raw)  # type: ignore[arg-type]
         self._execute(action)
+        self._flush_events()
         return action
 
     def run_loop(self, timeout: float = 5.0) -> None:
         """Blocking loop — dequeue actions until stopped.
 
-        Also checks the retry ZSET each iteration.
+        Each iteration promotes due retries once, then takes up to
+        ``_POP_BATCH`` actions with a single ``LPOP key count`` (Redis
+        6.2+). Only an empty queue falls back to ``BLPOP``, which waits up
+        to *timeout* seconds for the next action. Audit events are written
+        after each batch, and once more if the loop exits.
+
+        A malformed item is dead-lettered and an action that fails goes to
+        retry, so one bad item never costs the rest of its batch. If the
+        loop itself is interrupted mid-batch, the unprocessed remainder is
+        pushed back to the head of the queue.
+
+        With ``concurrency > 1`` the actions of a batch run on a thread
+        pool, so slow adapters (SMS, HTTP) overlap instead of queueing;
+        the next batch is only taken once the current one has finished.
         """
         logger.info(
-            "Worker started, listening on queue: %s",
+            "Worker started, listening on queue: %s (concurrency=%d)",
             QUEUE_NAME,
+            self._concurrency,
         )
-        while True:
-            # Promote due retries before blocking
-            self.process_retries()
-
-            result = self._redis.blpop(
-                [QUEUE_NAME],
-                timeout=int(timeout),
-            )
-            if result is None:
-                continue
-            _, raw = result  # type: ignore[misc]
-            action: dict[str, Any] = json.loads(
-                raw,  # type: ignore[arg-type]
-            )
-            self._execute(action)
+        pool = ThreadPoolExecutor(self._concurrency) if self._concurrency > 1 else None
+        try:
+            while True:
+                # Promote due retries before blocking
+                self.process_retries()
+
+                # Drain up to a batch per round-trip; block only when empty.
+                batch: list[Any] | None = self._redis.lpop(
+                    QUEUE_NAME,
+                    _POP_BATCH,
+                )  # type: ignore[assignment]
+                if not batch:
+                    result = self._redis.blpop(
+                        [QUEUE_NAME],
+                        timeout=int(timeout),
+                    )
+                    if result is None:
+                        continue
+                    batch = [result[1]]  # type: ignore[index]
+                # Items leave `pending` once processed; whatever is left if
+                # the loop is torn down mid-batch goes back on the queue.
+                pending = deque(batch)
+                try:
+                    if pool is None or len(batch) == 1:
+                        while pending:
+                            self._process_raw(pending[0])
+                            pending.popleft()
+                    else:
+                        pending.clear()
+                        self._process_concurrently(pool, batch)
+                finally:
+                    if pending:
+                        self._requeue(pending)
+                # Write this batch's audit events before blocking again
+                self._flush_events()
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+            self._flush_events()
@@ -13,6 +13,7 @@ This makes CI work whether the gitops-config repo is cloned alongside
 
 from __future__ import annotations
 
+import functools
 import json
 from pathlib import Path
 from typing import Any
@@ -27,7 +28,8 @@ _VENDORED_GITOPS = _REPO_ROOT / "specs" / "vendored" / "gitops"
 _LOCAL_SPECS = _REPO_ROOT / "specs" / "contracts"
 
 
-def _load_schema(name: str, search_paths: list[Path]) -> dict[str, Any]:
+@functools.cache
+def _load_schema(name: str, search_paths: tuple[Path, ...]) -> dict[str, Any]:
     for base in search_paths:
         candidate = base / name
         if candidate.is_file():
@@ -51,30 +53,30 @@ def _load_schema(name: str, search_paths: list[Path]) -> dict[str, Any]:
 # ── Fixtures ─────────────────────────────────────────────────────
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def gitops_execution_plan_schema() -> dict[str, Any]:
     """El execution_plan schema fuente de verdad (clinic-gitops-config en ./_deps)."""
     # Prioridad: _deps/clinic-gitops-config/specs
     deps_path = _REPO_ROOT / "_deps" / "clinic-gitops-config" / "specs"
     return _load_schema(
         "execution_plan.schema.json",
-        [deps_path, _SIBLING_GITOPS, _VENDORED_GITOPS],
+        (deps_path, _SIBLING_GITOPS, _VENDORED_GITOPS),
     )
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def gitops_template_schema() -> dict[str, Any]:
     """The template schema as defined in clinic-gitops-config."""
     return _load_schema(
         "template.schema.json",
-        [_SIBLING_GITOPS, _VENDORED_GITOPS],
+        (_SIBLING_GITOPS, _VENDORED_GITOPS),
     )
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def local_proposal_schema() -> dict[str, Any]:
     """The proposal schema defined in this repo (cacp)."""
     return _load_schema(
         "proposal.schema.json",
-        [_LOCAL_SPECS],
+        (_LOCAL_SPECS,),
     )
@@ -20,9 +20,14 @@ def _load_error_schema() -> dict[str, Any]:
     return json.loads(schema_path.read_text(encoding="utf-8"))  # type: ignore[no-any-return]
 
 
+# Checked and compiled once for the module; every test validates against it.
+_ERROR_SCHEMA = _load_error_schema()
+jsonschema.Draft202012Validator.check_schema(_ERROR_SCHEMA)
+_ERROR_VALIDATOR = jsonschema.Draft202012Validator(_ERROR_SCHEMA)
+
+
 @pytest.mark.anyio
 async def test_422_validation_error_conforms_local_schema() -> None:
-    schema = _load_error_schema()
     app = create_app()
 
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
@@ -30,12 +35,11 @@ async def test_422_validation_error_conforms_local_schema() -> None:
 
     assert resp.status_code == 422
     payload = resp.json()
-    jsonschema.validate(instance=payload, schema=schema)
+    _ERROR_VALIDATOR.validate(payload)
 
 
 @pytest.mark.anyio
 async def test_404_http_error_conforms_local_schema() -> None:
-    schema = _load_error_schema()
     app = create_app()
 
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
@@ -43,12 +47,11 @@ async def test_404_http_error_conforms_local_schema() -> None:
 
     assert resp.status_code == 404
     payload = resp.json()
-    jsonschema.validate(instance=payload, schema=schema)
+    _ERROR_VALIDATOR.validate(payload)
 
 
 @pytest.mark.anyio
 async def test_500_unhandled_error_conforms_local_schema() -> None:
-    schema = _load_error_schema()
     app = create_app()
 
     @app.get("/__contract_boom")
@@ -61,12 +64,11 @@ async def test_500_unhandled_error_conforms_local_schema() -> None:
 
     assert resp.status_code == 500
     payload = resp.json()
-    jsonschema.validate(instance=payload, schema=schema)
+    _ERROR_VALIDATOR.validate(payload)
 
 
 @pytest.mark.anyio
 async def test_github_invalid_signature_conforms_local_schema() -> None:
-    schema = _load_error_schema()
     app = create_app()
     app.state.settings = Settings(github_webhook_secret="test-webhook-secret")
 
@@ -84,12 +86,11 @@ async def test_github_invalid_signature_conforms_local_schema() -> None:
     assert resp.status_code == 401
     payload = resp.json()
     assert payload["error_code"] == "SIGNATURE_INVALID"
-    jsonschema.validate(instance=payload, schema=schema)
+    _ERROR_VALIDATOR.validate(payload)
 
 
 @pytest.mark.anyio
 async def test_twilio_invalid_signature_conforms_local_schema() -> None:
-    schema = _load_error_schema()
     app = create_app()
     app.state.settings = Settings(twilio_auth_token="test-twilio-token")
 
@@ -103,4 +104,4 @@ async def test_twilio_invalid_signature_conforms_local_schema() -> None:
     assert resp.status_code == 401
     payload = resp.json()
     assert payload["error_code"] == "SIGNATURE_INVALID"
-    jsonschema.validate(instance=payload, schema=schema)
+    _ERROR_VALIDATOR.validate(payload)
@@ -15,7 +15,7 @@ import pytest
 from httpx import ASGITransport, AsyncClient
 
 from cacp.api.app import create_app
-from cacp.settings import Settings
+from cacp.settings import Settings, get_settings
 from cacp.storage.event_store import InMemoryEventStore
 
 # ── Deterministic settings (no external deps) ────────────────────
@@ -49,6 +49,7 @@ async def client() -> AsyncClient:  # type: ignore[misc]
     os.environ.setdefault("CACP_HMAC_SECRET", "integration-test-secret-do-not-use")
     os.environ.setdefault("CACP_GITHUB_TOKEN", "")
     os.environ.setdefault("CACP_OPA_URL", "")
+    get_settings.cache_clear()
 
     app = create_app()
     transport = ASGITransport(app=app)  # type: ignore[arg-type]
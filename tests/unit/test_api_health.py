@@ -16,3 +16,22 @@ async def test_health_returns_ok() -> None:
     assert resp.status_code == 200
     data = resp.json()
     assert data["status"] == "ok"
+
+
+@pytest.mark.anyio()
+async def test_metrics_exposition_format() -> None:
+    from cacp.api.routes import health
+
+    health.record_action_sent("sms")
+    health.record_sms_delivery("delivered")
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert body.startswith("# HELP cacp_up Control plane is up\n")
+    assert "# TYPE cacp_actions_sent_total counter\n" in body
+    assert 'cacp_actions_sent_total{channel="sms"} ' in body
+    assert 'cacp_sms_delivery_total{status="delivered"} ' in body
+    assert body.endswith("\n")
@@ -2,9 +2,41 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 import pytest
 
 from cacp.orchestration.agents.compliance_agent import ComplianceAgent
+from cacp.policy.opa_client import OPABatchUnsupportedError, OPAError, OPAResult
+
+
+class _FakeOPA:
+    """Decides by action type; ``boom`` simulates OPA being unreachable."""
+
+    def __init__(self, *, batch: bool = True) -> None:
+        self.batch = batch
+        self.calls = 0
+
+    @staticmethod
+    def _decide(action: str) -> OPAResult:
+        if action == "blocked":
+            return OPAResult(decision="DENY", violations=["Blocked"])
+        return OPAResult(decision="ALLOW", violations=[])
+
+    async def evaluate(self, input_data: dict[str, Any]) -> OPAResult:
+        self.calls += 1
+        if input_data["action"] == "boom":
+            raise OPAError("down")
+        return self._decide(input_data["action"])
+
+    async def evaluate_batch(self, batch_input: dict[str, Any]) -> list[OPAResult]:
+        self.calls += 1
+        if not self.batch:
+            raise OPABatchUnsupportedError("undefined")
+        actions = [a["action"] for a in batch_input["actions"]]
+        if "boom" in actions:
+            raise OPAError("down")
+        return [self._decide(a) for a in actions]
 
 
 class TestComplianceAgent:
@@ -45,3 +77,46 @@ class TestComplianceAgent:
             clinic_profile=self.clinic_profile,
         )
         assert result.compliant
+
+    @pytest.mark.anyio()
+    async def test_opa_batch_is_one_query(self) -> None:
+        opa = _FakeOPA()
+        agent = ComplianceAgent(opa_client=opa)  # type: ignore[arg-type]
+        result = await agent.validate(
+            actions=[
+                {"action_type": "send_reminder", "channel": "sms"},
+                {"action_type": "blocked", "channel": "sms"},
+            ],
+            role="agent",
+            mode="automated",
+            clinic_profile=self.clinic_profile,
+        )
+        assert opa.calls == 1
+        assert result.violations == ["Blocked"]
+
+    @pytest.mark.anyio()
+    async def test_opa_per_action_fallback_keeps_order(self) -> None:
+        opa = _FakeOPA(batch=False)
+        agent = ComplianceAgent(opa_client=opa)  # type: ignore[arg-type]
+        actions = [
+            {"action_type": "blocked", "channel": "sms"},
+            {"action_type": "send_reminder", "channel": "sms"},
+            {"action_type": "boom", "channel": "sms"},
+        ]
+        result = await agent.validate(
+            actions=actions,
+            role="agent",
+            mode="automated",
+            clinic_profile=self.clinic_profile,
+        )
+        assert opa.calls == 4  # failed batch probe + one per action
+        assert result.violations == ["Blocked", "OPA_Unavailable"]
+
+        # The batch rule is not retried once known to be missing.
+        await agent.validate(
+            actions=actions[:1],
+            role="agent",
+            mode="automated",
+            clinic_profile=self.clinic_profile,
+        )
+        assert opa.calls == 5
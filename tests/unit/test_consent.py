@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import hashlib
+
 from cacp.consent import InMemoryConsentStore, hash_pii
 
 
@@ -15,6 +17,11 @@ class TestHashPii:
     def test_length_16(self) -> None:
         assert len(hash_pii("anything")) == 16
 
+    def test_matches_truncated_hexdigest(self) -> None:
+        # Stored hashes predate the digest()-based implementation.
+        expected = hashlib.sha256(b"+34600000000").hexdigest()[:16]
+        assert hash_pii("+34600000000") == expected
+
 
 class TestInMemoryConsentStore:
     def setup_method(self) -> None:
@@ -65,3 +72,26 @@ class TestInMemoryConsentStore:
         }
         self.store.load_from_appointment(appointment)
         assert not self.store.has_consent("PAT-002", "sms")
+
+    def test_colon_in_patient_id_does_not_collide(self) -> None:
+        self.store.grant("PAT:sms", "x")
+        assert not self.store.has_consent("PAT", "sms:x")
+
+    def test_load_from_appointment_uses_batch_timestamp(self) -> None:
+        now = 1767225600  # 2026-01-01T00:00:00Z
+        appointment = {
+            "patient_id": "PAT-003",
+            "consent_given": True,
+            "patient_phone": "+34600000000",
+            "patient_whatsapp": True,
+        }
+        self.store.load_from_appointment(appointment, now=now)
+        assert self.store._records["PAT-003", "sms"].granted_at == now
+        assert self.store._records["PAT-003", "whatsapp"].granted_at == now
+
+    def test_timestamps_format_lazily(self) -> None:
+        self.store.grant("PAT-004", "sms", now=1767225600)
+        self.store.revoke("PAT-004", "sms", now=1767225660)
+        record = self.store._records["PAT-004", "sms"]
+        assert record.granted_at_iso == "2026-01-01T00:00:00+00:00"
+        assert record.revoked_at_iso == "2026-01-01T00:01:00+00:00"
@@ -7,6 +7,7 @@ from typing import Any
 from unittest.mock import MagicMock, patch
 
 from cacp.consent import InMemoryConsentStore
+from cacp.queue.enqueue import QUEUE_NAME
 from cacp.storage.event_store import InMemoryEventStore
 from cacp.workers.worker import DLQ_KEY, RETRY_ZSET, Worker
 
@@ -18,14 +19,8 @@ def _mock_redis(
     mock = MagicMock()
     encoded = [json.dumps(item) for item in queue_items]
     mock.lpop.side_effect = encoded + [None]
-    # Rate-limit pipeline stub
-    pipe_mock = MagicMock()
-    pipe_mock.execute.return_value = [None, 0, None, None]
-    mock.pipeline.return_value = pipe_mock
-    # Dedup stub — acquire by default
-    mock.set.return_value = True
-    # Retry ZSET — empty by default
-    mock.zrangebyscore.return_value = []
+    # Rate-limit + dedup script: 0 = allowed
+    mock.register_script.return_value.return_value = 0
     # DLQ
     mock.llen.return_value = 0
     return mock
@@ -53,7 +48,7 @@ class TestDedup:
         event_store = InMemoryEventStore()
         redis_mock = _mock_redis([_action()])
         # Simulate dedup key already exists
-        redis_mock.set.return_value = False
+        redis_mock.register_script.return_value.return_value = 2
 
         with patch("cacp.workers.worker.datetime") as mock_dt:
             mock_now = MagicMock()
@@ -80,7 +75,6 @@ class TestDedup:
         store.grant("PAT-001", "sms")
         event_store = InMemoryEventStore()
         redis_mock = _mock_redis([_action()])
-        redis_mock.set.return_value = True  # First time → acquired
 
         with patch("cacp.workers.worker.datetime") as mock_dt:
             mock_now = MagicMock()
@@ -98,11 +92,21 @@ class TestDedup:
         assert result is not None
         events = event_store.list_events(aggregate_id="APT-100")
         assert any(e["event_type"] == "action_executed" for e in events)
-        # Verify redis.set was called with nx and ex
-        redis_mock.set.assert_called_once()
-        call_kwargs = redis_mock.set.call_args
-        assert call_kwargs[1]["nx"] is True
-        assert call_kwargs[1]["ex"] > 0
+        # Verify the script got the dedup key and a positive TTL
+        script = redis_mock.register_script.return_value
+        script.assert_called_once()
+        keys, args = script.call_args.kwargs["keys"], script.call_args.kwargs["args"]
+        assert keys[1] == "cacp:sent:APT-100:sms"
+        assert args[4] > 0
+
+    def test_rails_script_skipped_without_ids(self) -> None:
+        redis_mock = _mock_redis([{"action_type": "execute_plan", "pr_number": 7}])
+
+        with patch("cacp.workers.worker.datetime") as mock_dt:
+            mock_dt.now.return_value.hour = 14
+            Worker(redis_client=redis_mock).run_once()
+
+        redis_mock.register_script.return_value.assert_not_called()
 
 
 class TestRetryBackoff:
@@ -169,20 +173,20 @@ class TestProcessRetries:
 
     def test_process_retries_moves_items(self) -> None:
         redis_mock = MagicMock()
-        action_json = json.dumps(_action())
-        redis_mock.zrangebyscore.return_value = [action_json]
-        redis_mock.zrem.return_value = 1
-        redis_mock.rpush.return_value = 1
+        redis_mock.register_script.return_value.return_value = 1
 
         worker = Worker(redis_client=redis_mock)
         moved = worker.process_retries()
 
         assert moved == 1
-        redis_mock.zrem.assert_called_once_with(RETRY_ZSET, action_json)
+        script = redis_mock.register_script.return_value
+        assert script.call_args.kwargs["keys"] == [RETRY_ZSET, QUEUE_NAME]
+        redis_mock.zrem.assert_not_called()
+        redis_mock.rpush.assert_not_called()
 
     def test_process_retries_empty(self) -> None:
         redis_mock = MagicMock()
-        redis_mock.zrangebyscore.return_value = []
+        redis_mock.register_script.return_value.return_value = 0
 
         worker = Worker(redis_client=redis_mock)
         moved = worker.process_retries()
@@ -192,25 +196,68 @@ class TestProcessRetries:
 class TestReplayDLQ:
     """DLQ replay moves items back to main queue with reset retry count."""
 
+    def _redis(self, dlq: list[Any]) -> MagicMock:
+        redis_mock = MagicMock()
+        redis_mock.lrange.return_value = dlq
+        # replay script: 1 = head still as peeked, moved
+        redis_mock.register_script.return_value.return_value = 1
+        return redis_mock
+
     def test_replay_resets_retry_count(self) -> None:
         action = _action()
         action["_retry_count"] = 3
-        redis_mock = MagicMock()
-        redis_mock.lpop.side_effect = [json.dumps(action), None]
+        redis_mock = self._redis([json.dumps(action)])
 
         worker = Worker(redis_client=redis_mock)
         replayed = worker.replay_dlq(max_items=10)
 
         assert replayed == 1
-        # Check the replayed action has _retry_count=0
-        rpush_call = redis_mock.rpush.call_args
-        replayed_action = json.loads(rpush_call[0][1])
-        assert replayed_action["_retry_count"] == 0
+        redis_mock.lrange.assert_called_once_with(DLQ_KEY, 0, 9)
+        script = redis_mock.register_script.return_value
+        assert script.call_args.kwargs["keys"] == [DLQ_KEY, QUEUE_NAME]
+        n, n_replay, _peeked, replayed_raw = script.call_args.kwargs["args"]
+        assert (n, n_replay) == (1, 1)
+        assert json.loads(replayed_raw)["_retry_count"] == 0
+        redis_mock.lpop.assert_not_called()
+
+    def test_replay_moves_batch_in_one_call(self) -> None:
+        dead = json.dumps({**_action(), "_retry_count": 4}).encode()
+        already_reset = json.dumps({**_action("APT-200"), "_retry_count": 0}).encode()
+        redis_mock = self._redis([dead, already_reset])
+
+        replayed = Worker(redis_client=redis_mock).replay_dlq()
+
+        assert replayed == 2
+        script = redis_mock.register_script.return_value
+        script.assert_called_once()
+        args = script.call_args.kwargs["args"]
+        assert args[:4] == [2, 2, dead, already_reset]
+        assert json.loads(args[4])["_retry_count"] == 0
+        assert args[5] is already_reset
+
+    def test_replay_keeps_corrupt_entry_in_dlq(self) -> None:
+        good = json.dumps({**_action(), "_retry_count": 0})
+        redis_mock = self._redis([good, "{corrupt", good])
+
+        replayed = Worker(redis_client=redis_mock).replay_dlq()
+
+        assert replayed == 2
+        args = redis_mock.register_script.return_value.call_args.kwargs["args"]
+        # all three leave the DLQ head; the corrupt one goes back to its tail
+        assert args == [3, 2, good, "{corrupt", good, good, good, "{corrupt"]
+
+    def test_replay_retries_when_head_changed(self) -> None:
+        item = json.dumps(_action())
+        redis_mock = self._redis([item])
+        redis_mock.register_script.return_value.side_effect = [0, 1]
+
+        assert Worker(redis_client=redis_mock).replay_dlq() == 1
+        assert redis_mock.lrange.call_count == 2
 
     def test_replay_empty_dlq(self) -> None:
-        redis_mock = MagicMock()
-        redis_mock.lpop.return_value = None
+        redis_mock = self._redis([])
 
         worker = Worker(redis_client=redis_mock)
         replayed = worker.replay_dlq()
         assert replayed == 0
+        redis_mock.register_script.return_value.assert_not_called()
@@ -0,0 +1,37 @@
+"""Tests for queue enqueue helpers."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import orjson
+
+from cacp.queue.enqueue import QUEUE_NAME, enqueue_action_once, enqueue_actions
+
+
+def test_enqueue_actions_single_rpush() -> None:
+    client = MagicMock()
+    client.rpush.return_value = 3
+    actions = [{"action_type": "send_sms", "i": i} for i in range(3)]
+
+    assert enqueue_actions(client, actions) == 3
+    client.rpush.assert_called_once_with(QUEUE_NAME, *(orjson.dumps(a) for a in actions))
+
+
+def test_enqueue_actions_empty_skips_push() -> None:
+    client = MagicMock()
+    client.llen.return_value = 5
+
+    assert enqueue_actions(client, []) == 5
+    client.rpush.assert_not_called()
+
+
+def test_enqueue_action_once_registers_script_once_per_client() -> None:
+    client = MagicMock()
+    client.register_script.return_value.return_value = 1
+
+    for i in range(3):
+        assert enqueue_action_once(client, f"idem:{i}", 60, {"i": i}) == 1
+
+    client.register_script.assert_called_once()
+    assert client.register_script.return_value.call_count == 3
@@ -52,3 +52,63 @@ async def test_unhandled_exception_returns_internal_error_payload() -> None:
     assert body["error_code"] == "INTERNAL_ERROR"
     assert body["message"] == "Internal server error"
     assert body["request_id"]
+
+
+@pytest.mark.anyio()
+async def test_coded_exception_uses_prerendered_payload() -> None:
+    from cacp.api.errors import RateLimitExceeded
+
+    app = create_app()
+
+    @app.get("/__limited")
+    async def limited() -> dict[str, str]:
+        raise RateLimitExceeded()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/__limited", headers={"x-correlation-id": 'cid-"quoted"'})
+
+    assert resp.status_code == 429
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json() == {
+        "error_code": "RATE_LIMIT_EXCEEDED",
+        "message": "Rate limit exceeded",
+        "request_id": 'cid-"quoted"',
+    }
+
+
+@pytest.mark.anyio()
+async def test_unhandled_exception_keeps_incoming_correlation_id() -> None:
+    from cacp.logging import correlation_id_var
+
+    app = create_app()
+
+    @app.get("/__boom")
+    async def boom() -> dict[str, str]:
+        raise RuntimeError("boom")
+
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/__boom", headers={"x-correlation-id": "cid-500"})
+
+    assert resp.status_code == 500
+    assert resp.json()["request_id"] == "cid-500"
+    assert correlation_id_var.get() == ""
+
+
+@pytest.mark.anyio()
+async def test_untyped_http_exception_maps_status_to_error_code() -> None:
+    from fastapi import HTTPException
+
+    app = create_app()
+
+    @app.get("/__forbidden")
+    async def forbidden() -> dict[str, str]:
+        raise HTTPException(status_code=403, detail="nope")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/__forbidden")
+
+    assert resp.status_code == 403
+    body = resp.json()
+    assert body["error_code"] == "POLICY_VIOLATION"
+    assert body["message"] == "nope"
@@ -2,6 +2,13 @@
 
 from __future__ import annotations
 
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+from uuid import UUID
+
+import pytest
+
+from cacp.storage.event_store import _INSERT_ONE_SQL, EventRecord, PostgresEventStore
 from cacp.storage.projections import NoShowProjection
 
 
@@ -36,3 +43,213 @@ class TestNoShowProjection:
         result = proj.project(events)
         assert result["confirmed"] == 1
         assert result["rescheduled"] == 1
+
+    def test_ignores_unknown_and_untyped_events(self) -> None:
+        events = [{"event_type": "appointment_ingested"}, {"event_type": "risk_scored"}, {}]
+        result = NoShowProjection().project(events)
+        assert result["total_appointments"] == 1
+        assert result["no_shows"] == 0
+
+    def test_project_types_matches_project(self) -> None:
+        types = ["appointment_ingested"] * 3 + ["no_show_recorded", "appointment_confirmed"]
+        proj = NoShowProjection()
+        expected = proj.project([{"event_type": t} for t in types])
+        assert proj.project_types(iter(types)) == expected
+
+
+class TestPostgresAppendMany:
+    def _store(self) -> tuple[PostgresEventStore, MagicMock, MagicMock]:
+        pool = MagicMock()
+        conn = pool.connection.return_value.__enter__.return_value
+        return PostgresEventStore(pool), pool, conn
+
+    def test_one_statement_one_connection(self) -> None:
+        store, pool, conn = self._store()
+        records: list[EventRecord] = [
+            ("AGG-1", "evt_a", {"n": 1}, "system", None),
+            ("AGG-2", "evt_b", {"n": 2}, "bot", "key-2"),
+        ]
+        ids = store.append_many(records)
+
+        cur = conn.cursor.return_value.__enter__.return_value
+        # the insert, then one lookup of the keyed rows' stored ids
+        assert cur.execute.call_count == 2
+        params = cur.execute.call_args_list[0].args[1]
+        assert params[0] == ids
+        assert params[1] == ["AGG-1", "AGG-2"]
+        assert [p.obj for p in params[3]] == [{"n": 1}, {"n": 2}]
+        assert params[5] == [None, "key-2"]
+        pool.connection.assert_called_once()
+
+    def test_conflicting_keys_report_stored_ids(self) -> None:
+        store, _pool, conn = self._store()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchall.return_value = [("key-1", UUID(int=5)), ("key-2", UUID(int=6))]
+        records: list[EventRecord] = [
+            ("AGG-1", "evt", {}, "system", "key-1"),
+            ("AGG-2", "evt", {}, "system", None),
+            ("AGG-3", "evt", {}, "system", "key-2"),
+        ]
+        ids = store.append_many(records)
+
+        sql, params = cur.execute.call_args.args
+        assert "ANY(%s)" in sql
+        assert sorted(params[0]) == ["key-1", "key-2"]
+        assert ids[0] == str(UUID(int=5))
+        assert ids[2] == str(UUID(int=6))
+        # unkeyed rows cannot conflict: the generated id stands
+        assert ids[1] == cur.execute.call_args_list[0].args[1][0][1]
+
+    def test_chunks_large_batches(self) -> None:
+        store, pool, conn = self._store()
+        records: list[EventRecord] = [("AGG", "evt", {}, "system", None)] * 12_000
+        assert len(store.append_many(records)) == 12_000
+
+        cur = conn.cursor.return_value.__enter__.return_value
+        assert [len(c.args[1][0]) for c in cur.execute.call_args_list] == [5000, 5000, 2000]
+        pool.connection.assert_called_once()
+
+    def test_append_uses_server_defaults(self) -> None:
+        store, _pool, conn = self._store()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchone.return_value = (UUID(int=7),)
+
+        eid = store.append("AGG-1", "evt", {}, idempotency_key="k")
+
+        sql, params = cur.execute.call_args.args
+        assert "RETURNING event_id" in sql
+        assert params[3:] == ("system", "k")
+        assert params[2].obj == {}
+        assert eid == str(UUID(int=7))
+
+    def test_append_duplicate_key_returns_existing_id(self) -> None:
+        store, _pool, conn = self._store()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchone.side_effect = [None, (UUID(int=9),)]
+
+        assert store.append("AGG-1", "evt", {}, idempotency_key="k") == str(UUID(int=9))
+        assert cur.execute.call_args.args[1] == ("k",)
+
+    def test_copy_events_small_batch_uses_insert(self) -> None:
+        store, pool, conn = self._store()
+        store.copy_events([("AGG", "evt", {}, "system", None)] * 100)
+
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.copy.assert_not_called()
+        cur.execute.assert_called_once()
+
+    def test_copy_events_large_batch_uses_binary_copy(self) -> None:
+        store, pool, conn = self._store()
+        records: list[EventRecord] = [("AGG", "evt", {"i": i}, "system", None) for i in range(101)]
+        ids = store.copy_events(records)
+
+        cur = conn.cursor.return_value.__enter__.return_value
+        assert "FORMAT BINARY" in cur.copy.call_args.args[0]
+        cp = cur.copy.return_value.__enter__.return_value
+        assert cp.write_row.call_count == 101
+        first = cp.write_row.call_args_list[0].args[0]
+        assert first[0] == ids[0]
+        assert isinstance(ids[0], str)
+        assert first[3].obj == {"i": 0}
+        # staging table, then the conflict-aware move into events
+        assert "ON CONFLICT (idempotency_key) DO NOTHING" in cur.execute.call_args.args[0]
+        pool.connection.assert_called_once()
+
+    def test_unit_of_work_commits_once(self) -> None:
+        store, pool, conn = self._store()
+        with store.unit_of_work() as uow:
+            for i in range(3):
+                uow.append("AGG", "evt", {"i": i})
+            with store.unit_of_work():
+                store.append("AGG", "evt", {"i": 3})
+
+        pool.connection.assert_called_once()
+        conn.pipeline.assert_not_called()
+        cur = conn.cursor.return_value.__enter__.return_value
+        assert [c.args[0] for c in cur.execute.call_args_list] == [_INSERT_ONE_SQL] * 4
+
+    def test_pipelined_append_shares_one_transaction(self) -> None:
+        store, pool, conn = self._store()
+        with store.pipelined_append():
+            for i in range(3):
+                store.append("AGG", "evt", {"i": i})
+
+        conn.pipeline.assert_called_once()
+        pool.connection.assert_called_once()
+        assert conn.cursor.return_value.__enter__.return_value.execute.call_count == 3
+
+    def test_pipelined_append_rolls_back_on_error(self) -> None:
+        store, pool, conn = self._store()
+        with pytest.raises(RuntimeError), store.pipelined_append():
+            store.append("AGG", "evt", {})
+            raise RuntimeError
+
+        # the pool's context manager sees the error and rolls back
+        exit_args = pool.connection.return_value.__exit__.call_args.args
+        assert exit_args[0] is RuntimeError
+        store.append("AGG", "evt", {})
+        assert pool.connection.call_count == 2
+
+    def test_count_by_type_groups_in_database(self) -> None:
+        store, _pool, conn = self._store()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchall.return_value = [("appointment_ingested", 4), ("no_show_recorded", 1)]
+
+        counts = store.count_by_type(aggregate_id="AGG-1")
+
+        sql, params = cur.execute.call_args.args
+        assert "GROUP BY event_type" in sql
+        assert params == ["AGG-1"]
+        assert NoShowProjection.project_from_counts(counts)["no_show_rate"] == 0.25
+
+    def test_count_by_type_naive_since_is_utc(self) -> None:
+        store, _pool, conn = self._store()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchall.return_value = []
+
+        store.count_by_type(since=datetime(2026, 3, 1, 12, 0))
+
+        assert cur.execute.call_args.args[1] == [datetime(2026, 3, 1, 12, 0, tzinfo=UTC)]
+
+    def test_concurrent_streams_on_held_connection_use_distinct_cursors(self) -> None:
+        store, pool, conn = self._store()
+        cur = conn.cursor.return_value.__enter__.return_value
+        row = (UUID(int=1), "AGG-1", "appointment_ingested", {}, "system", None)
+        cur.__iter__.side_effect = lambda: iter([row, row])
+
+        with store.unit_of_work():
+            pairs = list(zip(store.iter_events(), store.iter_events(), strict=True))
+
+        assert len(pairs) == 2
+        first, second = (c.kwargs["name"] for c in conn.cursor.call_args_list)
+        assert first != second
+        pool.connection.assert_called_once()
+
+    def test_list_events_uses_prepared_fixed_statement(self) -> None:
+        store, _pool, conn = self._store()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchall.return_value = []
+
+        store.list_events(event_type="no_show_recorded", limit=5)
+        store.list_events(event_type="appointment_ingested", limit=5)
+
+        first, second = cur.execute.call_args_list
+        assert first.args[0] is second.args[0]
+        assert "WHERE event_type = %s " in first.args[0]
+        assert "ORDER BY created_at DESC, id DESC" in first.args[0]
+        assert second.args[1] == ["appointment_ingested", 5]
+        assert second.kwargs == {"prepare": True}
+
+    def test_iter_events_streams_through_named_cursor(self) -> None:
+        store, _pool, conn = self._store()
+        cur = conn.cursor.return_value.__enter__.return_value
+        row = (UUID(int=1), "AGG-1", "appointment_ingested", {}, "system", None)
+        cur.__iter__.return_value = iter([row, row])
+
+        result = NoShowProjection().project(store.iter_events(aggregate_id="AGG-1"))
+
+        assert conn.cursor.call_args.kwargs["name"]
+        assert cur.itersize == 1000
+        assert cur.execute.call_args.args[0].endswith("ORDER BY created_at, id")
+        assert cur.execute.call_args.args[1] == ["AGG-1"]
+        assert result["total_appointments"] == 2
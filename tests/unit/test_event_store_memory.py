@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from datetime import UTC, datetime, timedelta, timezone
+
 from cacp.storage.event_store import InMemoryEventStore
 
 
@@ -57,6 +59,54 @@ class TestInMemoryEventStore:
         events = self.store.list_events(aggregate_id="AGG-1", limit=3)
         assert len(events) == 3
 
+    def test_list_limit_keeps_newest_first(self) -> None:
+        for i in range(10):
+            self.store.append(f"AGG-{i % 2}", "evt", {"i": i})
+
+        assert [e["payload"]["i"] for e in self.store.list_events(limit=3)] == [9, 8, 7]
+        newest_agg_0 = self.store.list_events(aggregate_id="AGG-0", limit=2)
+        assert [e["payload"]["i"] for e in newest_agg_0] == [8, 6]
+        assert self.store.list_events(limit=0) == []
+
+    def test_list_filters_by_aggregate_and_type(self) -> None:
+        for i in range(6):
+            self.store.append(f"AGG-{i % 2}", f"evt_{i % 3}", {"i": i})
+
+        events = self.store.list_events(aggregate_id="AGG-0", event_type="evt_1")
+        assert [e["payload"]["i"] for e in events] == [4]
+        assert self.store.list_events(aggregate_id="AGG-9", event_type="evt_1") == []
+        assert self.store.list_events(event_type="evt_9") == []
+
     def test_empty_store_returns_empty(self) -> None:
         events = self.store.list_events()
         assert events == []
+
+    def test_count_by_type(self) -> None:
+        self.store.append("AGG-1", "evt_a", {})
+        self.store.append("AGG-1", "evt_a", {})
+        self.store.append("AGG-2", "evt_b", {})
+
+        assert self.store.count_by_type() == {"evt_a": 2, "evt_b": 1}
+        assert self.store.count_by_type(aggregate_id="AGG-2") == {"evt_b": 1}
+        assert self.store.count_by_type(since=datetime.now(UTC) + timedelta(seconds=1)) == {}
+
+    def test_count_by_type_since_naive_or_other_zone(self) -> None:
+        self.store.append("AGG-1", "evt_a", {})
+
+        # naive datetimes are taken as UTC
+        assert self.store.count_by_type(since=datetime(2020, 1, 1)) == {"evt_a": 1}
+        later = (datetime.now(UTC) + timedelta(hours=1)).replace(tzinfo=None)
+        assert self.store.count_by_type(since=later) == {}
+        # an aware cutoff in another zone is converted, not compared as text
+        plus_two = timezone(timedelta(hours=2))
+        assert self.store.count_by_type(since=datetime.now(plus_two) - timedelta(minutes=1)) == {
+            "evt_a": 1
+        }
+
+    def test_iter_events_oldest_first(self) -> None:
+        self.store.append("AGG-1", "evt_a", {})
+        self.store.append("AGG-2", "evt_b", {})
+        self.store.append("AGG-1", "evt_c", {})
+
+        types = [e["event_type"] for e in self.store.iter_events(aggregate_id="AGG-1")]
+        assert types == ["evt_a", "evt_c"]
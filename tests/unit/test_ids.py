@@ -0,0 +1,19 @@
+"""Tests for the fast ID generator."""
+
+from __future__ import annotations
+
+import uuid
+
+from cacp.ids import new_id
+
+
+def test_new_id_is_canonical_uuid4() -> None:
+    value = new_id()
+    parsed = uuid.UUID(value)
+    assert str(parsed) == value
+    assert parsed.version == 4
+    assert parsed.variant == uuid.RFC_4122
+
+
+def test_new_id_is_unique() -> None:
+    assert len({new_id() for _ in range(10_000)}) == 10_000
@@ -0,0 +1,96 @@
+"""Tests for the background log writer and logger helpers."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import threading
+from typing import TYPE_CHECKING
+
+from cacp.logging import _AsyncWriter, _QueuedLogger, _write_stdout
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import pytest
+
+
+def _blocking_sink(
+    out: list[bytes], release: threading.Event
+) -> tuple[threading.Event, Callable[[bytes], None]]:
+    """Sink that holds the writer thread until *release*; inline writes pass."""
+    entered = threading.Event()
+
+    def write(data: bytes) -> None:
+        if threading.current_thread().name == "cacp-log-writer":
+            entered.set()
+            release.wait(5)
+        out.append(data)
+
+    return entered, write
+
+
+def test_close_flushes_queued_lines_in_order() -> None:
+    out: list[bytes] = []
+    writer = _AsyncWriter(out.append, batch_size=4)
+    logger = _QueuedLogger(writer)
+    for i in range(10):
+        logger.info(f'{{"event":"e{i}"}}')
+    writer.close()
+
+    lines = b"".join(out).splitlines()
+    assert lines == [f'{{"event":"e{i}"}}'.encode() for i in range(10)]
+    assert writer.dropped == 0
+
+
+def test_write_after_close_is_inline() -> None:
+    out: list[bytes] = []
+    writer = _AsyncWriter(out.append)
+    writer.close()
+    _QueuedLogger(writer).info(b"late")
+
+    assert out == [b"late\n"]
+
+
+def test_full_queue_writes_inline() -> None:
+    out: list[bytes] = []
+    release = threading.Event()
+    entered, sink = _blocking_sink(out, release)
+    writer = _AsyncWriter(sink, max_queued=1)
+
+    writer.write(b"a\n")
+    assert entered.wait(5)  # the thread holds "a"; the queue is empty again
+    writer.write(b"b\n")  # fills the queue
+    writer.write(b"c\n")  # full: written by the caller
+    assert out == [b"c\n"]
+
+    release.set()
+    writer.close()
+    assert b"".join(out) == b"c\na\nb\n"
+
+
+def test_close_counts_lines_it_could_not_flush(capsys: pytest.CaptureFixture[str]) -> None:
+    out: list[bytes] = []
+    release = threading.Event()
+    entered, sink = _blocking_sink(out, release)
+    writer = _AsyncWriter(sink)
+
+    writer.write(b"a\n")
+    assert entered.wait(5)
+    writer.write(b"b\n")
+    writer.write(b"c\n")
+    writer.close(timeout=0.05)
+    release.set()
+
+    assert writer.dropped == 2
+    assert "dropped 2 log lines" in capsys.readouterr().err
+
+
+def test_write_stdout_follows_redirection(capsys: pytest.CaptureFixture[str]) -> None:
+    _write_stdout(b"captured\n")
+    assert capsys.readouterr().out == "captured\n"
+
+    text = io.StringIO()
+    with contextlib.redirect_stdout(text):
+        _write_stdout(b"redirected\n")
+    assert text.getvalue() == "redirected\n"
@@ -50,3 +50,15 @@ class TestBuildExecutionPlan:
             environment="prod",
         )
         assert plan["environment"] == "prod"
+
+    def test_explicit_timestamp(self) -> None:
+        plan = build_execution_plan(
+            proposal_id="00000000-0000-0000-0000-000000000004",
+            clinic_id="CLINIC-D",
+            patient_id="PAT-004",
+            appointment_id="APT-400",
+            actions=[],
+            risk_level="low",
+            now_iso="2026-01-01T00:00:00+00:00",
+        )
+        assert plan["created_at"] == "2026-01-01T00:00:00+00:00"
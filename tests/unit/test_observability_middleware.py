@@ -0,0 +1,53 @@
+"""Tests for the pure-ASGI observability middleware."""
+
+from __future__ import annotations
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from cacp.api.app import create_app
+
+
+@pytest.mark.anyio()
+async def test_incoming_correlation_id_is_echoed() -> None:
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/does-not-exist", headers={"x-correlation-id": "cid-123"})
+
+    assert resp.headers["x-correlation-id"] == "cid-123"
+    assert resp.json()["request_id"] == "cid-123"
+
+
+@pytest.mark.anyio()
+async def test_duration_header_is_set() -> None:
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/demo/dental-roi", params={"citas": 10})
+
+    assert resp.headers["x-correlation-id"]
+    assert float(resp.headers["x-request-duration-ms"]) >= 0.0
+
+
+@pytest.mark.anyio()
+async def test_generated_correlation_id_is_32_hex_chars() -> None:
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/does-not-exist")
+
+    cid = resp.headers["x-correlation-id"]
+    assert len(cid) == 32
+    int(cid, 16)
+    assert resp.json()["request_id"] == cid
+
+
+@pytest.mark.anyio()
+async def test_probe_paths_skip_instrumentation() -> None:
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        health = await client.get("/health")
+        metrics = await client.get("/metrics")
+
+    for resp in (health, metrics):
+        assert resp.status_code == 200
+        assert "x-correlation-id" not in resp.headers
+        assert "x-request-duration-ms" not in resp.headers
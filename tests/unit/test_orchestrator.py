@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from unittest.mock import MagicMock
+
 import pytest
 
 from cacp.orchestration.orchestrator import Orchestrator
@@ -55,6 +57,7 @@ class TestOrchestrator:
                 "previous_no_shows": 1,
             }
         )
+        await self.orchestrator.flush_events()
         events = self.event_store.list_events(aggregate_id="APT-EVT-001")
         # list_events returns newest-first; reverse for chronological
         types = [e["event_type"] for e in reversed(events)]
@@ -111,3 +114,40 @@ class TestOrchestrator:
         for action in result.actions:
             assert "scheduled_at" in action
             assert action["scheduled_at"]  # non-empty
+
+    @pytest.mark.anyio()
+    async def test_in_memory_events_appended_inline(self) -> None:
+        await self.orchestrator.process_appointment(
+            {
+                "appointment_id": "APT-INL-001",
+                "patient_id": "PAT-001",
+                "clinic_id": "CLINIC-A",
+                "scheduled_at": "2026-03-18T10:00:00+00:00",
+            }
+        )
+        # No flush needed: nothing was queued for a writer task.
+        assert self.orchestrator._event_queue is None
+        assert len(self.event_store.list_events(aggregate_id="APT-INL-001")) == 4
+
+    @pytest.mark.anyio()
+    async def test_batch_capable_stores_written_by_writer_task(self) -> None:
+        store = MagicMock()
+        orch = Orchestrator(settings=self.settings, event_store=store)
+        await orch.process_appointment(
+            {
+                "appointment_id": "APT-BAT-001",
+                "patient_id": "PAT-001",
+                "clinic_id": "CLINIC-A",
+                "scheduled_at": "2026-03-18T10:00:00+00:00",
+            }
+        )
+        await orch.aclose()
+        written = [r[1] for call in store.append_many.call_args_list for r in call.args[0]]
+        assert written == [
+            "appointment_received",
+            "risk_scored",
+            "proposal_created",
+            "proposal_signed",
+        ]
+        store.append.assert_not_called()
+        assert orch._event_writer is None
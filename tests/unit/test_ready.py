@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from cacp import healthchecks
 from cacp.api.app import create_app
+from cacp.healthchecks import (
+    _get_opa_probe_client,
+    check_opa,
+    check_postgres,
+    check_redis,
+)
 from cacp.settings import Settings
 
 
@@ -108,3 +115,85 @@ async def test_ready_opa_down(app: object) -> None:
     body = resp.json()
     assert body["ready"] is False
     assert body["checks"]["opa"] is False
+
+
+# ── pooled postgres probe ───────────────────────────────
+
+
+@pytest.mark.anyio()
+async def test_ready_passes_pg_pool(app: object) -> None:
+    pool = object()
+    app.state.pg_pool = pool  # type: ignore[attr-defined]
+    with (
+        patch(
+            "cacp.api.routes.health.check_postgres", new_callable=AsyncMock, return_value=True
+        ) as pg,
+        patch("cacp.api.routes.health.check_redis", new_callable=AsyncMock, return_value=True),
+        patch("cacp.api.routes.health.check_opa", new_callable=AsyncMock, return_value=True),
+    ):
+        async with AsyncClient(
+            transport=ASGITransport(app=app),  # type: ignore[arg-type]
+            base_url="http://test",
+        ) as client:
+            resp = await client.get("/ready")
+
+    assert resp.status_code == 200
+    pg.assert_awaited_once_with("postgresql://test", pool)
+
+
+@pytest.mark.anyio()
+async def test_check_postgres_uses_pool_connection() -> None:
+    conn = MagicMock()
+    conn.execute = AsyncMock()
+    pool = MagicMock()
+    pool.connection.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.connection.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    assert await check_postgres("", pool) is True
+    conn.execute.assert_awaited_once_with("SELECT 1")
+
+
+@pytest.mark.anyio()
+async def test_check_opa_uses_shared_client() -> None:
+    client = MagicMock()
+    client.post = AsyncMock(return_value=MagicMock(status_code=200))
+
+    assert await check_opa("http://opa:8181", client) is True
+    client.post.assert_awaited_once()
+    assert client.post.await_args.args[0] == "http://opa:8181/v1/data/health"
+
+
+@pytest.mark.anyio()
+async def test_check_redis_reuses_client() -> None:
+    with patch("redis.asyncio.Redis.from_url") as from_url:
+        from_url.return_value.ping = AsyncMock(return_value=True)
+        assert await check_redis("redis://probe-reuse") is True
+        assert await check_redis("redis://probe-reuse") is True
+
+    from_url.assert_called_once()
+    assert from_url.return_value.ping.await_count == 2
+
+
+@pytest.mark.anyio()
+async def test_check_opa_without_client_reuses_probe_client() -> None:
+    ok = MagicMock(status_code=200)
+    with patch("httpx.AsyncClient.post", new_callable=AsyncMock, return_value=ok) as post:
+        assert await check_opa("http://opa:8181") is True
+        first = await _get_opa_probe_client()
+        assert await check_opa("http://opa:8181") is True
+
+    assert await _get_opa_probe_client() is first
+    assert post.await_count == 2
+
+
+@pytest.mark.anyio()
+async def test_probe_client_from_other_loop_is_closed() -> None:
+    stale = MagicMock()
+    stale.aclose = AsyncMock()
+    healthchecks._redis_clients["redis://stale-loop"] = (MagicMock(), stale)
+    with patch("redis.asyncio.Redis.from_url") as from_url:
+        from_url.return_value.ping = AsyncMock(return_value=True)
+        assert await check_redis("redis://stale-loop") is True
+
+    stale.aclose.assert_awaited_once()
+    assert healthchecks._redis_clients["redis://stale-loop"][1] is from_url.return_value
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from datetime import UTC, datetime
+
 from cacp.orchestration.agents.revenue_agent import RevenueAgent
 
 
@@ -76,3 +78,17 @@ class TestRevenueAgent:
             clinic_profile=profile,
         )
         assert seq.actions[0]["channel"] == "sms"
+
+    def test_appt_dt_resolves_scheduled_at(self) -> None:
+        seq = self.agent.generate_sequence(
+            risk_level="medium",
+            risk_score=0.5,
+            appointment=self.appointment,
+            clinic_profile=self.clinic_profile,
+            appt_dt=datetime(2026, 3, 15, 9, tzinfo=UTC),
+        )
+        assert [a["scheduled_at"] for a in seq.actions] == [
+            "2026-03-13T09:00:00+00:00",
+            "2026-03-14T09:00:00+00:00",
+        ]
+        assert all("hours_before" not in a for a in seq.actions)
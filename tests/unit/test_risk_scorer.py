@@ -84,3 +84,11 @@ class TestRiskScorer:
         ]
         for i in range(len(scores) - 1):
             assert scores[i] <= scores[i + 1]
+
+    def test_score_batch_matches_score(self) -> None:
+        appointments = [
+            {"previous_no_shows": n, "scheduled_at": f"2026-03-{16 + n}T0{8 + n}:00:00+00:00"}
+            for n in range(4)
+        ] + [{}]
+        batch = self.scorer.score_batch(appointments)
+        assert batch == [self.scorer.score(a) for a in appointments]
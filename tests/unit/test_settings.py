@@ -0,0 +1,35 @@
+"""Tests for application settings."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from pydantic import ValidationError
+
+from cacp.settings import Settings, get_settings
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture(autouse=True)
+def _fresh_settings() -> Iterator[None]:
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+def test_get_settings_is_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CACP_ENVIRONMENT", "staging")
+    first = get_settings()
+    monkeypatch.setenv("CACP_ENVIRONMENT", "prod")
+
+    assert get_settings() is first
+    assert first.environment == "staging"
+
+
+def test_settings_are_frozen() -> None:
+    settings = Settings()
+    with pytest.raises(ValidationError):
+        settings.environment = "prod"  # type: ignore[misc]
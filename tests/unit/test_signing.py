@@ -2,8 +2,18 @@
 
 from __future__ import annotations
 
-from cacp.signing.canonical import canonicalise
-from cacp.signing.hmac import sign_payload, verify_signature
+import hashlib
+import hmac
+import json
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import patch
+from uuid import UUID
+
+import pytest
+
+from cacp.signing.canonical import canonicalise, canonicalise_bytes
+from cacp.signing.hmac import sign_many, sign_payload, verify_signature
 
 
 class TestCanonicalise:
@@ -48,6 +58,42 @@ class TestHMACSign:
         payload = {"action": "test"}
         assert not verify_signature(payload, "secret")
 
+    def test_malformed_signature_rejected_without_signing(self) -> None:
+        payload = {"action": "test"}
+        good = sign_payload(payload, "secret")
+        with patch("cacp.signing.hmac._digest") as digest:
+            for bad in (good[:-1], good + "0", "z" * 64, 12345, None):
+                payload["hmac_signature"] = bad
+                assert not verify_signature(payload, "secret")
+        digest.assert_not_called()
+
     def test_signature_is_hex_string(self) -> None:
         sig = sign_payload({"a": 1}, "s")
         assert all(c in "0123456789abcdef" for c in sig)
+
+    def test_matches_stdlib_hmac(self) -> None:
+        payload = {"b": 2, "a": 1, "hmac_signature": "ignored"}
+        expected = hmac.new(b"s", b'{"a":1,"b":2}', hashlib.sha256).hexdigest()
+        assert sign_payload(payload, "s") == expected
+
+    def test_sign_many_matches_sign_payload(self) -> None:
+        payloads = [{"i": i} for i in range(5)]
+        assert sign_many(payloads, "s") == [sign_payload(p, "s") for p in payloads]
+
+
+class TestCanonicalParity:
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"b": [1, 2.5, None, True], "a": {"z": "x", "y": ""}},
+            {"name": "José", "note": " "},
+            {"tiny": 1e-05, "huge": 1e16, "nan": float("nan")},
+            {"del": "\x7f", "ctrl": "\x00\n"},
+            {"when": datetime(2026, 1, 2, 10, 0, tzinfo=UTC), "id": UUID(int=1)},
+            {"big": 2**70},
+        ],
+    )
+    def test_matches_stdlib_json(self, payload: dict[str, Any]) -> None:
+        expected = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        assert canonicalise(payload) == expected
+        assert canonicalise_bytes(payload) == expected.encode()
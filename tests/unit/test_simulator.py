@@ -88,3 +88,12 @@ class TestGenerateCohort:
         result = generate_cohort(num_appointments=500, seed=42)
         assert result.noshows_prevented == result.noshow_baseline - result.noshow_after_sms
         assert result.noshow_after_sms <= result.noshow_baseline
+
+    def test_ticket_total_matches_appointments(self) -> None:
+        result = generate_cohort(num_appointments=300, seed=3)
+        assert result.ticket_total == sum(a.ticket_value for a in result.appointments)
+
+    def test_iter_rows_matches_appointments(self) -> None:
+        result = generate_cohort(num_appointments=40, seed=8)
+        rows = list(result.iter_rows())
+        assert rows == [tuple(a.to_dict().values()) for a in result.appointments]
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
-from typing import Any
+import logging
+from typing import TYPE_CHECKING, Any
 from unittest.mock import MagicMock, patch
 
 from cacp.adapters.twilio_sms import SendResult, TwilioSmsAdapter
 
+if TYPE_CHECKING:
+    import pytest
+
 
 class TestSendResult:
     def test_to_dict_success(self) -> None:
@@ -83,3 +87,18 @@ class TestTwilioSmsAdapter:
 
         assert result["success"] is False
         assert "Twilio down" in result["error_message"]
+
+    def test_execute_success_masks_number_in_log(self, caplog: pytest.LogCaptureFixture) -> None:
+        mock_message = MagicMock()
+        mock_message.sid = "SM_MOCK_456"
+        mock_client = MagicMock()
+        mock_client.messages.create.return_value = mock_message
+
+        with (
+            caplog.at_level(logging.INFO, logger="cacp.adapters.twilio_sms"),
+            patch.object(self.adapter, "_get_client", return_value=mock_client),
+        ):
+            self.adapter.execute({"to_number": "+34600111222", "message": "Test"})
+
+        assert "to=+34600*** " in caplog.text
+        assert "+34600111222" not in caplog.text
@@ -142,3 +142,20 @@ async def test_to_number_hashed_in_payload(
     # to_hash should be a 16-char hex, not the actual phone number
     assert len(payload["to_hash"]) == 16
     assert "+34600111222" not in str(payload)
+
+
+def test_verify_twilio_signature_roundtrip() -> None:
+    import base64
+    import hashlib
+    import hmac
+
+    from cacp.api.routes.webhook_twilio import _verify_twilio_signature
+
+    url = "https://example.test/webhook/twilio-status"
+    params = {"MessageStatus": "sent", "MessageSid": "SM1"}
+    data = url + "MessageSid" + "SM1" + "MessageStatus" + "sent"
+    sig = base64.b64encode(hmac.new(b"tok", data.encode(), hashlib.sha1).digest()).decode()
+
+    assert _verify_twilio_signature(url, params, sig, "tok") is True
+    assert _verify_twilio_signature(url, params, sig, "other") is False
+    assert _verify_twilio_signature(url, params, "not base64!", "tok") is False
@@ -52,9 +52,9 @@ def app_with_webhook() -> Any:
     )
     a.state.settings = settings
     a.state.event_store = InMemoryEventStore()
-    # Mock Redis for idempotency + enqueue
+    # Mock Redis for idempotency + enqueue (server-side SET NX + RPUSH script)
     mock_redis = MagicMock()
-    mock_redis.set.return_value = True  # first call → new
+    mock_redis.register_script.return_value = MagicMock(return_value=1)  # new → queue len
     mock_redis.rpush.return_value = 1
     a.state.redis_client = mock_redis
     return a
@@ -94,6 +94,40 @@ async def test_valid_merged_pr_accepted(app_with_webhook: Any) -> None:
     assert len(events) == 1
     assert events[0]["payload"]["pr_number"] == 42
 
+    # Idempotency claim and enqueue go out as one script call
+    script = app_with_webhook.state.redis_client.register_script.return_value
+    script.assert_called_once()
+    assert script.call_args.kwargs["keys"] == [
+        "cacp:webhook:delivery:delivery-001",
+        "cacp:actions",
+    ]
+
+
+@pytest.mark.anyio()
+async def test_event_append_failure_is_logged(
+    app_with_webhook: Any, caplog: pytest.LogCaptureFixture
+) -> None:
+    app_with_webhook.state.event_store = MagicMock()
+    app_with_webhook.state.event_store.append.side_effect = RuntimeError("db down")
+    body = json.dumps(_merged_pr_payload()).encode()
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app_with_webhook),
+        base_url="http://test",
+    ) as client:
+        resp = await client.post(
+            "/webhook/github",
+            content=body,
+            headers={
+                "x-github-event": "pull_request",
+                "x-hub-signature-256": _sign(body, WEBHOOK_SECRET),
+                "content-type": "application/json",
+            },
+        )
+
+    assert resp.status_code == 202
+    assert "Event store append failed for pr_merged" in caplog.text
+
 
 # ── Invalid signature → 401 ─────────────────────────────
 
@@ -121,13 +155,60 @@ async def test_invalid_signature_rejected(app_with_webhook: Any) -> None:
     assert resp.status_code == 401
 
 
+def test_verify_signature_rejects_malformed_header() -> None:
+    from cacp.api.routes.webhook_github import _verify_signature
+
+    body = b"{}"
+    good = _sign(body, WEBHOOK_SECRET)
+    assert _verify_signature(body, WEBHOOK_SECRET, good) is True
+    assert _verify_signature(body, WEBHOOK_SECRET, "sha256=zz") is False
+    assert _verify_signature(body, WEBHOOK_SECRET, good[7:]) is False
+
+
+def test_extract_appointment_id() -> None:
+    from cacp.api.routes.webhook_github import _extract_appointment_id
+
+    assert _extract_appointment_id("t", "env: dev\r\n  Appointment_ID: APT-7\r\n") == "APT-7"
+    assert _extract_appointment_id("proposal/x -> APT-9", "see appointment_id: APT-1") == "APT-9"
+    assert _extract_appointment_id("proposal/x", "") == ""
+    # 'İ'.lower() is two code points; offsets must not drift past it.
+    assert _extract_appointment_id("t", "İİİ note\nappointment_id: APT-8\n") == "APT-8"
+
+
+# ── Signed but malformed body → 400 ─────────────────────
+
+
+@pytest.mark.anyio()
+async def test_invalid_json_rejected(app_with_webhook: Any) -> None:
+    body = b"{not json"
+    sig = _sign(body, WEBHOOK_SECRET)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app_with_webhook),
+        base_url="http://test",
+    ) as client:
+        resp = await client.post(
+            "/webhook/github",
+            content=body,
+            headers={
+                "x-github-event": "pull_request",
+                "x-hub-signature-256": sig,
+                "x-github-delivery": "delivery-bad-json",
+                "content-type": "application/json",
+            },
+        )
+
+    assert resp.status_code == 400
+    assert resp.json()["message"] == "Invalid JSON"
+
+
 # ── Duplicate delivery → 200 (idempotent) ───────────────
 
 
 @pytest.mark.anyio()
 async def test_duplicate_delivery_idempotent(app_with_webhook: Any) -> None:
-    # Simulate Redis SETNX returning False (already seen)
-    app_with_webhook.state.redis_client.set.return_value = False
+    # Simulate the SET NX in the enqueue script finding the key (already seen)
+    app_with_webhook.state.redis_client.register_script.return_value.return_value = 0
 
     payload = _merged_pr_payload()
     body = json.dumps(payload).encode()
@@ -150,6 +231,7 @@ async def test_duplicate_delivery_idempotent(app_with_webhook: Any) -> None:
 
     assert resp.status_code == 200
     assert resp.json()["status"] == "duplicate"
+    assert app_with_webhook.state.event_store.list_events(event_type="pr_merged") == []
 
 
 # ── PR not merged → ignored ─────────────────────────────
@@ -208,6 +290,30 @@ async def test_non_pr_event_ignored(app_with_webhook: Any) -> None:
     assert resp.json()["status"] == "ignored"
 
 
+@pytest.mark.anyio()
+async def test_non_pr_event_body_not_parsed(app_with_webhook: Any) -> None:
+    body = b"not json at all"
+    sig = _sign(body, WEBHOOK_SECRET)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app_with_webhook),
+        base_url="http://test",
+    ) as client:
+        resp = await client.post(
+            "/webhook/github",
+            content=body,
+            headers={
+                "x-github-event": "ping",
+                "x-hub-signature-256": sig,
+                "x-github-delivery": "delivery-ping",
+                "content-type": "application/json",
+            },
+        )
+
+    assert resp.status_code == 202
+    assert resp.json()["status"] == "ignored"
+
+
 # ── Wrong repo → ignored ────────────────────────────────
 
 
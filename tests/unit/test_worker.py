@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import json
+import threading
 from typing import Any
 from unittest.mock import MagicMock
 
+import pytest
+
 from cacp.storage.event_store import InMemoryEventStore
 from cacp.workers.worker import NoopAdapter, Worker
 
@@ -15,12 +18,8 @@ def _mock_redis(queue_items: list[dict[str, Any]]) -> MagicMock:
     mock = MagicMock()
     encoded = [json.dumps(item) for item in queue_items]
     mock.lpop.side_effect = encoded + [None]
-    # Rate-limit pipeline stub (count=0 → under limit)
-    pipe_mock = MagicMock()
-    pipe_mock.execute.return_value = [None, 0, None, None]
-    mock.pipeline.return_value = pipe_mock
-    # Dedup stub — always acquire (not duplicate)
-    mock.set.return_value = True
+    # Rate-limit + dedup script: 0 = allowed
+    mock.register_script.return_value.return_value = 0
     return mock
 
 
@@ -90,6 +89,26 @@ class TestWorker:
         result = worker.run_once()
         assert result is None
 
+    def test_adapter_result_keys_merge_into_payload(self) -> None:
+        class EchoAdapter:
+            def execute(self, action: dict[str, Any]) -> dict[str, Any]:
+                return {"event_type": "sms", "aggregate_id": "provider-side", "status": "ok"}
+
+        redis_mock = _mock_redis([{"action_type": "echo", "appointment_id": "APT-400"}])
+        worker = Worker(
+            redis_client=redis_mock,
+            adapters={"echo": EchoAdapter()},
+            event_store=self.event_store,
+            quiet_hours_start=0,
+            quiet_hours_end=0,
+        )
+        worker.run_once()
+
+        (event,) = self.event_store.list_events(aggregate_id="APT-400")
+        assert event["event_type"] == "action_executed"
+        assert event["payload"]["aggregate_id"] == "provider-side"
+        assert event["payload"]["status"] == "ok"
+
     def test_adapter_exception_emits_failed(self) -> None:
         class FailingAdapter:
             def execute(self, action: dict[str, Any]) -> dict[str, Any]:
@@ -112,3 +131,166 @@ class TestWorker:
         events = self.event_store.list_events(aggregate_id="APT-300")
         # action_failed + action_retry_scheduled
         assert any(e["event_type"] == "action_failed" for e in events)
+
+    def test_run_loop_pops_batches_then_blocks(self) -> None:
+        class _StopLoopError(Exception):
+            pass
+
+        actions = [{"action_type": "execute_plan", "appointment_id": f"APT-{i}"} for i in range(3)]
+        redis_mock = _mock_redis([])
+        redis_mock.blpop.side_effect = [("cacp:actions", json.dumps(actions[2])), _StopLoopError]
+        redis_mock.lpop.side_effect = [[json.dumps(a) for a in actions[:2]], None, None]
+        worker = Worker(
+            redis_client=redis_mock,
+            event_store=self.event_store,
+            quiet_hours_start=0,
+            quiet_hours_end=0,
+        )
+
+        with pytest.raises(_StopLoopError):
+            worker.run_loop(timeout=1)
+
+        assert redis_mock.lpop.call_args_list[0].args == ("cacp:actions", 64)
+        executed = self.event_store.list_events(event_type="action_executed")
+        assert {e["aggregate_id"] for e in executed} == {"APT-0", "APT-1", "APT-2"}
+
+    def test_run_loop_runs_batch_concurrently(self) -> None:
+        class _StopLoopError(Exception):
+            pass
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        class BarrierAdapter:
+            def execute(self, action: dict[str, Any]) -> dict[str, Any]:
+                barrier.wait()  # only passes if all three actions overlap
+                return {"status": "executed"}
+
+        actions = [{"action_type": "slow", "appointment_id": f"APT-{i}"} for i in range(3)]
+        redis_mock = _mock_redis([])
+        redis_mock.lpop.side_effect = [[json.dumps(a) for a in actions], None]
+        redis_mock.blpop.side_effect = _StopLoopError
+        worker = Worker(
+            redis_client=redis_mock,
+            adapters={"slow": BarrierAdapter()},
+            event_store=self.event_store,
+            quiet_hours_start=0,
+            quiet_hours_end=0,
+            concurrency=3,
+        )
+
+        with pytest.raises(_StopLoopError):
+            worker.run_loop(timeout=1)
+
+        executed = self.event_store.list_events(event_type="action_executed")
+        assert {e["aggregate_id"] for e in executed} == {"APT-0", "APT-1", "APT-2"}
+
+    def test_run_loop_writes_each_batch_with_append_many(self) -> None:
+        class _StopLoopError(Exception):
+            pass
+
+        actions = [{"action_type": "execute_plan", "appointment_id": f"APT-{i}"} for i in range(3)]
+        redis_mock = _mock_redis([])
+        redis_mock.lpop.side_effect = [[json.dumps(a) for a in actions], None]
+        redis_mock.blpop.side_effect = _StopLoopError
+        event_store = MagicMock()
+        worker = Worker(
+            redis_client=redis_mock,
+            event_store=event_store,
+            quiet_hours_start=0,
+            quiet_hours_end=0,
+        )
+
+        with pytest.raises(_StopLoopError):
+            worker.run_loop(timeout=1)
+
+        event_store.append_many.assert_called_once()
+        event_store.append.assert_not_called()
+        records = event_store.append_many.call_args.args[0]
+        assert [(r[0], r[1]) for r in records] == [
+            (f"APT-{i}", "action_executed") for i in range(3)
+        ]
+
+    def test_run_loop_bad_payload_mid_batch_is_dead_lettered(self) -> None:
+        class _StopLoopError(Exception):
+            pass
+
+        good = [{"action_type": "execute_plan", "appointment_id": f"APT-{i}"} for i in range(2)]
+        batch = [json.dumps(good[0]), "{not json", json.dumps(good[1])]
+        redis_mock = _mock_redis([])
+        redis_mock.lpop.side_effect = [batch, None]
+        redis_mock.blpop.side_effect = _StopLoopError
+        worker = Worker(
+            redis_client=redis_mock,
+            event_store=self.event_store,
+            quiet_hours_start=0,
+            quiet_hours_end=0,
+        )
+
+        with pytest.raises(_StopLoopError):
+            worker.run_loop(timeout=1)
+
+        executed = self.event_store.list_events(event_type="action_executed")
+        assert {e["aggregate_id"] for e in executed} == {"APT-0", "APT-1"}
+        redis_mock.rpush.assert_called_once_with("cacp:dlq", "{not json")
+        redis_mock.lpush.assert_not_called()
+
+    def test_run_loop_requeues_unprocessed_remainder(self) -> None:
+        class _StopLoopError(BaseException):
+            pass
+
+        class StoppingAdapter:
+            def execute(self, action: dict[str, Any]) -> dict[str, Any]:
+                if action["appointment_id"] == "APT-1":
+                    raise _StopLoopError
+                return {"status": "executed"}
+
+        batch = [
+            json.dumps({"action_type": "stop", "appointment_id": f"APT-{i}"}) for i in range(4)
+        ]
+        redis_mock = _mock_redis([])
+        redis_mock.lpop.side_effect = [batch]
+        worker = Worker(
+            redis_client=redis_mock,
+            adapters={"stop": StoppingAdapter()},
+            event_store=self.event_store,
+            quiet_hours_start=0,
+            quiet_hours_end=0,
+        )
+
+        with pytest.raises(_StopLoopError):
+            worker.run_loop(timeout=1)
+
+        # APT-0 ran; APT-1 was interrupted and goes back with the rest, in order
+        redis_mock.lpush.assert_called_once_with("cacp:actions", batch[3], batch[2], batch[1])
+
+    def test_run_loop_concurrent_failure_keeps_finished_results(self) -> None:
+        class _StopLoopError(BaseException):
+            pass
+
+        class StoppingAdapter:
+            def execute(self, action: dict[str, Any]) -> dict[str, Any]:
+                if action["appointment_id"] == "APT-1":
+                    raise _StopLoopError
+                return {"status": "executed"}
+
+        batch = [
+            json.dumps({"action_type": "stop", "appointment_id": f"APT-{i}"}) for i in range(3)
+        ]
+        redis_mock = _mock_redis([])
+        redis_mock.lpop.side_effect = [batch]
+        worker = Worker(
+            redis_client=redis_mock,
+            adapters={"stop": StoppingAdapter()},
+            event_store=self.event_store,
+            quiet_hours_start=0,
+            quiet_hours_end=0,
+            concurrency=4,
+        )
+
+        with pytest.raises(_StopLoopError):
+            worker.run_loop(timeout=1)
+
+        executed = self.event_store.list_events(event_type="action_executed")
+        assert {e["aggregate_id"] for e in executed} == {"APT-0", "APT-2"}
+        # only the interrupted action goes back on the queue
+        redis_mock.lpush.assert_called_once_with("cacp:actions", batch[1])
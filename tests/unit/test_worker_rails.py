@@ -6,9 +6,11 @@ import json
 from typing import Any
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from cacp.consent import InMemoryConsentStore
 from cacp.storage.event_store import InMemoryEventStore
-from cacp.workers.worker import Worker
+from cacp.workers.worker import Worker, _quiet_hours_mask
 
 
 def _mock_redis(
@@ -18,12 +20,8 @@ def _mock_redis(
     mock = MagicMock()
     encoded = [json.dumps(item) for item in queue_items]
     mock.lpop.side_effect = encoded + [None]
-    # Rate-limit pipeline mock: [zremrangebyscore, zcard=0, zadd, expire]
-    pipe_mock = MagicMock()
-    pipe_mock.execute.return_value = [None, 0, None, None]
-    mock.pipeline.return_value = pipe_mock
-    # Dedup stub — always acquire (not duplicate)
-    mock.set.return_value = True
+    # Rate-limit + dedup script: 0 = allowed
+    mock.register_script.return_value.return_value = 0
     return mock
 
 
@@ -156,6 +154,18 @@ class TestQuietHoursRail:
         events = event_store.list_events(aggregate_id="APT-100")
         assert any(e["event_type"] == "action_executed" for e in events)
 
+    @pytest.mark.parametrize(
+        ("start", "end", "quiet_hours"),
+        [
+            (22, 8, {22, 23, 0, 1, 2, 3, 4, 5, 6, 7}),
+            (2, 6, {2, 3, 4, 5}),
+            (0, 0, set()),
+        ],
+    )
+    def test_mask_matches_window(self, start: int, end: int, quiet_hours: set[int]) -> None:
+        mask = _quiet_hours_mask(start, end)
+        assert {h for h in range(24) if mask >> h & 1} == quiet_hours
+
 
 class TestRateLimitRail:
     """Actions beyond rate limit should be blocked."""
@@ -166,10 +176,8 @@ class TestRateLimitRail:
         event_store = InMemoryEventStore()
         redis_mock = _mock_redis([_action()])
 
-        # Pipeline returns count >= limit
-        pipe_mock = MagicMock()
-        pipe_mock.execute.return_value = [None, 3, None, None]
-        redis_mock.pipeline.return_value = pipe_mock
+        # Script reports the window is full
+        redis_mock.register_script.return_value.return_value = 1
 
         with patch("cacp.workers.worker.datetime") as mock_dt:
             mock_now = MagicMock()
@@ -200,10 +208,8 @@ class TestRateLimitRail:
         event_store = InMemoryEventStore()
         redis_mock = _mock_redis([_action()])
 
-        # Pipeline returns count=1 (under limit of 3)
-        pipe_mock = MagicMock()
-        pipe_mock.execute.return_value = [None, 1, None, None]
-        redis_mock.pipeline.return_value = pipe_mock
+        # Script reports the action is allowed (under limit of 3)
+        redis_mock.register_script.return_value.return_value = 0
 
         with patch("cacp.workers.worker.datetime") as mock_dt:
             mock_now = MagicMock()